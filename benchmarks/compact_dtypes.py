@@ -0,0 +1,132 @@
+"""
+load_stock_data_list, load_fs_data의 compact 모드가 줄이는 메모리와, 신호/수익률 결과에 주는 영향을 측정하는 벤치마크
+
+로컬에 저장된 종목만 사용하며 (LocalSource, download=False), 같은 종목을 기본 모드와 compact 모드로 읽어서
+- 데이터프레임 메모리 사용량 (memory_usage(deep=True))
+- scan_patterns 신호가 다른 봉의 수
+- 신호 발생 시점의 ror_buy_and_hold 수익률 최대 차이
+- 달력 신호(calendar_signal, turn_of_month, week_effect, month_effect)가 다른 봉의 수
+를 출력하고, 신호나 수익률이 tolerance보다 다르면 실패함
+
+사용 예시:
+    python benchmarks/compact_dtypes.py
+    python benchmarks/compact_dtypes.py --n-stocks 300 --period 5 --tolerance 1e-6
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qspy.datasets import load_stock_data_list
+from qspy.datasets import load_fs_data
+from qspy.datasets import LocalSource
+from qspy.datasets import set_data_source
+from qspy.analysis import scan_patterns
+from qspy.analysis import trading_calendar
+from qspy.analysis import calendar_signal
+from qspy.analysis import turn_of_month
+from qspy.analysis import week_effect
+from qspy.analysis import month_effect
+from qspy.validation import ror_buy_and_hold
+from qspy.utils._base import _package_path
+
+
+FS_ACCOUNTS = ["자산총계", "부채총계", "자본총계", "매출액", "영업이익", "당기순이익"]
+
+
+def local_stock_codes(n_stocks):
+    """로컬에 가격 데이터가 있는 종목 코드를 n_stocks개까지 반환"""
+
+    folder_path = _package_path("datasets/pickle_data/stock_price")
+    codes = sorted(
+        file_name[:-4] for file_name in os.listdir(folder_path)
+        if file_name.endswith(".pkl") and file_name[:-4].isdigit()
+    )
+    return codes[:n_stocks]
+
+
+def memory_bytes(frames):
+    return sum(int(frame.memory_usage(deep=True).sum()) for frame in frames)
+
+
+def compare_results(full_list, compact_list, period):
+    """(신호가 다른 봉의 수, 수익률 최대 절대 차이, 비교한 매매 수)를 반환"""
+
+    n_mismatch, max_diff, n_trades = 0, 0.0, 0
+    for full, compact in zip(full_list, compact_list):
+        full_signal = scan_patterns(full)
+        compact_signal = scan_patterns(compact)
+        n_mismatch += int((full_signal != compact_signal).sum())
+        buy_arr = full_signal.any(axis=1)
+        full_ror = np.array(ror_buy_and_hold(full, period, buy_arr))
+        compact_ror = np.array(ror_buy_and_hold(compact, period, buy_arr))
+        if len(full_ror) > 0:
+            max_diff = max(max_diff, float(np.nanmax(np.abs(full_ror - compact_ror))))
+        n_trades += len(full_ror)
+    return n_mismatch, max_diff, n_trades
+
+
+def compare_calendar(full_list, compact_list):
+    """달력 신호가 다른 봉의 수를 반환 (달력은 기본 모드 데이터의 날짜로 만듦)"""
+
+    calendar = trading_calendar(np.concatenate([full["Date"].values for full in full_list]))
+    n_mismatch = 0
+    for full, compact in zip(full_list, compact_list):
+        for column in ["weekday", "month_end", "quarter_end", "pre_holiday"]:
+            n_mismatch += int((calendar_signal(full, column, calendar=calendar) != calendar_signal(compact, column, calendar=calendar)).sum())
+        n_mismatch += int((turn_of_month(full, calendar=calendar) != turn_of_month(compact, calendar=calendar)).sum())
+        for effect in [week_effect, month_effect]:
+            for full_arr, compact_arr in zip(effect(full), effect(compact)):
+                n_mismatch += int((full_arr != compact_arr).sum())
+    return n_mismatch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="qspy compact 모드 메모리/정확도 벤치마크")
+    parser.add_argument("--n-stocks", type=int, default=100, help="사용할 종목 수 (기본값: 100)")
+    parser.add_argument("--period", type=int, default=5, help="수익률 보유 기간 (기본값: 5)")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="허용하는 수익률 최대 차이 (기본값: 1e-6)")
+    parser.add_argument("--fs-year", type=int, default=2020, help="재무제표 사업 연도 (기본값: 2020)")
+    parser.add_argument("--fs-quarter", type=int, default=4, help="재무제표 사업 분기 (기본값: 4)")
+    args = parser.parse_args()
+
+    # 로컬 데이터가 없는 종목을 원격에서 가져오지 않도록 기록된 응답만 사용하고, 날짜가 없는 빈 파일은 제외
+    set_data_source(LocalSource())
+    codes = local_stock_codes(args.n_stocks)
+    full_list = load_stock_data_list(codes, download=False)
+    codes = [code for code, full in zip(codes, full_list) if full["Date"].notnull().all()]
+    full_list = [full for full in full_list if full["Date"].notnull().all()]
+    compact_list = load_stock_data_list(codes, download=False, compact=True)
+    full_bytes, compact_bytes = memory_bytes(full_list), memory_bytes(compact_list)
+    print("price: {} stocks, {:.1f}MB -> {:.1f}MB ({:.1f}% 감소)".format(
+        len(full_list), full_bytes / 1024 ** 2, compact_bytes / 1024 ** 2, 100 * (1 - compact_bytes / full_bytes)))
+
+    n_mismatch, max_diff, n_trades = compare_results(full_list, compact_list, args.period)
+    print("signal: 다른 봉 {}개, return: 매매 {}건의 최대 차이 {:.3g}".format(n_mismatch, n_trades, max_diff))
+    n_calendar_mismatch = compare_calendar(full_list, compact_list)
+    print("calendar: 다른 봉 {}개".format(n_calendar_mismatch))
+
+    try:
+        full_fs = load_fs_data(codes, FS_ACCOUNTS, args.fs_year, args.fs_quarter, add_date=True)
+        compact_fs = load_fs_data(codes, FS_ACCOUNTS, args.fs_year, args.fs_quarter, add_date=True, compact=True)
+    except (IndexError, FileNotFoundError, ValueError) as e:
+        print("fs: 건너뜀 ({}: {})".format(type(e).__name__, e))
+    else:
+        full_bytes, compact_bytes = memory_bytes([full_fs]), memory_bytes([compact_fs])
+        values = full_fs[FS_ACCOUNTS].values.astype(float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel_diff = np.nanmax(np.abs(compact_fs[FS_ACCOUNTS].values - values) / np.abs(values))
+        print("fs: {:.1f}KB -> {:.1f}KB ({:.1f}% 감소), 금액 최대 상대 오차 {:.3g}".format(
+            full_bytes / 1024, compact_bytes / 1024, 100 * (1 - compact_bytes / full_bytes), rel_diff))
+
+    failed = (n_mismatch > 0) or (n_calendar_mismatch > 0) or (max_diff > args.tolerance)
+    if failed:
+        print("FAIL: compact 모드의 신호, 달력 신호 혹은 수익률이 기본 모드와 다릅니다.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+qspy 모듈의 import 시간을 측정하고 예산을 넘으면 실패하는 벤치마크
+
+매번 새 파이썬 프로세스에서 측정하며, 호출하는 쪽이 이미 불러와 있는 numpy와 pandas의 import 시간은
+기준으로 따로 측정하여 빼고, 무거운 의존성(FinanceDataReader, pkg_resources)이 import되지 않았는지도 확인함
+
+사용 예시:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module qspy.analysis --budget-ms 50 --repeat 7
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+
+# 측정 대상 모듈을 import했을 때 함께 import되면 안 되는 모듈
+HEAVY_MODULES = {
+    "qspy.analysis": ["FinanceDataReader", "pkg_resources", "qspy.datasets"],
+    "qspy.utils": ["FinanceDataReader", "pkg_resources"],
+    "qspy.datasets": ["FinanceDataReader", "pkg_resources"],
+    "qspy.validation": ["FinanceDataReader", "pkg_resources"],
+}
+
+_SCRIPT = """
+import sys, time, json
+import numpy, pandas
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """새 프로세스에서 module의 import 시간(ms)을 repeat번 측정하여 (시간 목록, 함께 import된 무거운 모듈 목록)을 반환"""
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    script = _SCRIPT.format(module=module, heavy=HEAVY_MODULES.get(module, []))
+    ms_list, loaded = [], set()
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        ms_list.append(result["ms"])
+        loaded.update(result["loaded"])
+    return ms_list, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="qspy import 시간 벤치마크")
+    parser.add_argument("--module", default="qspy.analysis", help="측정할 모듈 (기본값: qspy.analysis)")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="numpy, pandas를 제외한 import 시간 예산 (기본값: 50ms)")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 횟수 (중앙값을 사용, 기본값: 5)")
+    args = parser.parse_args()
+
+    ms_list, loaded = measure(args.module, args.repeat)
+    median = sorted(ms_list)[len(ms_list) // 2]
+    print("import {}: median {:.1f}ms (min {:.1f}ms, max {:.1f}ms), budget {:.1f}ms".format(
+        args.module, median, min(ms_list), max(ms_list), args.budget_ms))
+
+    failed = False
+    if median > args.budget_ms:
+        print("FAIL: import 시간이 예산을 넘었습니다.")
+        failed = True
+    if len(loaded) > 0:
+        print("FAIL: 무거운 모듈이 함께 import되었습니다: {}".format(", ".join(loaded)))
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
+import importlib
 
 __all__ = [
     "datasets",
     "utils",
     "analysis",
     "validation"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # 하위 패키지는 qspy.datasets처럼 처음 접근할 때 import함
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
\ No newline at end of file
@@ -4,6 +4,13 @@ from .candle_pattern import three_black_crows
 from .candle_pattern import three_white_soldiers
 from .calendar_effect import week_effect
 from .calendar_effect import month_effect
+from .trading_calendar import trading_calendar
+from .trading_calendar import calendar_signal
+from .trading_calendar import turn_of_month
+from .pattern_scanner import scan_patterns
+from .pattern_scanner import register_pattern
+from .pattern_compiler import compile_pattern
+from .pattern_stream import PatternStream
 
 __all__ = [
     "bearish_engulfing",
@@ -11,5 +18,12 @@ __all__ = [
     "three_black_crows",
     "three_white_soldiers",
     "week_effect",
-    "month_effect"
+    "month_effect",
+    "trading_calendar",
+    "calendar_signal",
+    "turn_of_month",
+    "scan_patterns",
+    "register_pattern",
+    "compile_pattern",
+    "PatternStream"
 ]
\ No newline at end of file
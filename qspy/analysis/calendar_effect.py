@@ -1,4 +1,15 @@
 import numpy as np
+import pandas as pd
+
+
+def _to_datetime(values):
+    """날짜 배열을 DatetimeIndex로 변환 (compact 모드의 정수 날짜는 1970-01-01부터 지난 일 수로 해석)"""
+
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return pd.to_datetime(values, unit="D")
+    return pd.DatetimeIndex(pd.to_datetime(values))
+
 
 def week_effect(data, buy_weekday = 0, sell_weekday = 4, date_col = "Date"):
     """
@@ -26,12 +37,49 @@ def week_effect(data, buy_weekday = 0, sell_weekday = 4, date_col = "Date"):
     if sell_weekday not in [0, 1, 2, 3, 4]:
         raise ValueError("sell_weekday 0, 1, 2, 3, 4 중 하나이어야 합니다")
 
-    buy_arr = (data[date_col].dt.weekday == buy_weekday).values
-    sell_arr = (data[date_col].dt.weekday == sell_weekday).values
+    weekday = _to_datetime(data[date_col].values).weekday
+    buy_arr = np.asarray(weekday == buy_weekday)
+    sell_arr = np.asarray(weekday == sell_weekday)
 
     return buy_arr, sell_arr
 
 
+def _month_day_flags(dates, day, group=None):
+    """
+    (그룹, 연월)마다 월초/월중/월말 시점 하나를 True로 표시한 부울 배열을 반환
+
+    월초는 10일 전 거래일이 있는 달의 첫 거래일, 월중은 10~19일 거래일이 있는 달의 15일과 가장 가까운 거래일,
+    월말은 20일 이후 거래일이 있는 달의 마지막 거래일이며 같은 조건이면 앞선 위치를 선택 (NaT는 제외)
+    """
+
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    valid = ~np.isnat(dates)
+    month = dates.astype("datetime64[M]")
+    day_arr = (dates - month).astype(np.int64) + 1
+    key = month.astype(np.int64)
+    if group is not None:
+        key = np.asarray(group, dtype=np.int64) * (1 << 32) + key
+
+    if day == "start":
+        score, cond = day_arr, day_arr < 10
+    elif day == "mid":
+        score, cond = np.abs(day_arr - 15), (day_arr >= 10) & (day_arr < 20)
+    else:
+        score, cond = -day_arr, day_arr >= 20
+
+    # (키, 점수, 위치) 순으로 정렬하면 키마다 첫 번째 원소가 선택할 시점
+    pos = np.flatnonzero(valid)
+    order = pos[np.lexsort((pos, score[pos], key[pos]))]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = key[order][1:] != key[order][:-1]
+
+    # 키마다 조건을 만족하는 거래일이 하나라도 있는지를 구간 합으로 계산
+    n_cond = np.add.reduceat(cond[order].astype(np.int64), np.flatnonzero(first)) if len(order) > 0 else np.array([], dtype=np.int64)
+    arr = np.zeros(len(dates), dtype=bool)
+    arr[order[first][n_cond > 0]] = True
+    return arr
+
+
 def month_effect(data, buy_day = "end", sell_day = "start", date_col = "Date"):
     """
     월중 시기에 따른 매수 시점 배열과 매도 시점 배열을 반환
@@ -40,15 +88,19 @@ def month_effect(data, buy_day = "end", sell_day = "start", date_col = "Date"):
     ==========================
     data: DataFrame
      주가 데이터 (FinanceDataReader나 이 패키지를 통해 수집한 데이터 구조와 일치해야 함)
+     혹은 load_stock_panel로 만든 패널 (행이 날짜이고 열이 (필드, 종목 코드)인 데이터프레임)
     buy_day: 특정 월의 매수 시기, default: "last"
      매수 시기 ("start": 월초, "mid": 월중, "end": 월말)
     sell_day: 특정 월의 매수 시기, default: "start"
      매도 시기 ("start": 월초, "mid": 월중, "end": 월말)
+    date_col: str, default: Date
+     data에서 날짜를 나타내는 컬럼명 (패널이면 사용하지 않음)
 
     returns:
     ==========================
     (buy_arr, sell_arr): ndarray
      매수 시점 배열과 매도 시점 배열로 구성된 튜플
+     패널이면 크기가 (날짜 수, 종목 수)인 배열이며, 종목마다 값이 있는 날짜만 거래일로 봄
     """
 
     if buy_day not in ["start", "mid", "end"]:
@@ -58,39 +110,19 @@ def month_effect(data, buy_day = "end", sell_day = "start", date_col = "Date"):
     if buy_day == sell_day:
         raise ValueError("buy_day와 sell_day가 같을 수 없습니다.")
 
-    # 임시 데이터 생성: Year와 Month 컬럼 추가
-    temp = data.copy()
-    temp['Year'] = data[date_col].dt.year
-    temp['Month'] = data[date_col].dt.month
-    temp["Day"] = data[date_col].dt.day
-
-    # 출력 초기화
-    buy_arr = np.zeros(len(temp), dtype=bool)
-    sell_arr = np.zeros(len(temp), dtype=bool)
-
-    # year와 month를 순회하면서 매수/매도 시점 파악 및 출력 업데이트
-
-    for year, month in temp[["Year", "Month"]].drop_duplicates().values:
-        # 월별 매수/매도 시점 파악
-        s_temp = temp.loc[(temp["Year"] == year) & (temp["Month"] == month)]
-        if (buy_day == "start") and (s_temp["Day"].min() < 10):
-            buy_idx = s_temp["Day"].idxmin()
-            buy_arr[buy_idx] = True
-        elif (buy_day == "mid") and (sum((s_temp["Day"] >= 10) & (s_temp["Day"] < 20)) >= 1):
-            buy_idx = (s_temp["Day"] - 15).abs().idxmin()
-            buy_arr[buy_idx] = True
-        elif (buy_day == "end")  and (s_temp["Day"].max() >= 20):
-            buy_idx = s_temp["Day"].idxmax()
-            buy_arr[buy_idx] = True
-
-        if (sell_day == "start") and (s_temp["Day"].min() < 10):
-            sell_idx = s_temp["Day"].idxmin()
-            sell_arr[sell_idx] = True
-        elif (sell_day == "mid") and (sum((s_temp["Day"] >= 10) & (s_temp["Day"] < 20)) >= 1):
-            sell_idx = (s_temp["Day"] - 15).abs().idxmin()
-            sell_arr[sell_idx] = True
-        elif (sell_day == "end")  and (s_temp["Day"].max() >= 20):
-            sell_idx = s_temp["Day"].idxmax()
-            sell_arr[sell_idx] = True
-
-    return buy_arr, sell_arr
\ No newline at end of file
+    if isinstance(data.columns, pd.MultiIndex):
+        # 패널: (날짜, 종목) 중 값이 있는 칸만 모아서 (종목, 연월)별로 한 번에 계산
+        codes = data.columns.get_level_values(1).unique()
+        traded = data.notna().T.groupby(level=1, sort=False).any().T[codes].values
+        date_idx, code_idx = np.nonzero(traded)
+        dates = data.index.values[date_idx]
+        buy_arr = np.zeros(traded.shape, dtype=bool)
+        sell_arr = np.zeros(traded.shape, dtype=bool)
+        buy_arr[date_idx, code_idx] = _month_day_flags(dates, buy_day, code_idx)
+        sell_arr[date_idx, code_idx] = _month_day_flags(dates, sell_day, code_idx)
+        return buy_arr, sell_arr
+
+    dates = data[date_col].values
+    buy_arr = _month_day_flags(dates, buy_day)
+    sell_arr = _month_day_flags(dates, sell_day)
+    return buy_arr, sell_arr
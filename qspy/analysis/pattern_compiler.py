@@ -0,0 +1,133 @@
+import re
+import numpy as np
+
+
+PRICE_FIELDS = ["open", "high", "low", "close"]
+
+# 패턴들이 공유하는 기본 값: 필요한 값만 처음 사용할 때 한 번 계산함
+# (꼬리와 몸통 길이는 hammer 계열 함수와 같은 정의의 백분율)
+PRIMITIVES = {
+    "up": lambda p: p["close"] > p["open"],
+    "down": lambda p: p["open"] > p["close"],
+    "body": lambda p: (p["close"] - p["open"]) / p["open"] * 100,
+    "lower_tail": lambda p: (p["open"] - p["low"]) / p["low"] * 100,
+    "upper_tail": lambda p: (p["high"] - p["close"]) / p["close"] * 100,
+}
+
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+_OPERAND = re.compile(r"^([a-z_]+)(?:\[(\d+)\])?$")
+
+
+class _Primitives(dict):
+    """시가, 고가, 저가, 종가 배열을 받아서 PRIMITIVES 값을 처음 요청할 때 계산하여 보관하는 딕셔너리"""
+
+    def __missing__(self, key):
+        if key not in PRIMITIVES:
+            raise KeyError(key)
+        self[key] = PRIMITIVES[key](self)
+        return self[key]
+
+
+def _parse_operand(operand, params):
+    """피연산자를 ("field", 필드, k), ("param", 이름), ("const", 값) 중 하나로 변환"""
+
+    if isinstance(operand, (int, float, np.number)) and not isinstance(operand, bool):
+        return ("const", operand)
+    match = _OPERAND.match(operand) if isinstance(operand, str) else None
+    if match is None:
+        raise ValueError("적절한 피연산자가 아닙니다: {}".format(operand))
+    name, k = match.group(1), match.group(2)
+    if (name in PRICE_FIELDS) or (name in PRIMITIVES):
+        return ("field", name, 0 if k is None else int(k))
+    if (name in params) and (k is None):
+        return ("param", name)
+    raise ValueError("정의되지 않은 필드 혹은 파라미터입니다: {}".format(operand))
+
+
+def compile_pattern(spec):
+
+    """
+    선언적으로 정의한 N봉 캔들 패턴을 하나의 벡터 연산 함수로 변환
+
+    조건마다 t-k 번째 봉의 값을 복사하지 않은 뷰로 비교하고, 결과를 하나의 출력 배열에 누적하므로
+    np.insert로 앞을 채우거나 중간 배열을 만들지 않음
+
+    Parameters:
+    ==========================
+    spec: dict
+        패턴 정의
+        - conditions: 조건 목록 (모든 조건을 만족하면 패턴 발생)
+            - (왼쪽, 연산자, 오른쪽): 연산자는 ">", ">=", "<", "<=", "==", "!=" 중 하나
+            - 부울 필드 하나 (예: "up[1]")
+            피연산자는 "필드[k]" (t-k 번째 봉, [k]를 생략하면 현재 봉), 파라미터 이름, 숫자 중 하나이며
+            필드는 open, high, low, close, up, down, body, lower_tail, upper_tail 중 하나
+        - params: 조건에서 사용할 파라미터 이름과 기본값으로 구성된 딕셔너리 (생략 가능)
+
+    returns:
+    ==========================
+    (n_bars, kernel): tuple
+        n_bars: 패턴에 필요한 봉 수 (현재 봉 포함)
+        kernel: 기본 값 딕셔너리와 파라미터를 받아서 (n_bars - 1)번째 봉부터의 부울 배열을 반환하는 함수
+
+    예시:
+    ==========================
+    >>> compile_pattern({"conditions": ["down[1]", "up", ("low[1]", ">", "open"), ("high[1]", "<", "close")]})
+    """
+
+    params = dict(spec.get("params", {}))
+    condition_list = []
+    for condition in spec["conditions"]:
+        if isinstance(condition, str):
+            operand = _parse_operand(condition, params)
+            if (operand[0] != "field") or (operand[1] not in ["up", "down"]):
+                raise ValueError("비교 연산이 없는 조건은 부울 필드이어야 합니다: {}".format(condition))
+            condition_list.append((None, operand, None))
+            continue
+        lhs, op, rhs = condition
+        if op not in OPERATORS:
+            raise ValueError("연산자는 {} 중 하나이어야 합니다: {}".format(list(OPERATORS), op))
+        condition_list.append((OPERATORS[op], _parse_operand(lhs, params), _parse_operand(rhs, params)))
+    if len(condition_list) == 0:
+        raise ValueError("conditions가 비어 있습니다.")
+
+    lag_list = [operand[2] for condition in condition_list for operand in condition[1:] if (operand is not None) and (operand[0] == "field")]
+    n_bars = max(lag_list, default=0) + 1
+
+    def kernel(p, **kwargs):
+        for key in kwargs:
+            if key not in params:
+                raise ValueError("정의되지 않은 파라미터입니다: {}".format(key))
+        values = dict(params, **kwargs)
+        n = len(p["close"])
+
+        def resolve(operand):
+            if operand[0] == "field":
+                return p[operand[1]][n_bars - 1 - operand[2]: n - operand[2]]
+            if operand[0] == "param":
+                return values[operand[1]]
+            return operand[1]
+
+        cond = None
+        buffer = None
+        for op, lhs, rhs in condition_list:
+            if op is None:
+                result = resolve(lhs)
+            else:
+                if buffer is None:
+                    buffer = np.empty(p["close"][n_bars - 1:].shape, dtype=bool)
+                result = op(resolve(lhs), resolve(rhs), out=buffer)
+            if cond is None:
+                cond = result.copy()
+            else:
+                np.logical_and(cond, result, out=cond)
+        return cond
+
+    return n_bars, kernel
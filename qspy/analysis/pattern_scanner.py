@@ -0,0 +1,153 @@
+import numpy as np
+from .pattern_compiler import _Primitives
+from .pattern_compiler import compile_pattern
+
+
+# 기존 candle_pattern 함수들을 선언적으로 다시 정의한 패턴 (결과가 같음)
+PATTERN_SPECS = {
+    "bullish_engulfing": {
+        "conditions": ["down[1]", "up", ("low[1]", ">", "open"), ("high[1]", "<", "close")],
+    },
+    "bearish_engulfing": {
+        "conditions": ["up[1]", "down", ("low[1]", "<", "open"), ("high[1]", ">", "close")],
+    },
+    "three_black_crows": {
+        "conditions": [("close", "<", "close[1]"), ("close[1]", "<", "close[2]"), "down[2]", "down[1]", "down"],
+    },
+    "three_white_soldiers": {
+        "conditions": [("close", ">", "close[1]"), ("close[1]", ">", "close[2]"), "up[2]", "up[1]", "up"],
+    },
+    "hammer": {
+        "conditions": [
+            ("high", "==", "close"), "up",
+            ("lower_tail", ">=", "min_len_tail"), ("lower_tail", "<=", "max_len_tail"),
+            ("body", ">=", "min_len_body"), ("body", "<=", "max_len_body"),
+        ],
+        "params": {"min_len_tail": 0, "min_len_body": 0, "max_len_tail": 30, "max_len_body": 30},
+    },
+    "inverted_hammer": {
+        "conditions": [
+            ("low", "==", "open"), "up",
+            ("upper_tail", ">=", "min_len_tail"), ("upper_tail", "<=", "max_len_tail"),
+            ("body", ">=", "min_len_body"), ("body", "<=", "max_len_body"),
+        ],
+        "params": {"min_len_tail": 0, "min_len_body": 0, "max_len_tail": 30, "max_len_body": 30},
+    },
+    "dragon_fly_doji": {
+        "conditions": [
+            ("high", "==", "close"), ("high", "==", "open"),
+            ("lower_tail", ">=", "min_len_tail"), ("lower_tail", "<=", "max_len_tail"),
+        ],
+        "params": {"min_len_tail": 0, "max_len_tail": 30},
+    },
+}
+
+# 등록된 패턴: 이름 -> (패턴에 필요한 봉 수, 함수)
+# 함수는 기본 값을 받아서 (봉 수 - 1)번째 봉부터의 결과를 반환함
+PATTERNS = {name: compile_pattern(spec) for name, spec in PATTERN_SPECS.items()}
+
+
+def register_pattern(name, pattern, n_bars=None):
+    """
+    scan_patterns에서 사용할 패턴을 등록
+
+    Parameters:
+    ==========================
+    name: str
+        패턴 이름
+    pattern: dict or callable
+        compile_pattern에 입력할 패턴 정의, 혹은 기본 값 딕셔너리(open, high, low, close 및 PRIMITIVES)를 받아서
+        (n_bars - 1)번째 봉부터의 부울 배열을 반환하는 함수
+    n_bars: int, default: None
+        pattern이 함수일 때 패턴에 필요한 봉 수 (현재 봉 포함)
+    """
+
+    if callable(pattern):
+        if (n_bars is None) or (n_bars < 1):
+            raise ValueError("pattern이 함수이면 n_bars는 1 이상이어야 합니다.")
+        PATTERNS[name] = (n_bars, pattern)
+    else:
+        PATTERNS[name] = compile_pattern(pattern)
+
+
+def _price_arrays(data, open_col, close_col, high_col, low_col):
+    """단일 종목 데이터면 1차원, load_stock_panel 패널이면 (날짜 수, 종목 수) 크기의 가격 배열을 반환
+    (compact 모드의 float32 가격도 꼬리/몸통 길이를 기본 모드와 같게 계산하도록 float64로 변환)"""
+
+    return {
+        "open": data[open_col].values.astype(float, copy=False),
+        "high": data[high_col].values.astype(float, copy=False),
+        "low": data[low_col].values.astype(float, copy=False),
+        "close": data[close_col].values.astype(float, copy=False),
+    }
+
+
+def scan_patterns(
+    data,
+    pattern_list=None,
+    as_bitmask=False,
+    pattern_kwargs=None,
+    open_col="Open",
+    close_col="Close",
+    high_col="High",
+    low_col="Low",
+):
+
+    """
+    여러 캔들 패턴을 한 번에 찾아서 반환
+
+    상승/하락 여부, 몸통과 꼬리 길이 같은 기본 값은 한 번씩만 계산하여 모든 패턴이 공유하고,
+    이전 봉의 값은 복사하지 않은 뷰로 비교함
+
+    Parameters:
+    ==========================
+    data: DataFrame
+        주가 데이터 (FinanceDataReader나 이 패키지를 통해 수집한 데이터 구조와 일치해야 함)
+        혹은 load_stock_panel로 만든 패널 (행이 날짜이고 열이 (필드, 종목 코드)인 데이터프레임)
+    pattern_list: array-like, default: None
+        찾을 패턴 이름 목록 (None으로 입력시 등록된 모든 패턴)
+    as_bitmask: bool, default: False
+        출력 타입 결정
+        - True: j번째 비트가 pattern_list[j] 패턴 발생 여부인 uint64 배열 (패턴은 최대 64개)
+        - False: 마지막 축이 pattern_list 순서인 부울 배열
+    pattern_kwargs: dict, default: None
+        패턴 이름을 키로 하고, 해당 패턴 함수에 전달할 인자 딕셔너리를 값으로 하는 딕셔너리
+        (예: {"hammer": {"min_len_tail": 1}})
+    open_col: str, default: "Open"
+        시가를 나타내는 컬럼명
+    close_col: str, default: "Close"
+        종가를 나타내는 컬럼명
+    high_col: str, default: "High"
+        고가를 나타내는 컬럼명
+    low_col: str, default: "Low"
+        저가를 나타내는 컬럼명
+
+    returns:
+    ==========================
+    cond: ndarray
+        단일 종목이면 크기가 (행 수, 패턴 수), 패널이면 (날짜 수, 종목 수, 패턴 수)인 부울 배열
+        (패널에서 이전 봉은 이전 날짜 행이므로, 거래하지 않은 날이 끼어 있으면 해당 종목의 패턴은 False)
+        as_bitmask가 True이면 마지막 축이 없는 uint64 배열
+    """
+
+    pattern_list = list(PATTERNS) if pattern_list is None else list(pattern_list)
+    pattern_kwargs = {} if pattern_kwargs is None else pattern_kwargs
+    for name in pattern_list:
+        if name not in PATTERNS:
+            raise ValueError("등록되지 않은 패턴입니다: {}".format(name))
+    if as_bitmask and len(pattern_list) > 64:
+        raise ValueError("as_bitmask가 True이면 패턴은 최대 64개입니다.")
+
+    p = _Primitives(_price_arrays(data, open_col, close_col, high_col, low_col))
+    shape = p["close"].shape
+    cond = np.zeros(shape + (len(pattern_list),), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, name in enumerate(pattern_list):
+            n_bars, func = PATTERNS[name]
+            if shape[0] >= n_bars:
+                cond[n_bars - 1:, ..., j] = func(p, **pattern_kwargs.get(name, {}))
+
+    if as_bitmask:
+        bits = np.left_shift(np.uint64(1), np.arange(len(pattern_list), dtype=np.uint64))
+        return np.bitwise_or.reduce(np.where(cond, bits, np.uint64(0)), axis=-1)
+    return cond
@@ -0,0 +1,247 @@
+import numpy as np
+import pandas as pd
+from .pattern_compiler import _Primitives
+from .pattern_scanner import PATTERNS
+from .trading_calendar import trading_calendar
+from .trading_calendar import _extend_calendar
+from .calendar_effect import _to_datetime
+
+
+class PatternStream:
+
+    """
+    종목마다 최근 몇 개의 봉만 고정 크기 링 버퍼에 보관하면서, 새 봉이 들어올 때마다 패턴 발생 여부를 계산
+
+    전체 기간을 다시 읽거나 계산하지 않으므로 봉 하나를 처리하는 비용은 과거 데이터 길이와 무관하며,
+    update_many를 사용하면 여러 종목의 봉을 패턴마다 한 번의 벡터 연산으로 처리함
+
+    Parameters:
+    ==========================
+    pattern_list: array-like, default: None
+        찾을 패턴 이름 목록 (None으로 입력시 scan_patterns에 등록된 모든 패턴)
+    pattern_kwargs: dict, default: None
+        패턴 이름을 키로 하고, 해당 패턴에 전달할 인자 딕셔너리를 값으로 하는 딕셔너리
+    calendar_columns: array-like, default: None
+        함께 확인할 거래일 달력의 부울 컬럼 목록 (예: ["month_end", "pre_holiday"])
+    calendar: DataFrame, default: None
+        사용할 거래일 달력 (None으로 입력시 trading_calendar())
+        달력의 마지막 날짜 이후의 봉이 들어오면 다음 달 말까지 개장일을 추정해서 달력을 늘리고,
+        달력 기간 안의 휴장일이나 날짜가 없는 봉이 들어오면 ValueError를 발생시킴
+    holidays: array-like, default: None
+        달력을 늘릴 때 평일과 날짜가 고정된 휴장일 외에 추가로 뺄 휴장일 목록 (설날, 추석 등)
+    open_col, high_col, low_col, close_col, date_col: str
+        봉에서 시가, 고가, 저가, 종가, 날짜를 나타내는 키
+
+    예시:
+    ==========================
+    >>> stream = PatternStream(["bullish_engulfing", "hammer"])
+    >>> stream.update("005930", {"Date": "2021-06-01", "Open": 80000, "High": 81000, "Low": 79500, "Close": 80900})
+    """
+
+    def __init__(
+        self,
+        pattern_list=None,
+        pattern_kwargs=None,
+        calendar_columns=None,
+        calendar=None,
+        holidays=None,
+        open_col="Open",
+        high_col="High",
+        low_col="Low",
+        close_col="Close",
+        date_col="Date",
+    ):
+        self.pattern_list = list(PATTERNS) if pattern_list is None else list(pattern_list)
+        for name in self.pattern_list:
+            if name not in PATTERNS:
+                raise ValueError("등록되지 않은 패턴입니다: {}".format(name))
+        self.pattern_kwargs = {} if pattern_kwargs is None else pattern_kwargs
+        self.calendar_columns = [] if calendar_columns is None else list(calendar_columns)
+        self.columns = [open_col, high_col, low_col, close_col]
+        self.date_col = date_col
+
+        self.holidays = holidays
+
+        # 달력 신호는 날짜 -> 행 번호 딕셔너리로 찾음
+        self._calendar_rows = {}
+        self._calendar_values = np.zeros((0, len(self.calendar_columns)), dtype=bool)
+        if len(self.calendar_columns) > 0:
+            calendar = trading_calendar() if calendar is None else calendar
+            for column in self.calendar_columns:
+                if (column not in calendar.columns) or (calendar[column].dtype != bool):
+                    raise ValueError("calendar_columns는 달력의 부울 컬럼이어야 합니다: {}".format(column))
+            self._set_calendar(calendar)
+
+        self.n_bars = max([PATTERNS[name][0] for name in self.pattern_list], default=1)
+        self._rows = {}
+        self._allocate(16)
+
+    def _set_calendar(self, calendar):
+        dates = calendar.index.values.astype("datetime64[D]")
+        self._calendar = calendar
+        self._calendar_end = dates[-1]
+        self._calendar_rows = dict(zip(dates.tolist(), range(len(dates))))
+        self._calendar_values = calendar[self.calendar_columns].values
+
+    def _calendar_index(self, dates):
+        """봉의 날짜마다 달력의 행 번호를 반환 (달력의 마지막 날짜 이후이면 다음 달 말까지 달력을 늘림)"""
+
+        if len(self.calendar_columns) == 0:
+            return None
+        if np.isnat(dates).any():
+            raise ValueError("calendar_columns를 사용하려면 봉에 날짜({})가 있어야 합니다.".format(self.date_col))
+        if (len(dates) > 0) and (dates.max() > self._calendar_end):
+            # 새 봉이 있는 달의 월말, 분기말, 휴장일 전 여부가 정해지도록 다음 달 말까지 추정함
+            end_date = (dates.max().astype("datetime64[M]") + 2).astype("datetime64[D]") - 1
+            self._set_calendar(_extend_calendar(self._calendar, end_date, self.holidays))
+        index = np.array([self._calendar_rows.get(date, -1) for date in dates.tolist()], dtype=np.int64)
+        if (index < 0).any():
+            missing = [str(date) for date in dates[index < 0]]
+            raise ValueError("거래일 달력에 없는 날짜(휴장일)의 봉입니다: {}".format(missing))
+        return index
+
+    @property
+    def names(self):
+        """update가 반환하는 신호 이름 목록 (패턴, 달력 신호 순)"""
+
+        return self.pattern_list + self.calendar_columns
+
+    def _allocate(self, capacity):
+        prices = np.full((capacity, self.n_bars, 4), np.nan)
+        count = np.zeros(capacity, dtype=np.int64)
+        pos = np.zeros(capacity, dtype=np.int64)
+        last_date = np.full(capacity, np.datetime64("NaT"), dtype="datetime64[D]")
+        n = len(self._rows)
+        if n > 0:
+            prices[:n], count[:n], pos[:n], last_date[:n] = self._prices[:n], self._count[:n], self._pos[:n], self._last_date[:n]
+        self._prices, self._count, self._pos, self._last_date = prices, count, pos, last_date
+
+    def _row_index(self, stock_code_list):
+        row_list = []
+        for stock_code in stock_code_list:
+            if stock_code not in self._rows:
+                if len(self._rows) == len(self._count):
+                    self._allocate(2 * len(self._count))
+                self._rows[stock_code] = len(self._rows)
+            row_list.append(self._rows[stock_code])
+        return np.array(row_list, dtype=np.int64)
+
+    def _push(self, rows, prices, dates):
+        """봉을 링 버퍼에 기록 (마지막 봉과 날짜가 같으면 새 봉으로 보지 않고 마지막 봉을 고침)"""
+
+        same = self._last_date[rows] == dates
+        slot = np.where(same, (self._pos[rows] - 1) % self.n_bars, self._pos[rows])
+        self._prices[rows, slot] = prices
+        self._pos[rows] = np.where(same, self._pos[rows], (self._pos[rows] + 1) % self.n_bars)
+        self._count[rows] = np.where(same, self._count[rows], np.minimum(self._count[rows] + 1, self.n_bars))
+        self._last_date[rows] = dates
+
+    def _evaluate(self, rows, calendar_index):
+        """종목마다 가장 최근 봉에서 발생한 신호를 (종목 수, 신호 수) 부울 배열로 반환"""
+
+        # 가장 오래된 봉부터 순서대로 (봉 수, 종목 수) 배열을 만들어서 등록된 패턴 함수에 그대로 사용
+        order = (self._pos[rows][:, None] + np.arange(self.n_bars)[None, :]) % self.n_bars
+        window = self._prices[rows[:, None], order]
+        p = _Primitives({field: window[:, :, i].T for i, field in enumerate(["open", "high", "low", "close"])})
+
+        fired = np.zeros((len(rows), len(self.names)), dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for j, name in enumerate(self.pattern_list):
+                n_bars, func = PATTERNS[name]
+                fired[:, j] = func(p, **self.pattern_kwargs.get(name, {}))[-1] & (self._count[rows] >= n_bars)
+
+        if calendar_index is not None:
+            fired[:, len(self.pattern_list):] = self._calendar_values[calendar_index]
+        return fired
+
+    def _parse_bars(self, bars):
+        prices = np.array([[float(bar[column]) for column in self.columns] for bar in bars]).reshape(-1, 4)
+        dates = np.array(
+            [_to_datetime([bar[self.date_col]]).values[0] if self.date_col in bar else np.datetime64("NaT") for bar in bars],
+            dtype="datetime64[D]",
+        )
+        return prices, dates
+
+    def update(self, stock_code, bar):
+
+        """
+        종목의 새 봉을 입력받아서 해당 봉에서 발생한 신호 목록을 반환
+
+        Parameters:
+        ==========================
+        stock_code: str
+            종목 코드
+        bar: dict or Series
+            시가, 고가, 저가, 종가(와 날짜)를 포함한 봉 (날짜가 마지막 봉과 같으면 마지막 봉을 고침)
+
+        returns:
+        ==========================
+        fired: list
+            발생한 패턴 및 달력 신호 이름 목록
+        """
+
+        rows = self._row_index([stock_code])
+        prices, dates = self._parse_bars([bar])
+        calendar_index = self._calendar_index(dates)
+        self._push(rows, prices, dates)
+        fired = self._evaluate(rows, calendar_index)[0]
+        return [name for name, flag in zip(self.names, fired) if flag]
+
+    def update_many(self, bars):
+
+        """
+        여러 종목의 새 봉을 한 번에 입력받아서 종목별로 발생한 신호를 반환
+
+        Parameters:
+        ==========================
+        bars: DataFrame
+            행이 종목 코드이고 시가, 고가, 저가, 종가(와 날짜) 컬럼이 있는 데이터프레임 (종목 코드는 중복 불가)
+
+        returns:
+        ==========================
+        fired: DataFrame
+            행이 종목 코드이고 열이 신호 이름(names)인 부울 데이터프레임
+        """
+
+        if not bars.index.is_unique:
+            raise ValueError("bars의 종목 코드가 중복되었습니다.")
+        rows = self._row_index(bars.index)
+        prices = bars[self.columns].values.astype(float)
+        if self.date_col in bars.columns:
+            dates = _to_datetime(bars[self.date_col].values).values.astype("datetime64[D]")
+        else:
+            dates = np.full(len(bars), np.datetime64("NaT"), dtype="datetime64[D]")
+        calendar_index = self._calendar_index(dates)
+        self._push(rows, prices, dates)
+        return pd.DataFrame(self._evaluate(rows, calendar_index), index=bars.index, columns=self.names)
+
+    def warm_up(self, stock_code, data):
+
+        """
+        과거 데이터의 마지막 몇 개 봉으로 종목의 링 버퍼를 채움 (신호는 계산하지 않음)
+
+        Parameters:
+        ==========================
+        stock_code: str
+            종목 코드
+        data: DataFrame
+            주가 데이터 (FinanceDataReader나 이 패키지를 통해 수집한 데이터 구조와 일치해야 함)
+        """
+
+        rows = self._row_index([stock_code])
+        for _, bar in data.iloc[-self.n_bars:].iterrows():
+            prices, dates = self._parse_bars([bar])
+            self._push(rows, prices, dates)
+
+    def reset(self, stock_code=None):
+        """종목(None이면 모든 종목)의 링 버퍼를 비움"""
+
+        if stock_code is None:
+            self._rows = {}
+            self._allocate(16)
+        elif stock_code in self._rows:
+            row = self._rows[stock_code]
+            self._prices[row] = np.nan
+            self._count[row] = 0
+            self._pos[row] = 0
+            self._last_date[row] = np.datetime64("NaT")
@@ -0,0 +1,292 @@
+import os
+import warnings
+import numpy as np
+import pandas as pd
+from .calendar_effect import _month_day_flags
+from .calendar_effect import _to_datetime
+
+
+# 날짜가 고정된 한국거래소 휴장일 (월, 일): 신정, 삼일절, 어린이날, 현충일, 광복절, 개천절, 한글날, 성탄절, 연말 휴장일
+# (설날, 추석, 부처님오신날, 선거일, 대체 공휴일은 해마다 날짜가 달라서 포함하지 않음)
+FIXED_HOLIDAYS = [(1, 1), (3, 1), (5, 5), (6, 6), (8, 15), (10, 3), (10, 9), (12, 25), (12, 31)]
+
+# 프로세스마다 보관하는 거래일 달력 (가격 저장소나 델타/매니페스트 폴더가 바뀌면 다시 만듦)
+_calendar = {}
+
+
+def _fixed_holidays(start_year, end_year):
+    """start_year부터 end_year까지의 날짜가 고정된 휴장일 배열"""
+
+    return np.array(
+        ["{:04d}-{:02d}-{:02d}".format(year, month, day) for year in range(start_year, end_year + 1) for month, day in FIXED_HOLIDAYS],
+        dtype="datetime64[D]",
+    )
+
+
+def _calendar_version():
+    """가격 저장소, 델타 폴더, 종목별 매니페스트 폴더의 수정 시각 (하나라도 바뀌면 달력을 다시 만듦)"""
+
+    # qspy.analysis만 사용할 때 qspy.datasets를 import하지 않도록 필요할 때 import함
+    from ..datasets._price_store import _price_store_path
+    from ..datasets._delta import _delta_folder_path
+    from ..datasets._manifest import _entry_folder_path
+
+    path_list = [_price_store_path() + "/index.npy", _delta_folder_path(), _entry_folder_path()]
+    return tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in path_list)
+
+
+def _store_dates():
+    """
+    가격 저장소의 모든 거래일에 저장소를 만든 뒤 추가된 거래일을 더해서 반환 (저장소가 없으면 None)
+
+    저장소를 만든 뒤에 갱신되었거나 새로 생긴 종목별 피클 파일과 델타 세그먼트의 날짜를 함께 사용함
+    """
+
+    from ..datasets._price_store import _open_price_store
+    from ..datasets._price_store import _price_folder_path
+    from ..datasets._delta import _delta_folder_path
+
+    store = _open_price_store()
+    if store is None:
+        return None
+    date_list = [np.asarray(store["columns"]["Date"])]
+
+    folder_path = _price_folder_path()
+    for dir_entry in os.scandir(folder_path):
+        if not dir_entry.name.endswith(".pkl"):
+            continue
+        indexed = store["index"].get(dir_entry.name[:-4])
+        if (indexed is None) or (dir_entry.stat().st_mtime > indexed[2]):
+            date_list.append(pd.read_pickle(dir_entry.path, compression="xz")["Date"].values)
+
+    delta_path = _delta_folder_path()
+    if os.path.exists(delta_path):
+        for dir_entry in os.scandir(delta_path):
+            if dir_entry.name.endswith(".pkl"):
+                date_list.append(pd.read_pickle(dir_entry.path, compression="xz")["Date"].values)
+
+    dates = np.unique(np.concatenate([_to_datetime(dates).values.astype("datetime64[D]") for dates in date_list]))
+    return dates[~np.isnat(dates)]
+
+
+def _build_calendar(dates):
+    dates = np.unique(np.asarray(dates, dtype="datetime64[D]"))
+    dates = dates[~np.isnat(dates)]
+    index = pd.DatetimeIndex(dates.astype("datetime64[ns]"), name="Date")
+    n = len(dates)
+
+    month = dates.astype("datetime64[M]")
+    month_key = month.astype(np.int64)
+    quarter_key = month_key // 3
+    # 월요일 기준 주: 1970-01-01은 목요일이므로 3일을 더해서 나눔
+    week_key = (dates.astype(np.int64) + 3) // 7
+
+    def ordinal(key):
+        changed = np.ones(n, dtype=bool)
+        changed[1:] = key[1:] != key[:-1]
+        return np.cumsum(changed) - 1, changed
+
+    month_ord, month_first = ordinal(month_key)
+    quarter_ord, _ = ordinal(quarter_key)
+    week_ord, _ = ordinal(week_key)
+
+    # 달 안에서의 거래일 순서 (앞에서부터, 뒤에서부터)
+    position = np.arange(n)
+    month_start_pos = np.maximum.accumulate(np.where(month_first, position, 0))
+    # 마지막 거래일 다음 개장일(평일이면서 고정 휴장일이 아닌 날)이 다음 달(분기)이면 마지막 달(분기)이 끝난 것으로 봄
+    # (끝나지 않은 마지막 달은 월말/분기말로 표시하지 않고, 월말까지 남은 거래일 수는 남은 개장일 수로 계산)
+    last_year = int(str(dates[-1])[:4]) if n > 0 else 1970
+    holidays = _fixed_holidays(last_year, last_year + 1)
+    last_next = np.busday_offset(dates[-1:], 1, roll="backward", holidays=holidays)
+    month_complete = bool(last_next.astype("datetime64[M]")[0] > month[-1]) if n > 0 else True
+    quarter_complete = bool(last_next.astype("datetime64[M]").astype(np.int64)[0] // 3 > quarter_key[-1]) if n > 0 else True
+    month_last = np.append(month_first[1:], True)
+    month_end_pos = np.minimum.accumulate(np.where(month_last, position, n - 1)[::-1])[::-1]
+    days_to_month_end = month_end_pos - position
+    quarter_last = np.append(quarter_key[1:] != quarter_key[:-1], quarter_complete)
+    month_end = _month_day_flags(dates, "end")
+    month_mid = _month_day_flags(dates, "mid")
+    if not month_complete:
+        final_month = month == month[-1]
+        next_month = (month[-1] + 1).astype("datetime64[D]")
+        days_to_month_end[final_month] = np.busday_count(dates[final_month] + 1, next_month, holidays=holidays)
+        month_end[final_month] = False
+        # 월중은 15일과 가장 가까운 거래일이므로 15일 이후 거래일이 있어야 정해짐
+        if (dates[-1] - month[-1].astype("datetime64[D]")).astype(np.int64) + 1 < 15:
+            month_mid[final_month] = False
+
+    # 다음(이전) 평일이 거래일이 아니면 휴장일 전(후) 거래일 (주말은 휴장으로 보지 않음, 달력의 양 끝은 False)
+    # (1998년 이전의 토요일 거래일은 직전 평일을 기준으로 다음 평일을, 다음 평일을 기준으로 이전 평일을 찾음)
+    next_weekday = np.busday_offset(dates, 1, roll="backward")
+    prev_weekday = np.busday_offset(dates, -1, roll="forward")
+    pre_holiday = np.zeros(n, dtype=bool)
+    post_holiday = np.zeros(n, dtype=bool)
+    pre_holiday[:-1] = dates[1:] > next_weekday[:-1]
+    post_holiday[1:] = dates[:-1] < prev_weekday[1:]
+
+    calendar = pd.DataFrame(
+        {
+            "year": index.year.values,
+            "month": index.month.values,
+            "day": index.day.values,
+            "weekday": index.weekday.values,
+            "week_ord": week_ord,
+            "month_ord": month_ord,
+            "quarter_ord": quarter_ord,
+            "day_of_month": position - month_start_pos + 1,
+            "days_to_month_end": days_to_month_end,
+            "month_start": _month_day_flags(dates, "start"),
+            "month_mid": month_mid,
+            "month_end": month_end,
+            "quarter_end": quarter_last,
+            "pre_holiday": pre_holiday,
+            "post_holiday": post_holiday,
+        },
+        index=index,
+    )
+    return calendar
+
+
+def trading_calendar(dates=None, refresh=False):
+    """
+    거래일마다 요일, 월초/월중/월말 여부, 주/월/분기 순번 등을 미리 계산한 거래일 달력을 반환
+
+    모든 종목이 같은 거래일 달력을 공유하므로 한 번만 만들어서 보관하며,
+    종목별 달력 신호는 calendar_signal로 날짜 위치만 찾아서 가져옴
+
+    Parameters:
+    ==========================
+    dates: array-like, default: None
+        거래일 목록 (None으로 입력시 가격 저장소와 이후에 추가된 종목별 파일, 델타 세그먼트의 모든 거래일을 사용하며,
+        저장된 데이터가 바뀔 때까지 결과를 보관함)
+    refresh: bool, default: False
+        True이면 보관 중인 달력을 무시하고 다시 만듦
+
+    returns:
+    ==========================
+    calendar: DataFrame
+        행이 거래일이고 열이 아래와 같은 데이터프레임
+        - year, month, day, weekday: 연, 월, 일, 요일 (0: 월요일 ~ 4: 금요일)
+        - week_ord, month_ord, quarter_ord: 첫 거래일부터의 주/월/분기 순번 (0부터 시작)
+        - day_of_month: 달 안에서 몇 번째 거래일인지 (1부터 시작)
+        - days_to_month_end: 달의 마지막 거래일까지 남은 거래일 수 (마지막 거래일은 0, 끝나지 않은 마지막 달은 남은 평일 수)
+        - month_start, month_mid, month_end: month_effect와 같은 기준의 월초/월중/월말 거래일 여부 (끝나지 않은 마지막 달의 월말은 False)
+        - quarter_end: 분기 마지막 거래일 여부 (끝나지 않은 마지막 분기는 False)
+        - pre_holiday, post_holiday: 평일 휴장일 전/후 거래일 여부
+    """
+
+    if dates is not None:
+        return _build_calendar(dates)
+    version = _calendar_version()
+    if refresh or ("calendar" not in _calendar) or (_calendar["version"] != version):
+        dates = _store_dates()
+        if dates is None:
+            raise ValueError("가격 저장소가 없습니다. build_price_store를 먼저 실행하거나 dates를 입력해야 합니다.")
+        _calendar["calendar"] = _build_calendar(dates)
+        _calendar["version"] = version
+    return _calendar["calendar"]
+
+
+def _extend_calendar(calendar, end_date, holidays=None):
+
+    """
+    달력의 마지막 날짜 다음 날부터 end_date까지 개장일을 추정해서 더한 달력을 반환
+
+    개장일은 평일 중에서 날짜가 고정된 휴장일(FIXED_HOLIDAYS)과 holidays를 뺀 날로 추정함
+
+    Parameters:
+    ==========================
+    calendar: DataFrame
+        늘릴 거래일 달력
+    end_date: str or datetime64
+        추정할 마지막 날짜
+    holidays: array-like, default: None
+        추정할 때 추가로 뺄 휴장일 목록 (설날, 추석 등)
+    """
+
+    dates = calendar.index.values.astype("datetime64[D]")
+    end_date = np.datetime64(pd.Timestamp(end_date).date(), "D")
+    extra = np.array([], dtype="datetime64[D]") if holidays is None else _to_datetime(holidays).values.astype("datetime64[D]")
+    holidays = np.concatenate([_fixed_holidays(pd.Timestamp(dates[-1]).year, pd.Timestamp(end_date).year), extra])
+    future = np.arange(dates[-1] + 1, end_date + 1)
+    future = future[np.is_busday(future, holidays=holidays)]
+    return _build_calendar(np.concatenate([dates, future]))
+
+
+def _date_ordinal(data, calendar, date_col):
+    """data의 각 날짜가 달력의 몇 번째 거래일인지와, 달력에 있는 날짜인지 여부를 반환"""
+
+    calendar_dates = calendar.index.values
+    dates = _to_datetime(data[date_col].values).values.astype(calendar_dates.dtype)
+    ordinal = np.searchsorted(calendar_dates, dates)
+    ordinal = np.minimum(ordinal, len(calendar_dates) - 1)
+    found = calendar_dates[ordinal] == dates
+    missing = ~found & ~np.isnat(dates)
+    if missing.any():
+        warnings.warn(
+            "거래일 달력에 없는 날짜 {}개는 달력 신호가 False(-1)입니다 ({} ~ {}). 해당 날짜의 가격 데이터를 저장하거나 calendar를 입력해야 합니다.".format(
+                int(missing.sum()), pd.Timestamp(dates[missing].min()).date(), pd.Timestamp(dates[missing].max()).date()
+            ),
+            stacklevel=3,
+        )
+    return ordinal, found
+
+
+def calendar_signal(data, column, date_col = "Date", calendar = None):
+    """
+    거래일 달력의 컬럼을 data의 날짜에 맞춰서 반환
+
+    Parameters:
+    ==========================
+    data: DataFrame
+     주가 데이터 (FinanceDataReader나 이 패키지를 통해 수집한 데이터 구조와 일치해야 함)
+    column: str
+     가져올 달력 컬럼명 (예: "month_end", "pre_holiday", "quarter_end", "weekday")
+    date_col: str, default: Date
+     data에서 날짜를 나타내는 컬럼명
+    calendar: DataFrame, default: None
+     사용할 거래일 달력 (None으로 입력시 trading_calendar())
+
+    returns:
+    ==========================
+    arr: ndarray
+     data와 길이가 같은 배열 (달력에 없는 날짜는 부울 컬럼이면 False, 아니면 -1이며 경고를 출력함)
+    """
+
+    calendar = trading_calendar() if calendar is None else calendar
+    if column not in calendar.columns:
+        raise ValueError("column은 {} 중 하나이어야 합니다: {}".format(list(calendar.columns), column))
+    ordinal, found = _date_ordinal(data, calendar, date_col)
+    values = calendar[column].values
+    return np.where(found, values[ordinal], False if values.dtype == bool else -1)
+
+
+def turn_of_month(data, n_before = 1, n_after = 3, date_col = "Date", calendar = None):
+    """
+    월말 n_before 거래일부터 월초 n_after 거래일까지(turn of the month) 여부를 반환
+
+    Parameters:
+    ==========================
+    data: DataFrame
+     주가 데이터 (FinanceDataReader나 이 패키지를 통해 수집한 데이터 구조와 일치해야 함)
+    n_before: int, default: 1
+     포함할 월말 거래일 수
+    n_after: int, default: 3
+     포함할 월초 거래일 수
+    date_col: str, default: Date
+     data에서 날짜를 나타내는 컬럼명
+    calendar: DataFrame, default: None
+     사용할 거래일 달력 (None으로 입력시 trading_calendar())
+
+    returns:
+    ==========================
+    arr: ndarray
+     turn of the month 기간이 True인 부울 배열 (달력에 없는 날짜는 False이며 경고를 출력함)
+    """
+
+    if n_before < 0 or n_after < 0:
+        raise ValueError("n_before와 n_after는 0 이상이어야 합니다.")
+    calendar = trading_calendar() if calendar is None else calendar
+    ordinal, found = _date_ordinal(data, calendar, date_col)
+    window = (calendar["days_to_month_end"].values < n_before) | (calendar["day_of_month"].values <= n_after)
+    return found & window[ordinal]
@@ -3,11 +3,49 @@ from ._base import load_stock_data
 from ._base import load_stock_data_list
 from ._base import load_fs_data
 from ._base import _read_fs_record
+from ._price_store import build_price_store
+from ._panel import load_stock_panel
+from ._manifest import build_manifest
+from ._manifest import verify_manifest
+from ._manifest import stock_codes_to_refresh
+from ._delta import compact_stock_data
+from ._cache import enable_cache
+from ._cache import disable_cache
+from ._cache import clear_cache
+from ._cache import cache_info
+from ._fs_store import build_fs_store
+from ._fs_panel import load_fs_panel
+from ._pit import load_pit_panel
+from ._partition import build_price_partitions
+from ._source import FdrSource
+from ._source import LocalSource
+from ._source import set_data_source
+from ._source import get_data_source
+from ._refresh import refresh_universe
 
 __all__ = [
     "load_stock_list",
     "load_stock_data_list",
     "load_stock_data",
     "load_fs_data",
-    "_read_fs_record"
+    "_read_fs_record",
+    "build_price_store",
+    "load_stock_panel",
+    "build_manifest",
+    "verify_manifest",
+    "stock_codes_to_refresh",
+    "compact_stock_data",
+    "enable_cache",
+    "disable_cache",
+    "clear_cache",
+    "cache_info",
+    "build_fs_store",
+    "load_fs_panel",
+    "load_pit_panel",
+    "build_price_partitions",
+    "FdrSource",
+    "LocalSource",
+    "set_data_source",
+    "get_data_source",
+    "refresh_universe"
 ]
\ No newline at end of file
@@ -1,13 +1,149 @@
-import FinanceDataReader as fdr
 import pandas as pd
 import time
 import os
-from pkg_resources import resource_filename
-from ..utils import name_to_code
-from ..utils import name_list
+from concurrent.futures import ProcessPoolExecutor
+from ..utils._base import _package_path
+from ..utils import resolve
+from ..utils._base import _stock_code_list
+from ._price_store import _read_price_store
+from ._manifest import _manifest_entry
+from ._manifest import _update_manifest
+from ._manifest import _write_pickle
+from ._delta import _delta_file_paths
+from ._delta import _can_append
+from ._delta import _append_delta
+from ._delta import _write_merged
+from ._delta import _apply_delta
+from ._cache import _cache_get
+from ._cache import _cache_put
+from ._cache import _cache_invalidate
+from ._partition import _read_partitions
+from ._fs_store import _fs_terms
+from ._fs_store import _gather_fs_store
+from ._source import get_data_source
+from ._compact import _compact_price_data
+from ._compact import _compact_fs_data
 import numpy as np
 
 
+def _covers(first_date, last_date, start_date, end_date, download):
+    """[first_date, last_date]가 [start_date, end_date] 기간을 포함하는지 여부 (end_date가 None이면 download가 False일 때만 포함으로 봄)"""
+
+    if first_date is None:
+        return False
+    if (start_date is not None) and (pd.to_datetime(first_date) > pd.to_datetime(start_date)):
+        return False
+    if end_date is None:
+        return not download
+    return pd.to_datetime(last_date) >= pd.to_datetime(end_date)
+
+
+def _price_file_path(stock_code):
+    return _package_path("datasets/pickle_data/stock_price/{}.pkl".format(stock_code))
+
+
+def _read_local_stock_data(stock_code):
+    """가격 저장소 -> 피클 파일 순으로 종목 데이터를 찾고 델타 세그먼트를 이어 붙여서 반환 (둘 다 없으면 None)"""
+
+    file_path = _price_file_path(stock_code)
+    entry = _manifest_entry(stock_code, file_path)
+    delta_paths = _delta_file_paths(stock_code, None if entry is None else entry.get("segments", 0))
+
+    # 가격 저장소는 압축을 풀지 않고 필요한 구간만 읽으므로 캐시하지 않음
+    data = _read_price_store(stock_code, file_path)
+    if (data is not None) and (len(delta_paths) == 0):
+        return data
+
+    mtime = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+    key = (stock_code, mtime, len(delta_paths))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    if (data is None) and (mtime is not None):
+        data = pd.read_pickle(file_path, compression = "xz")
+        data["Date"] = pd.to_datetime(data["Date"])
+    if len(delta_paths) > 0:
+        data = _apply_delta(data, [pd.read_pickle(delta_path, compression = "xz") for delta_path in delta_paths])
+    if data is None:
+        return None
+    return _cache_put(key, data)
+
+
+def _read_local_range(stock_code, start_date, end_date):
+    """로컬 데이터에서 [start_date, end_date] 기간만 반환 (가격 저장소 -> 연도 파티션 -> 전체 데이터 순으로 찾고, 로컬 데이터가 없으면 None)"""
+
+    if (start_date is not None) or (end_date is not None):
+        file_path = _price_file_path(stock_code)
+        entry = _manifest_entry(stock_code, file_path)
+        delta_paths = _delta_file_paths(stock_code, None if entry is None else entry.get("segments", 0))
+        data = _read_price_store(stock_code, file_path) if len(delta_paths) == 0 else None
+        if data is None:
+            # 기간과 겹치는 연도 파일만 읽고, 기본 파일 뒤에 추가된 델타 세그먼트를 이어 붙임
+            data = _read_partitions(stock_code, start_date, end_date, file_path)
+            if data is not None:
+                data = _apply_delta(data, [pd.read_pickle(delta_path, compression = "xz") for delta_path in delta_paths])
+        if data is not None:
+            return _slice_date(data, start_date, end_date)
+    data = _read_local_stock_data(stock_code)
+    return None if data is None else _slice_date(data, start_date, end_date)
+
+
+def _local_date_range(stock_code, file_path):
+
+    """
+    로컬 데이터의 시작/끝 날짜를 반환 (매니페스트 항목이 있으면 파일을 읽지 않음)
+
+    :return : (first_date, last_date, data)
+        로컬 데이터가 없으면 first_date와 last_date는 None
+        매니페스트 항목이 없어서 데이터를 읽었으면 data는 읽은 데이터, 아니면 None
+    """
+
+    entry = _manifest_entry(stock_code, file_path)
+    if entry is not None:
+        return entry["first_date"], entry["last_date"], None
+    data = _read_local_stock_data(stock_code)
+    if (data is None) or (len(data) == 0):
+        return None, None, data
+    return data["Date"].min(), data["Date"].max(), data
+
+
+def _load_local_stock_data(stock_code, start_date, end_date, download, compact=False):
+
+    """
+    로컬 데이터만으로 load_stock_data를 처리할 수 있으면 처리 (프로세스 풀에서 실행됨)
+
+    :return : (data, error)
+        - 로컬 데이터가 기간을 포함하면 (data, None)
+        - 로컬 데이터를 읽다가 오류가 나면 (None, 오류 메시지)
+        - 원격에서 수집해야 하면 (None, None)
+    """
+
+    try:
+        first_date, last_date, data = _local_date_range(stock_code, _price_file_path(stock_code))
+        if not _covers(first_date, last_date, start_date, end_date, download):
+            return None, None
+        data = _read_local_range(stock_code, start_date, end_date) if data is None else _slice_date(data, start_date, end_date)
+        if len(data) == 0:
+            raise ValueError("관련 데이터가 없습니다")
+        return (_compact_price_data(data) if compact else data), None
+    except Exception as e:
+        return None, "{}: {}".format(type(e).__name__, e)
+
+
+def _slice_date(data, start_date, end_date):
+    """data에서 [start_date, end_date] 기간만 잘라서 반환"""
+
+    cond = np.ones(len(data), dtype=bool)
+    if start_date is not None:
+        cond &= (data["Date"] >= pd.to_datetime(start_date)).values
+    if end_date is not None:
+        cond &= (data["Date"] <= pd.to_datetime(end_date)).values
+    if cond.all():
+        return data
+    return data.loc[cond].reset_index(drop=True)
+
+
 def load_stock_list(
     market="all", including_futures=False, return_name_and_code_only=True
 ):
@@ -37,16 +173,17 @@ def load_stock_list(
         조건에 맞는 종목 정보 (자료형: 데이터프레임)
     """
 
+    source = get_data_source()
     if market == "all":
         stock_list = pd.concat(
-            [fdr.StockListing("KOSPI"), fdr.StockListing("KOSDAQ")],
+            [source.fetch_listing("KOSPI"), source.fetch_listing("KOSDAQ")],
             axis=0,
             ignore_index=True,
         )
     elif market == "KOSPI":
-        stock_list = fdr.StockListing("KOSPI")
+        stock_list = source.fetch_listing("KOSPI")
     elif market == "KOSDAQ":
-        stock_list = fdr.StockListing("KOSDAQ")
+        stock_list = source.fetch_listing("KOSDAQ")
     else:
         raise ValueError('market의 입력 값은 ("all", "KOSPI", "KOSDAQ") 중 하나여야 합니다')
     if not (including_futures):
@@ -57,7 +194,7 @@ def load_stock_list(
         return stock_list
 
 
-def load_stock_data(stock_code_or_name, start_date=None, end_date=None, download=True):
+def load_stock_data(stock_code_or_name, start_date=None, end_date=None, download=True, compact=False):
 
     """
     하나의 종목 코드를 입력받아, 해당 데이터를 반환
@@ -72,63 +209,63 @@ def load_stock_data(stock_code_or_name, start_date=None, end_date=None, download
         수집 종료 날짜: YYYY-MM-DD (None으로 입력시 최근 개장일로 설정)
     download: bool, default: True
         수집한 데이터를 다운로드받을지 여부로, 기존 데이터가 있으면 병합됨
+        (기존 데이터 뒤에 이어지는 행만 델타 세그먼트로 추가되며, compact_stock_data로 병합)
+    compact: bool, default: False
+        True이면 메모리를 줄인 자료형으로 반환 (저장되는 파일은 바뀌지 않음)
+        - Date: 1970-01-01부터 지난 일 수 (int32, pd.to_datetime(values, unit="D")로 되돌림)
+        - Open, High, Low, Close: float32 (16,777,216원 이하의 주가는 손실 없음)
+        - Change: float32 (상대 오차 약 6e-8 이하)
+        - Volume: 값이 들어가는 가장 작은 정수형
 
     :return : data, type: DataFrame
-        수집한 데이터
+        수집한 데이터 (download=True이면 기존 데이터와 병합된 데이터에서 요청한 기간만 반환)
     """
 
     # stock_code_or_name을 stock_code로 변환
-    if stock_code_or_name in name_list():
-        stock_code = name_to_code(stock_code_or_name)
-    else:
-        stock_code = stock_code_or_name
-        if not ((len(stock_code) == 6) and (stock_code.isdigit())):
-            raise ValueError("적절한 종목 코드가 아닙니다. 종목 코드는 6자리 숫자입니다.")
-
-    file_path = resource_filename(
-        __name__, "pickle_data/stock_price/{}.pkl".format(stock_code)
-    )
-    file_path = file_path.replace("\\", "/")
-    folder_path = "/".join(file_path.split("/")[:-1])
-    if stock_code in os.listdir(folder_path):
-        data = pd.read_pickle(file_path, compression = "xz")
-        data["Date"] = pd.to_datetime(data["Date"])
-        if (data["Date"].min() <= pd.to_datetime(start_date)) and (
-            data["Date"].max() >= pd.to_datetime(end_date)
-        ):
-            data = data.loc[
-                (data["Date"] <= pd.to_datetime(start_date))
-                & (data["Date"].max() >= pd.to_datetime(start_date))
-            ]
+    code_arr, unresolved = resolve([stock_code_or_name])
+    if unresolved[0]:
+        raise ValueError("적절한 종목 코드가 아닙니다. 종목 코드는 6자리 숫자입니다.")
+    stock_code = code_arr[0]
+
+    file_path = _price_file_path(stock_code)
+
+    # 로컬 데이터의 기간은 매니페스트로 확인하고, 기간을 포함할 때만 가격 저장소 -> 피클 파일 순으로 읽음
+    first_date, last_date, local_data = _local_date_range(stock_code, file_path)
+    fetched = False
+    if _covers(first_date, last_date, start_date, end_date, download):
+        if local_data is None:
+            data = _read_local_range(stock_code, start_date, end_date)
         else:
-            data = fdr.DataReader(
-                stock_code, start=start_date, end=end_date
-            ).reset_index()
+            data = _slice_date(local_data, start_date, end_date)
     else:
-        data = fdr.DataReader(stock_code, start=start_date, end=end_date).reset_index()
+        data = get_data_source().fetch_prices([stock_code], start_date, end_date)[stock_code]
+        if isinstance(data, Exception):
+            raise data
+        fetched = True
     if len(data) == 0:
         raise ValueError("관련 데이터가 없습니다")
-    if download:
-        if stock_code + ".pkl" not in os.listdir(folder_path):
-            data.to_pickle(file_path, compression = "xz")
+    if download and fetched:
+        # 저장한 뒤에는 기존 데이터와 병합된 결과(Change도 이어서 계산됨)를 요청한 기간만큼 반환
+        _store_fetched(stock_code, data, file_path, first_date, local_data)
+        data = _read_local_range(stock_code, start_date, end_date)
+    return _compact_price_data(data) if compact else data
+
+
+def _store_fetched(stock_code, data, file_path, first_date, local_data):
+    """원격에서 가져온 데이터를 로컬 데이터에 반영 (이어지는 행만 델타 세그먼트로 추가하고, 그럴 수 없을 때만 전체를 다시 저장)"""
+
+    entry = _manifest_entry(stock_code, file_path)
+    if _can_append(entry, data):
+        _append_delta(stock_code, data, entry)
+    else:
+        if (local_data is None) and (first_date is not None):
+            local_data = _read_local_stock_data(stock_code)
+        if local_data is None:
+            _write_pickle(data, file_path)
+            _update_manifest(stock_code, data, file_path)
         else:
-            old_data = pd.read_pickle(file_path, compression="xz")
-            old_data["Date"] = pd.to_datetime(old_data["Date"])
-            data = pd.concat([data, old_data], axis=0, ignore_index=True)
-            data = data.drop_duplicates(subset = ["Date"]).sort_values(by="Date").reset_index(drop=True)
-            change = (data["Close"].values[1:] - data["Close"].values[:-1]) / data["Close"].values[:-1]
-            change = np.insert(change, 0, np.nan)
-            data["Change"] = change
-
-            change_null_idx = data.loc[data["Change"].isnull()].index
-            for idx in change_null_idx:
-                if idx - 1 in data.index:
-                    change_value = (
-                        data.loc[idx + 1, "Close"] - data.loc[idx, "Close"]
-                    ) / data.loc[idx, "Close"]
-                    data.loc[idx, "Change"] = change_value
-            data.to_pickle(file_path, compression = "xz")
-    return data
+            _write_merged(stock_code, data, local_data, file_path)
+    _cache_invalidate(stock_code)
 
 
 def load_stock_data_list(
@@ -138,6 +275,10 @@ def load_stock_data_list(
     download=True,
     sleep_time_between_load=1,
     sleep_time_connection_out=15,
+    n_jobs=1,
+    return_errors=False,
+    batch_size=32,
+    compact=False,
 ):
     """
     여러 종목 데이터를 수집하여 전달
@@ -153,39 +294,90 @@ def load_stock_data_list(
     download: bool, default: True
         수집한 데이터를 다운로드받을지 여부로, 기존 데이터가 있으면 병합됨
     sleep_time_between_load: int, default: 1
-        한 데이터를 수집하고 나서 기다리는 시간(초)
+        원격에서 한 묶음(batch_size개 종목)을 수집하고 나서 기다리는 시간(초) (로컬 데이터를 읽을 때는 기다리지 않음)
     sleep_time_connection_out: int, default: 15
-        연결이 끊겼을 때 기다리는 시간(분)
+        묶음 안에서 연결 오류가 발생했을 때 기다리는 시간(분)
+    n_jobs: int, default: 1
+        로컬 데이터를 읽을 프로세스 수 (1이면 순차 처리, None이면 CPU 수)
+    return_errors: bool, default: False
+        True이면 수집에 실패한 종목과 오류 메시지를 담은 딕셔너리를 함께 반환
+    batch_size: int, default: 32
+        데이터 소스(set_data_source)에 한 번에 요청하는 종목 수
+    compact: bool, default: False
+        True이면 메모리를 줄인 자료형으로 반환 (load_stock_data의 compact 참고)
 
     :return : data_list, type: list
-        수집한 데이터 목록
+        수집한 데이터 목록 (입력 순서 유지, 실패한 종목은 제외)
+        return_errors가 True이면 (data_list, error_dict)
     """
 
     data_list = []
+    error_dict = {}
 
     # stock_code_or_name_list를 stock_code_list로 변환
-    stock_code_list = []
-    for stock_code_or_name in stock_code_or_name_list:
-        if stock_code_or_name in name_list():
-            stock_code = name_to_code(stock_code_or_name)
-        else:
-            stock_code = stock_code_or_name
-            if not ((len(stock_code) == 6) and (stock_code.isdigit())):
-                raise ValueError("적절한 종목 코드가 아닙니다. 종목 코드는 6자리 숫자입니다: {}".format(stock_code))
-        stock_code_list.append(stock_code)
-
-    for code in stock_code_list:
-        try:
-            data = load_stock_data(code, start_date, end_date, download)
-            data_list.append(data)
+    stock_code_list = _stock_code_list(stock_code_or_name_list)
+
+    # 로컬 데이터 압축 해제는 CPU 작업이므로 프로세스 풀에서 처리
+    n = len(stock_code_list)
+    args = (stock_code_list, [start_date] * n, [end_date] * n, [download] * n, [compact] * n)
+    if n_jobs == 1:
+        local_list = list(map(_load_local_stock_data, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunksize = max(1, n // (4 * (n_jobs or os.cpu_count() or 1)))
+            local_list = list(executor.map(_load_local_stock_data, *args, chunksize=chunksize))
+
+    # 로컬 데이터로 처리하지 못한 종목만 데이터 소스에서 batch_size개씩 묶어서 가져오며, 묶음 사이에만 기다림
+    remote_list = [code for code, (data, error) in zip(stock_code_list, local_list) if (data is None) and (error is None)]
+    remote_dict = {}
+    source = get_data_source()
+    for start in range(0, len(remote_list), batch_size):
+        if start > 0:
             time.sleep(sleep_time_between_load)
-        except ValueError:
-            break
-        except:
+        batch = remote_list[start: start + batch_size]
+        fetched_dict = source.fetch_prices(batch, start_date, end_date)
+        connection_out = False
+        for code in batch:
+            data = fetched_dict.get(code, ValueError("관련 데이터가 없습니다"))
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                if len(data) == 0:
+                    raise ValueError("관련 데이터가 없습니다")
+                if download:
+                    file_path = _price_file_path(code)
+                    first_date, _, local_data = _local_date_range(code, file_path)
+                    _store_fetched(code, data, file_path, first_date, local_data)
+                    data = _read_local_range(code, start_date, end_date)
+                remote_dict[code] = _compact_price_data(data) if compact else data
+            except ValueError as e:
+                error_dict[code] = "{}: {}".format(type(e).__name__, e)
+            except Exception as e:
+                error_dict[code] = "{}: {}".format(type(e).__name__, e)
+                connection_out = True
+        if connection_out:
             time.sleep(60 * sleep_time_connection_out)
+
+    for code, (data, error) in zip(stock_code_list, local_list):
+        if error is not None:
+            error_dict[code] = error
+        elif data is not None:
+            data_list.append(data)
+        elif code in remote_dict:
+            data_list.append(remote_dict[code])
+
+    if return_errors:
+        return data_list, error_dict
     return data_list
 
 
+def _fs_report_file_name(file_path, _year, _quarter):
+    """재무제표 폴더에서 (_year, _quarter) 보고서 파일명을 반환 (여러 개면 먼저 제출된 보고서)"""
+
+    report_name = "_{}_{}Q_".format(_year, _quarter)
+    return sorted(file for file in os.listdir(file_path) if report_name in file)[0]
+
+
 def _read_fs_record(file_path, account_list, consolidated, _year, _quarter, add_date):
 
     """
@@ -209,22 +401,21 @@ def _read_fs_record(file_path, account_list, consolidated, _year, _quarter, add_
     :return : data, type: DataFrame
         행이 기업이고 열이 [계정명+날짜]인 데이터프레임
     """
-    report_name = "{}Q".format(_quarter)
-    file_name = [
-        file
-        for file in os.listdir(file_path)
-        if (str(_year) in file) and (report_name in file)
-    ][0]
+    file_name = _fs_report_file_name(file_path, _year, _quarter)
 
     df = pd.read_pickle(file_path + "/" + file_name, compression = "xz")
     if (consolidated) and ("연결재무제표" in df["개별/연결"].values):
-        fs_record = df.loc[
-            (df["개별/연결"] == "연결재무제표") & (df["계정명"].isin(account_list)), "금액"
-        ].values
+        fs_type = "연결재무제표"
     else:
-        fs_record = df.loc[
-            (df["개별/연결"] == "재무제표") & (df["계정명"].isin(account_list)), "금액"
-        ].values
+        fs_type = "재무제표"
+    # account_list 순서대로 정렬 (없는 계정은 결측)
+    fs_record = (
+        df.loc[(df["개별/연결"] == fs_type) & (df["계정명"].isin(account_list))]
+        .drop_duplicates(subset = ["계정명"])
+        .set_index("계정명")["금액"]
+        .reindex(account_list)
+        .values
+    )
     if add_date:
         date = file_name.split("_")[0]
         fs_record = np.insert(fs_record, 0, date)
@@ -239,6 +430,7 @@ def load_fs_data(
     consolidated=True,
     period="1Y",
     add_date=False,
+    compact=False,
 ):
     """
     재무 제표 데이터를 반환
@@ -257,7 +449,7 @@ def load_fs_data(
     consolidate: bool, default: True
         연결 재무 제표를 사용할 것인지 여부 (단, True여도 연결 재무 제표를 발표하지 않는 기업은 개별 재무 제표를 사용)
     period: str,
-        누적 기간 (1Y, 2Q, 1Q)
+        누적 기간 ("1Y", "6M", "3M")
         (예: quarter = "2021-2", period = "1Y"; 2020년 2분기부터 2021년 2분기까지 1년 동안의 누적 재무지표 (예: 매출액)
     missing: bool, default: "fillna"
         데이터가 없을 경우에 처리 방법
@@ -265,110 +457,48 @@ def load_fs_data(
         - "raise": 오류 발생
     add_date: bool, default: False
         사업 보고서가 등록된 날짜를 포함할 것인지 여부
+    compact: bool, default: False
+        True이면 메모리를 줄인 자료형으로 반환
+        - 계정 금액: float32 (상대 오차 약 6e-8 이하)
+        - 보고서_제출일: 1970-01-01부터 지난 일 수 (int32, pd.to_datetime(values, unit="D")로 되돌림)
+        - 인덱스(종목 코드): 범주형
 
     :return : data, type: DataFrame
         행이 기업이고 열이 [계정명+날짜]인 데이터프레임
     """
 
-    folder_path = resource_filename(__name__, "pickle_data/finance_state").replace('\\', '/')
+    folder_path = _package_path("datasets/pickle_data/finance_state")
     data = []
 
     # stock_code_or_name_list를 stock_code_list로 변환
-    stock_code_list = []
-    for stock_code_or_name in stock_code_or_name_list:
-        if stock_code_or_name in name_list():
-            stock_code = name_to_code(stock_code_or_name)
-        else:
-            stock_code = stock_code_or_name
-            if not ((len(stock_code) == 6) and (stock_code.isdigit())):
-                raise ValueError("적절한 종목 코드가 아닙니다. 종목 코드는 6자리 숫자입니다: {}".format(stock_code))
-        stock_code_list.append(stock_code)
+    stock_code_list = _stock_code_list(stock_code_or_name_list)
+
+    terms = _fs_terms(year, quarter, period)
+    signs = np.array([sign for sign, _, _ in terms], dtype=float)
+
+    # 재무제표 저장소가 있으면 모든 종목과 보고서를 한 번에 모으고, 없으면 종목별 파일을 읽음
+    gathered = _gather_fs_store(
+        stock_code_list, [(_year, _quarter) for _, _year, _quarter in terms], account_list, consolidated
+    )
+    if gathered is not None:
+        values, dates = gathered
+        data = pd.DataFrame(
+            (values * signs[None, :, None]).sum(axis=1), columns=account_list, index=stock_code_list
+        )
+        if add_date:
+            data.insert(0, "보고서_제출일", pd.Series(dates[:, 0]).dt.strftime("%Y%m%d").values)
+        return _compact_fs_data(data) if compact else data
 
     for stock_code in stock_code_list:
         file_path = folder_path + "/{}".format(stock_code)
-        if period == "1Y":
-            if quarter == 4:
-                record = _read_fs_record(
-                    file_path, account_list, consolidated, year, 4, add_date
-                )
-            elif quarter == 3:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 3, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 4, add_date
-                )
-                record3 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 3, add_date
-                )
-                record = record1 + record2 - record3
-            elif quarter == 2:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 2, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 4, add_date
-                )
-                record3 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 2, add_date
-                )
-                record = record1 + record2 - record3
-            elif quarter == 1:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 1, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 4, add_date
-                )
-                record3 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 1, add_date
-                )
-                record = record1 + record2 - record3
-        elif period == "6M":
-            if quarter == 4:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 4, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 2, add_date
-                )
-                record = record1 - record2
-            elif quarter == 3:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 3, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 1, add_date
-                )
-                record = record1 - record2
-            elif quarter == 2:
-                record = _read_fs_record(
-                    file_path, account_list, consolidated, year, 2, add_date
-                )
-            elif quarter == 1:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, 1, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 4, add_date
-                )
-                record3 = _read_fs_record(
-                    file_path, account_list, consolidated, year - 1, 3, add_date
-                )
-                record = record1 + record2 - record3
-        elif period == "3M":
-            if quarter == 1:
-                record = _read_fs_record(
-                    file_path, account_list, consolidated, year, 1, add_date
-                )
-            else:
-                record1 = _read_fs_record(
-                    file_path, account_list, consolidated, year, quarter, add_date
-                )
-                record2 = _read_fs_record(
-                    file_path, account_list, consolidated, year, quarter + 1, add_date
-                )
-                record = record2 - record1
+        record = 0
+        for sign, _year, _quarter in terms:
+            record = record + sign * _read_fs_record(
+                file_path, account_list, consolidated, _year, _quarter, False
+            )
+        if add_date:
+            date = _fs_report_file_name(file_path, year, quarter).split("_")[0]
+            record = np.insert(record.astype(object), 0, date)
         data.append(record)
     if add_date:
         data = pd.DataFrame(
@@ -376,4 +506,4 @@ def load_fs_data(
         )
     else:
         data = pd.DataFrame(data, columns=account_list, index=stock_code_list)
-    return data
+    return _compact_fs_data(data) if compact else data
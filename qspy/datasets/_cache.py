@@ -0,0 +1,119 @@
+from collections import OrderedDict
+
+
+# 압축을 푼 가격 데이터를 보관하는 프로세스 내 LRU 캐시 (enable_cache로 켜야 사용됨)
+_cache = {
+    "enabled": False,
+    "max_bytes": 0,
+    "bytes": 0,
+    "frames": OrderedDict(),
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0,
+}
+
+
+def enable_cache(max_bytes=512 * 1024 ** 2):
+
+    """
+    load_stock_data 계열 함수가 압축을 푼 가격 데이터를 메모리에 보관하도록 설정
+
+    캐시 키는 (종목 코드, 피클 파일 수정 시각, 델타 세그먼트 수)이므로 파일이 바뀌면 자동으로 새로 읽으며,
+    캐시에서 꺼낼 때마다 복사본을 반환하므로 반환된 데이터를 수정해도 캐시는 바뀌지 않음
+    (복사는 xz 압축을 푸는 것보다 훨씬 빠름)
+
+    Parameters:
+    ==========================
+    max_bytes: int, default: 512 * 1024 ** 2
+        캐시가 사용할 최대 메모리 (바이트), 넘으면 가장 오래 사용하지 않은 데이터부터 제거
+    """
+
+    if max_bytes <= 0:
+        raise ValueError("max_bytes는 0보다 커야 합니다.")
+    _cache["enabled"] = True
+    _cache["max_bytes"] = max_bytes
+    _evict()
+
+
+def disable_cache():
+    """캐시를 끄고 보관 중인 데이터를 모두 제거"""
+
+    _cache["enabled"] = False
+    clear_cache()
+
+
+def clear_cache():
+    """보관 중인 데이터와 통계를 모두 초기화"""
+
+    _cache["frames"].clear()
+    _cache["bytes"] = 0
+    _cache["hits"] = 0
+    _cache["misses"] = 0
+    _cache["evictions"] = 0
+
+
+def cache_info():
+
+    """
+    캐시 통계를 반환
+
+    :return : info, type: dict
+        enabled, hits, misses, evictions, size(보관 중인 종목 수), bytes, max_bytes를 키로 하는 딕셔너리
+    """
+
+    return {
+        "enabled": _cache["enabled"],
+        "hits": _cache["hits"],
+        "misses": _cache["misses"],
+        "evictions": _cache["evictions"],
+        "size": len(_cache["frames"]),
+        "bytes": _cache["bytes"],
+        "max_bytes": _cache["max_bytes"],
+    }
+
+
+def _evict():
+    frames = _cache["frames"]
+    while (_cache["bytes"] > _cache["max_bytes"]) and (len(frames) > 0):
+        _, (_, n_bytes) = frames.popitem(last=False)
+        _cache["bytes"] -= n_bytes
+        _cache["evictions"] += 1
+
+
+def _cache_get(key):
+    """캐시된 데이터의 복사본을 반환 (없거나 캐시가 꺼져 있으면 None)"""
+
+    if not _cache["enabled"]:
+        return None
+    frames = _cache["frames"]
+    if key not in frames:
+        _cache["misses"] += 1
+        return None
+    frames.move_to_end(key)
+    _cache["hits"] += 1
+    return frames[key][0].copy(deep=True)
+
+
+def _cache_put(key, data):
+    """data의 복사본을 캐시에 넣고 data를 그대로 반환 (호출한 쪽이 data를 수정해도 캐시는 바뀌지 않음)"""
+
+    if not _cache["enabled"]:
+        return data
+    n_bytes = int(data.memory_usage(index=True, deep=False).sum())
+    if n_bytes > _cache["max_bytes"]:
+        return data
+    frames = _cache["frames"]
+    if key in frames:
+        _cache["bytes"] -= frames.pop(key)[1]
+    frames[key] = (data.copy(deep=True), n_bytes)
+    _cache["bytes"] += n_bytes
+    _evict()
+    return data
+
+
+def _cache_invalidate(stock_code):
+    """종목의 파일이 다시 저장되었을 때 해당 종목의 캐시를 모두 제거"""
+
+    frames = _cache["frames"]
+    for key in [key for key in frames if key[0] == stock_code]:
+        _cache["bytes"] -= frames.pop(key)[1]
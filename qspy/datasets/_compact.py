@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+
+# compact=True일 때의 정밀도
+# - 가격(Open, High, Low, Close): float32는 2 ** 24 = 16,777,216 이하의 정수를 정확히 표현하므로 원 단위 주가는 손실 없음
+# - Change, 재무제표 금액: float32로 변환되어 상대 오차가 2 ** -24 (약 6e-8) 이하
+# - Volume: 값이 모두 정수이면 최댓값이 들어가는 가장 작은 정수형 (손실 없음)
+# - Date, 보고서_제출일: 1970-01-01부터 지난 일 수(int32)로, pd.to_datetime(values, unit="D")로 되돌릴 수 있음 (손실 없음)
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _day_ordinal(dates):
+    """날짜 배열을 1970-01-01부터 지난 일 수(int32) 배열로 변환"""
+
+    dates = pd.to_datetime(dates).values.astype("datetime64[D]")
+    return (dates - EPOCH).astype(np.int32)
+
+
+def _compact_price_data(data):
+
+    """
+    가격 데이터를 작은 자료형으로 변환한 새 데이터프레임을 반환
+
+    Parameters:
+    ==========================
+    data: DataFrame
+        Date, Open, High, Low, Close, Volume, Change 컬럼이 있는 가격 데이터
+
+    :return : data, type: DataFrame
+        Date는 int32 일 수, 가격과 Change는 float32, Volume은 값이 들어가는 가장 작은 정수형
+    """
+
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if column == "Date":
+            columns[column] = _day_ordinal(values)
+        elif (column == "Volume") and pd.api.types.is_integer_dtype(values):
+            columns[column] = pd.to_numeric(values, downcast="integer").values
+        elif pd.api.types.is_numeric_dtype(values):
+            columns[column] = values.values.astype(np.float32)
+        else:
+            columns[column] = values.values
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+
+def _compact_fs_data(data):
+    """재무제표 데이터의 금액을 float32로, 보고서_제출일을 int32 일 수로, 종목 코드를 범주형 인덱스로 변환"""
+
+    columns = {}
+    for column in data.columns:
+        if column == "보고서_제출일":
+            columns[column] = _day_ordinal(pd.to_datetime(data[column], format="%Y%m%d"))
+        else:
+            columns[column] = pd.to_numeric(data[column]).values.astype(np.float32)
+    return pd.DataFrame(columns, index=pd.CategoricalIndex(data.index), copy=False)
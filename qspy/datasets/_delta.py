@@ -0,0 +1,194 @@
+import os
+import numpy as np
+import pandas as pd
+from ..utils._base import _package_path
+from ._manifest import _set_manifest_entry
+from ._manifest import _update_manifest
+from ._manifest import _write_pickle
+from ._cache import _cache_invalidate
+from ._partition import _refresh_partitions
+
+
+# 델타 세그먼트가 이 개수에 도달하면 자동으로 압축(병합)함
+MAX_DELTA_SEGMENTS = 30
+
+
+def _delta_folder_path():
+    return _package_path("datasets/pickle_data/stock_price/delta")
+
+
+def _delta_file_paths(stock_code, n_segments=None):
+
+    """
+    종목의 델타 세그먼트 파일 경로 목록을 순서대로 반환
+
+    Parameters:
+    ==========================
+    stock_code: str
+        종목 코드
+    n_segments: int, default: None
+        매니페스트에 기록된 세그먼트 수 (None으로 입력시 델타 폴더를 조회)
+    """
+
+    folder_path = _delta_folder_path()
+    if n_segments is None:
+        if not os.path.exists(folder_path):
+            return []
+        file_names = sorted(
+            file_name for file_name in os.listdir(folder_path)
+            if file_name.startswith(stock_code + "_") and file_name.endswith(".pkl")
+        )
+        return [folder_path + "/" + file_name for file_name in file_names]
+    return [folder_path + "/{}_{:04d}.pkl".format(stock_code, seq) for seq in range(1, n_segments + 1)]
+
+
+def _read_delta(stock_code, entry=None):
+    """종목의 델타 세그먼트를 모두 읽어서 리스트로 반환 (entry가 있으면 델타 폴더를 조회하지 않음)"""
+
+    n_segments = None if entry is None else entry.get("segments", 0)
+    return [
+        pd.read_pickle(file_path, compression="xz")
+        for file_path in _delta_file_paths(stock_code, n_segments)
+    ]
+
+
+def _apply_delta(data, delta_list):
+    """기본 데이터에 델타 세그먼트를 반영하여 반환 (날짜가 겹치면 뒤에 저장된 세그먼트의 행이 우선)"""
+
+    if len(delta_list) == 0:
+        return data
+    delta = pd.concat(delta_list, axis=0, ignore_index=True)
+    delta["Date"] = pd.to_datetime(delta["Date"])
+    delta = delta.drop_duplicates(subset = ["Date"], keep="last")
+    if data is None:
+        return delta.sort_values(by="Date", kind="stable").reset_index(drop=True)
+    data = data.loc[~pd.to_datetime(data["Date"]).isin(delta["Date"]).values]
+    data = pd.concat([data, delta], axis=0, ignore_index=True)
+    data["Date"] = pd.to_datetime(data["Date"])
+    return data.sort_values(by="Date", kind="stable").reset_index(drop=True)
+
+
+def _merge_stock_data(new_data, old_data):
+    """new_data와 old_data를 날짜 기준으로 병합하고 Change를 다시 계산 (날짜가 겹치면 new_data 우선)"""
+
+    data = pd.concat([new_data, old_data], axis=0, ignore_index=True)
+    data["Date"] = pd.to_datetime(data["Date"])
+    data = data.drop_duplicates(subset = ["Date"]).sort_values(by="Date").reset_index(drop=True)
+    close = data["Close"].values.astype(float)
+    change = (close[1:] - close[:-1]) / close[:-1]
+    data["Change"] = np.insert(change, 0, np.nan)
+    return data
+
+
+def _write_merged(stock_code, data, old_data, file_path):
+    """old_data(기본 파일 + 델타)와 병합한 전체 이력을 기본 파일로 다시 저장하고 델타를 삭제"""
+
+    data = _merge_stock_data(data, old_data)
+    _write_pickle(data, file_path)
+    _update_manifest(stock_code, data, file_path)
+    _refresh_partitions(stock_code, data, file_path)
+    for delta_path in _delta_file_paths(stock_code):
+        os.remove(delta_path)
+    return data
+
+
+def _can_append(entry, data):
+    """기존 데이터 앞쪽을 채울 필요가 없어서 델타 세그먼트만 추가하면 되는지 여부"""
+
+    if (entry is None) or (entry.get("last_close") is None) or (entry["first_date"] is None):
+        return False
+    # 새 데이터가 마지막 날짜까지 이어져야 겹치는 구간 뒤의 Change가 바뀌지 않음
+    dates = pd.to_datetime(data["Date"])
+    return (dates.min() >= pd.to_datetime(entry["first_date"])) and (dates.max() >= pd.to_datetime(entry["last_date"]))
+
+
+def _append_delta(stock_code, data, entry):
+
+    """
+    data를 델타 세그먼트로 저장
+
+    저장된 날짜와 겹치는 행도 함께 저장하며, 읽거나 병합할 때 뒤에 저장된 세그먼트의 행이 우선하므로
+    수정된 과거 값도 반영됨. Change는 세그먼트 안에서만 다시 계산하므로 (첫 행은 저장된 마지막 종가 혹은
+    수집한 Change를 사용) 저장 비용은 기존 이력의 길이가 아니라 새로 수집한 행의 수에 비례함
+
+    Parameters:
+    ==========================
+    stock_code: str
+        종목 코드
+    data: DataFrame
+        새로 수집한 데이터
+    entry: dict
+        종목의 매니페스트 항목
+
+    :return : n_rows, type: int
+        새로 추가된 날짜의 수
+    """
+
+    data = data.copy()
+    data["Date"] = pd.to_datetime(data["Date"])
+    tail = data.drop_duplicates(subset = ["Date"], keep="last").sort_values(by="Date").reset_index(drop=True)
+    last_date = pd.to_datetime(entry["last_date"])
+    n_new = int((tail["Date"] > last_date).sum())
+    if (n_new == 0) and (len(tail) == 1) and (float(tail["Close"].values[0]) == entry["last_close"]):
+        # 마지막 날짜만 다시 수집했고 종가가 같으면 저장할 것이 없음
+        return 0
+
+    close = tail["Close"].values.astype(float)
+    change = np.empty(len(tail))
+    change[1:] = (close[1:] - close[:-1]) / close[:-1]
+    if tail["Date"].values[0] > last_date.to_datetime64():
+        change[0] = (close[0] - entry["last_close"]) / entry["last_close"]
+    else:
+        change[0] = tail["Change"].values[0] if "Change" in tail.columns else np.nan
+    tail["Change"] = change
+
+    folder_path = _delta_folder_path()
+    os.makedirs(folder_path, exist_ok=True)
+    seq = entry.get("segments", 0) + 1
+    _write_pickle(tail, _delta_file_paths(stock_code, seq)[-1])
+
+    entry = dict(entry)
+    entry["last_date"] = tail["Date"].max().strftime("%Y-%m-%d")
+    entry["last_close"] = float(tail["Close"].values[-1])
+    entry["rows"] = entry["rows"] + n_new
+    entry["segments"] = seq
+    _set_manifest_entry(stock_code, entry)
+
+    if seq >= MAX_DELTA_SEGMENTS:
+        compact_stock_data([stock_code])
+    return n_new
+
+
+def compact_stock_data(stock_code_list=None):
+
+    """
+    델타 세그먼트를 기본 파일에 병합하여 종목별로 파일 하나만 남도록 정리
+
+    Parameters:
+    ==========================
+    stock_code_list: array-like, default: None
+        정리할 종목 코드 목록 (None으로 입력시 델타 세그먼트가 있는 모든 종목)
+
+    :return : code_list, type: list
+        정리한 종목 코드 목록
+    """
+
+    if stock_code_list is None:
+        folder_path = _delta_folder_path()
+        file_names = os.listdir(folder_path) if os.path.exists(folder_path) else []
+        stock_code_list = sorted(set(file_name.split("_")[0] for file_name in file_names))
+
+    code_list = []
+    price_folder_path = os.path.dirname(_delta_folder_path())
+    for stock_code in stock_code_list:
+        delta_list = _read_delta(stock_code)
+        if len(delta_list) == 0:
+            continue
+        file_path = price_folder_path + "/{}.pkl".format(stock_code)
+        base = pd.read_pickle(file_path, compression = "xz") if os.path.exists(file_path) else None
+        # 뒤에 저장된 델타가 우선하도록 역순으로 병합
+        new_data = pd.concat(delta_list[::-1], axis=0, ignore_index=True)
+        _write_merged(stock_code, new_data, base, file_path)
+        _cache_invalidate(stock_code)
+        code_list.append(stock_code)
+    return code_list
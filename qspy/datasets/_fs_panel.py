@@ -0,0 +1,133 @@
+import os
+import numpy as np
+import pandas as pd
+from ..utils._base import _package_path
+from ..utils._base import _stock_code_list
+from ._base import _read_fs_record
+from ._base import _fs_report_file_name
+from ._fs_store import _fs_terms
+from ._fs_store import _gather_fs_store
+
+
+def _gather_fs_files(stock_code_list, report_list, account_list, consolidated):
+    """재무제표 저장소가 없을 때 _gather_fs_store와 같은 결과를 종목별 파일에서 만듦 (보고서마다 한 번만 읽음)"""
+
+    folder_path = _package_path("datasets/pickle_data/finance_state")
+    values = np.full((len(stock_code_list), len(report_list), len(account_list)), np.nan)
+    dates = np.full((len(stock_code_list), len(report_list)), np.datetime64("NaT"), dtype="datetime64[ns]")
+    for i, stock_code in enumerate(stock_code_list):
+        file_path = folder_path + "/{}".format(stock_code)
+        if not os.path.isdir(file_path):
+            continue
+        for j, (_year, _quarter) in enumerate(report_list):
+            try:
+                file_name = _fs_report_file_name(file_path, _year, _quarter)
+            except IndexError:
+                continue
+            values[i, j] = _read_fs_record(file_path, account_list, consolidated, _year, _quarter, False)
+            dates[i, j] = pd.to_datetime(file_name.split("_")[0], format="%Y%m%d")
+    return values, dates
+
+
+def _fs_cube(stock_code_list, account_list, periods, consolidated, period_list):
+
+    """
+    (누적 기간, 연도, 분기)마다 필요한 보고서를 한 번씩만 모아서 누적 기간 재무 지표를 계산
+
+    :return : (cube, dates, avail_dates)
+        cube: 크기가 (종목 수, 누적 기간 수 x 분기 수, 계정 수)인 배열 (누적 기간이 바깥 순서)
+        dates: 각 (연도, 분기) 보고서의 제출일
+        avail_dates: 계산에 필요한 보고서가 모두 제출된 날짜 (하나라도 없으면 NaT)
+    """
+
+    # 출력 (누적 기간, 연도, 분기)마다 필요한 보고서 목록을 만들고, 전체 보고서는 한 번씩만 모음
+    term_list = [_fs_terms(_year, _quarter, _period) for _period in period_list for _year, _quarter in periods]
+    report_list = sorted(set((_year, _quarter) for terms in term_list for _, _year, _quarter in terms) | set(periods))
+    report_idx = {report: i for i, report in enumerate(report_list)}
+
+    gathered = _gather_fs_store(stock_code_list, report_list, account_list, consolidated)
+    if gathered is None:
+        gathered = _gather_fs_files(stock_code_list, report_list, account_list, consolidated)
+    values, report_dates = gathered
+
+    # 출력마다 (보고서 위치, 부호)를 최대 항 수에 맞춰 채운 뒤 한 번에 더함 (채운 항은 부호가 0)
+    n_terms = max(len(terms) for terms in term_list)
+    term_idx = np.zeros((len(term_list), n_terms), dtype=np.int64)
+    term_sign = np.zeros((len(term_list), n_terms))
+    for i, terms in enumerate(term_list):
+        for k, (sign, _year, _quarter) in enumerate(terms):
+            term_idx[i, k] = report_idx[(_year, _quarter)]
+            term_sign[i, k] = sign
+    sign = term_sign[None, :, :, None]
+    cube = np.where(sign != 0, values[:, term_idx, :] * sign, 0).sum(axis=2)
+
+    # 채운 항은 첫 번째 항(해당 보고서)의 제출일로 대신하여 최댓값에 영향이 없도록 함
+    term_dates = report_dates[:, term_idx]
+    term_dates = np.where(term_sign[None] != 0, term_dates, term_dates[:, :, :1])
+    avail_dates = term_dates.max(axis=2)
+    dates = report_dates[:, [report_idx[terms[0][1:]] for terms in term_list]]
+    return cube, dates, avail_dates
+
+
+def load_fs_panel(
+    stock_code_or_name_list,
+    account_list,
+    periods,
+    consolidated=True,
+    period="1Y",
+    add_date=False,
+):
+    """
+    여러 종목, 여러 (연도, 분기)의 재무 제표 데이터를 한 번에 반환
+
+    필요한 보고서를 모두 한 번씩만 모아서 (종목 x 보고서 x 계정) 배열을 만든 뒤,
+    누적 기간(1Y, 6M, 3M) 계산은 배열 연산으로 처리함
+
+    Parameters:
+    ==========================
+    stock_code_or_name_list: array-like,
+        수집할 종목 코드 혹은 이름으로 구성된 배열
+    account_list: array-like,
+        수집할 계정명으로 구성된 배열: ["유동자산", "비유동자산", "자산총계", "유동부채", "비유동부채", "부채총계",
+                         "자본금", "이익잉여금", "자본총계", "매출액", "영업이익", "법인세차감전 순이익", "당기순이익"]
+    periods: array-like,
+        (사업 연도, 사업 분기)로 구성된 배열 (예: [(2020, 4), (2021, 1), (2021, 2)])
+    consolidated: bool, default: True
+        연결 재무 제표를 사용할 것인지 여부 (단, True여도 연결 재무 제표를 발표하지 않는 기업은 개별 재무 제표를 사용)
+    period: str or array-like, default: "1Y"
+        누적 기간 ("1Y", "6M", "3M"), 여러 개를 입력하면 열이 (누적 기간, 계정명)인 데이터프레임을 반환
+    add_date: bool, default: False
+        사업 보고서가 등록된 날짜를 포함할 것인지 여부
+
+    :return : data, type: DataFrame
+        행이 (종목 코드, 연도, 분기)이고 열이 [날짜+계정명]인 데이터프레임 (보고서가 없으면 결측)
+    """
+
+    # stock_code_or_name_list를 stock_code_list로 변환
+    stock_code_list = _stock_code_list(stock_code_or_name_list)
+
+    account_list = list(account_list)
+    periods = [(int(_year), int(_quarter)) for _year, _quarter in periods]
+    period_list = [period] if isinstance(period, str) else list(period)
+
+    cube, dates, _ = _fs_cube(stock_code_list, account_list, periods, consolidated, period_list)
+
+    # (종목, 누적 기간, 연도, 분기, 계정) -> 행: (종목, 연도, 분기), 열: (누적 기간, 계정)
+    n_codes, n_periods = len(stock_code_list), len(periods)
+    cube = cube.reshape(n_codes, len(period_list), n_periods, len(account_list)).transpose(0, 2, 1, 3)
+    cube = cube.reshape(n_codes * n_periods, -1)
+    index = pd.MultiIndex.from_tuples(
+        [(stock_code, _year, _quarter) for stock_code in stock_code_list for _year, _quarter in periods],
+        names=["Code", "Year", "Quarter"],
+    )
+    if isinstance(period, str):
+        columns = pd.Index(account_list)
+    else:
+        columns = pd.MultiIndex.from_product([period_list, account_list])
+    data = pd.DataFrame(cube, index=index, columns=columns)
+
+    if add_date:
+        date = dates.reshape(n_codes, len(period_list), n_periods)[:, 0].reshape(-1)
+        column = "보고서_제출일" if isinstance(period, str) else ("보고서_제출일", "")
+        data.insert(0, column, pd.Series(date).dt.strftime("%Y%m%d").values)
+    return data
@@ -0,0 +1,204 @@
+import os
+import numpy as np
+import pandas as pd
+from ..utils._base import _package_path
+
+
+FS_COLUMNS = ["Code", "Year", "Quarter", "Date", "개별/연결", "계정명", "금액", "재무제표명"]
+
+# 프로세스마다 한 번만 읽는 재무제표 저장소
+_store = {}
+
+
+def _fs_folder_path():
+    return _package_path("datasets/pickle_data/finance_state")
+
+
+def _fs_store_path():
+    return _package_path("datasets/pickle_data/fs_store.pkl")
+
+
+def _quarter_terms(year, quarter):
+    """한 분기(3개월)의 재무 지표를 계산하는 데 필요한 보고서 목록 (4분기 보고서는 1년 값이므로 1~3분기 보고서를 뺌)"""
+
+    if quarter == 4:
+        return [(1, year, 4), (-1, year, 1), (-1, year, 2), (-1, year, 3)]
+    return [(1, year, quarter)]
+
+
+def _fs_terms(year, quarter, period):
+
+    """
+    누적 기간(period)의 재무 지표를 계산하는 데 필요한 보고서 목록을 반환
+
+    1~3분기 보고서의 손익 항목은 해당 분기 3개월 동안의 값이고, 4분기(사업) 보고서는 1년 동안의 값이므로
+    4분기의 3개월 값은 4분기 보고서에서 1~3분기 보고서를 빼서 구하고, 6M과 1Y는 분기 값을 더해서 구함
+
+    :return : terms, type: list
+        (부호, 연도, 분기)로 구성된 리스트 (첫 번째 항목이 (year, quarter) 보고서)
+    """
+
+    if quarter not in [1, 2, 3, 4]:
+        raise ValueError("quarter는 1, 2, 3, 4 중 하나이어야 합니다")
+    if period == "3M":
+        return _quarter_terms(year, quarter)
+    elif period == "6M":
+        n_quarters = 2
+    elif period == "1Y":
+        if quarter == 4:
+            return [(1, year, 4)]
+        n_quarters = 4
+    else:
+        raise ValueError('period는 "1Y", "6M", "3M" 중 하나이어야 합니다')
+
+    # (year, quarter)부터 거꾸로 n_quarters개 분기의 값을 더하고, 같은 보고서의 부호는 합침
+    signs = {}
+    for i in range(n_quarters):
+        _year, _quarter = divmod(year * 4 + quarter - 1 - i, 4)
+        for sign, term_year, term_quarter in _quarter_terms(_year, _quarter + 1):
+            signs[(term_year, term_quarter)] = signs.get((term_year, term_quarter), 0) + sign
+    return [(sign, _year, _quarter) for (_year, _quarter), sign in signs.items() if sign != 0]
+
+
+def build_fs_store(folder_path=None, store_path=None):
+
+    """
+    종목별 재무제표 피클 파일을 하나의 긴 형식(long format) 테이블로 변환 (최초 한 번만 실행)
+
+    종목 코드, 개별/연결, 계정명, 재무제표명은 범주형(categorical)으로 저장하고,
+    테이블은 (종목 코드, 연도, 분기) 순으로 정렬되어 load_fs_data가 이진 탐색으로 필요한 행만 모음
+
+    Parameters:
+    ==========================
+    folder_path: str, default: None
+        종목별 재무제표 폴더가 있는 폴더 (None으로 입력시 pickle_data/finance_state)
+    store_path: str, default: None
+        저장소 파일 경로 (None으로 입력시 pickle_data/fs_store.pkl)
+
+    :return : table, type: DataFrame
+        FS_COLUMNS를 컬럼으로 하는 테이블
+    """
+
+    folder_path = _fs_folder_path() if folder_path is None else folder_path
+    store_path = _fs_store_path() if store_path is None else store_path
+
+    pieces = []
+    for stock_code in sorted(os.listdir(folder_path)):
+        code_path = folder_path + "/" + stock_code
+        if not os.path.isdir(code_path):
+            continue
+        # 같은 (연도, 분기) 보고서가 여러 개면 먼저 제출된 보고서를 사용
+        seen = set()
+        for file_name in sorted(os.listdir(code_path)):
+            if not file_name.endswith("_report.pkl"):
+                continue
+            date, year, quarter = file_name.split("_")[:3]
+            if (year, quarter) in seen:
+                continue
+            seen.add((year, quarter))
+            df = pd.read_pickle(code_path + "/" + file_name, compression="xz")
+            df = df[["개별/연결", "계정명", "금액", "재무제표명"]].copy()
+            df["Code"] = stock_code
+            df["Year"] = int(year)
+            df["Quarter"] = int(quarter[0])
+            df["Date"] = pd.to_datetime(date, format="%Y%m%d")
+            pieces.append(df)
+
+    table = pd.concat(pieces, axis=0, ignore_index=True)[FS_COLUMNS]
+    for column in ["Code", "개별/연결", "계정명", "재무제표명"]:
+        table[column] = table[column].astype("category")
+    table["Year"] = table["Year"].astype(np.int16)
+    table["Quarter"] = table["Quarter"].astype(np.int8)
+    table["금액"] = table["금액"].astype(np.float64)
+    table = table.sort_values(by=["Code", "Year", "Quarter"], kind="stable").reset_index(drop=True)
+    table.to_pickle(store_path)
+    _store.clear()
+    return table
+
+
+def _report_keys(code_idx, year, quarter):
+    return (np.asarray(code_idx, dtype=np.int64) * 10000 + np.asarray(year, dtype=np.int64)) * 10 + np.asarray(quarter, dtype=np.int64)
+
+
+def _open_fs_store(store_path=None):
+    """재무제표 저장소를 읽어서 반환 (저장소가 없으면 None)"""
+
+    store_path = _fs_store_path() if store_path is None else store_path
+    if store_path in _store:
+        return _store[store_path]
+    if not os.path.exists(store_path):
+        return None
+    table = pd.read_pickle(store_path)
+    store = {
+        "table": table,
+        "keys": _report_keys(table["Code"].cat.codes.values, table["Year"].values, table["Quarter"].values),
+        "codes": table["Code"].cat.categories,
+    }
+    _store[store_path] = store
+    return store
+
+
+def _gather_fs_store(stock_code_list, report_list, account_list, consolidated, store_path=None):
+
+    """
+    재무제표 저장소에서 여러 종목, 여러 보고서의 계정 값을 한 번에 모아서 반환
+
+    Parameters:
+    ==========================
+    stock_code_list: array-like
+        종목 코드 배열
+    report_list: array-like
+        (연도, 분기)로 구성된 배열
+    account_list: array-like
+        계정명 목록
+    consolidated: bool
+        연결 재무 제표를 사용할 것인지 여부 (단, True여도 연결 재무 제표를 발표하지 않는 기업은 개별 재무 제표를 사용)
+    store_path: str, default: None
+        저장소 파일 경로 (None으로 입력시 pickle_data/fs_store.pkl)
+
+    :return : (values, dates), 저장소가 없으면 None
+        values: 크기가 (종목 수, 보고서 수, 계정 수)인 배열 (없는 값은 NaN)
+        dates: 크기가 (종목 수, 보고서 수)인 보고서 제출일 배열 (없는 보고서는 NaT)
+    """
+
+    store = _open_fs_store(store_path)
+    if store is None:
+        return None
+    table = store["table"]
+    n_codes, n_reports, n_accounts = len(stock_code_list), len(report_list), len(account_list)
+
+    # (종목, 보고서) 쌍마다 저장소에서의 행 구간을 이진 탐색으로 찾음
+    code_idx = store["codes"].get_indexer(stock_code_list)
+    report_arr = np.array(report_list, dtype=np.int64).reshape(-1, 2)
+    query_code = np.repeat(code_idx, n_reports)
+    query_keys = _report_keys(query_code, np.tile(report_arr[:, 0], n_codes), np.tile(report_arr[:, 1], n_codes))
+    starts = np.searchsorted(store["keys"], query_keys, side="left")
+    stops = np.searchsorted(store["keys"], query_keys, side="right")
+    stops[query_code < 0] = starts[query_code < 0]
+
+    lengths = stops - starts
+    offsets = np.cumsum(lengths) - lengths
+    pos = np.arange(lengths.sum(), dtype=np.int64) + np.repeat(starts - offsets, lengths)
+    query_idx = np.repeat(np.arange(len(query_keys)), lengths)
+
+    dates = np.full(len(query_keys), np.datetime64("NaT"), dtype="datetime64[ns]")
+    dates[query_idx] = table["Date"].values[pos]
+
+    # 보고서마다 연결 재무제표가 있으면 연결, 없으면 개별 재무제표를 사용
+    fs_type = table["개별/연결"].cat
+    fs_type_codes = fs_type.codes.values[pos]
+    is_consolidated = fs_type_codes == fs_type.categories.get_loc("연결재무제표")
+    is_separate = fs_type_codes == fs_type.categories.get_loc("재무제표")
+    has_consolidated = np.zeros(len(query_keys), dtype=bool)
+    if consolidated:
+        has_consolidated[query_idx[is_consolidated]] = True
+    use = np.where(has_consolidated[query_idx], is_consolidated, is_separate)
+
+    account = table["계정명"].cat
+    account_codes = account.codes.values[pos]
+    account_idx = pd.Index(account_list).get_indexer(account.categories)[account_codes]
+    use &= (account_codes >= 0) & (account_idx >= 0)
+
+    values = np.full((len(query_keys), n_accounts), np.nan)
+    values[query_idx[use], account_idx[use]] = table["금액"].values[pos][use]
+    return values.reshape(n_codes, n_reports, n_accounts), dates.reshape(n_codes, n_reports)
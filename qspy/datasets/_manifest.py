@@ -0,0 +1,281 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from ..utils._base import _package_path
+
+
+# 매니페스트는 build_manifest가 한 번에 만드는 manifest.json과, 이후 종목마다 갱신하는 manifest/{종목 코드}.json으로 구성
+# (종목별 파일이 있으면 manifest.json의 항목보다 우선하며, 둘 다 파일 수정 시각이 바뀌었을 때만 다시 읽음)
+_manifest = {"mtime": None, "entries": {}, "files": {}}
+
+
+def _manifest_path():
+    return _package_path("datasets/pickle_data/stock_price/manifest.json")
+
+
+def _entry_folder_path():
+    return _package_path("datasets/pickle_data/stock_price/manifest")
+
+
+def _entry_file_path(stock_code):
+    return _entry_folder_path() + "/{}.json".format(stock_code)
+
+
+def _checksum(file_path):
+    sha1 = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _make_entry(data, file_path):
+    """가격 데이터와 저장된 파일로부터 매니페스트 항목을 생성"""
+
+    stat = os.stat(file_path)
+    dates = pd.to_datetime(data["Date"]).dropna()
+    return {
+        "first_date": dates.min().strftime("%Y-%m-%d") if len(dates) > 0 else None,
+        "last_date": dates.max().strftime("%Y-%m-%d") if len(dates) > 0 else None,
+        "last_close": float(data["Close"].values[-1]) if len(data) > 0 else None,
+        "rows": int(len(data)),
+        "segments": 0,
+        "size": int(stat.st_size),
+        "mtime": stat.st_mtime,
+        "checksum": _checksum(file_path),
+    }
+
+
+def _load_snapshot():
+    """build_manifest가 만든 manifest.json의 항목을 반환"""
+
+    manifest_path = _manifest_path()
+    if not os.path.exists(manifest_path):
+        return _manifest["entries"]
+    mtime = os.path.getmtime(manifest_path)
+    if _manifest["mtime"] != mtime:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            _manifest["entries"] = json.load(f)
+        _manifest["mtime"] = mtime
+    return _manifest["entries"]
+
+
+def _read_entry_file(stock_code, mtime):
+    """종목별 매니페스트 파일을 읽어서 반환 (수정 시각이 같으면 이전에 읽은 항목을 사용)"""
+
+    cached = _manifest["files"].get(stock_code)
+    if (cached is None) or (cached[0] != mtime):
+        with open(_entry_file_path(stock_code), "r", encoding="utf-8") as f:
+            cached = (mtime, json.load(f))
+        _manifest["files"][stock_code] = cached
+    return cached[1]
+
+
+def _stored_entry(stock_code):
+    """종목 하나의 매니페스트 항목을 반환 (종목별 파일 -> manifest.json 순으로 찾고, 없으면 None)"""
+
+    try:
+        mtime = os.path.getmtime(_entry_file_path(stock_code))
+    except OSError:
+        return _load_snapshot().get(stock_code)
+    return _read_entry_file(stock_code, mtime)
+
+
+def _load_manifest():
+    """manifest.json과 종목별 매니페스트 파일을 합친 전체 항목을 반환"""
+
+    entries = dict(_load_snapshot())
+    folder_path = _entry_folder_path()
+    if os.path.exists(folder_path):
+        for dir_entry in os.scandir(folder_path):
+            if dir_entry.name.endswith(".json"):
+                stock_code = dir_entry.name[:-5]
+                entries[stock_code] = _read_entry_file(stock_code, dir_entry.stat().st_mtime)
+    return entries
+
+
+def _write_manifest(entries):
+    """임시 파일에 쓴 뒤 이름을 바꿔서, 쓰는 도중에 실패해도 기존 매니페스트가 깨지지 않도록 함"""
+
+    manifest_path = _manifest_path()
+    tmp_path = "{}.{}.tmp".format(manifest_path, os.getpid())
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, sort_keys=True, separators=(",", ":"))
+    os.replace(tmp_path, manifest_path)
+    _manifest["entries"] = entries
+    _manifest["mtime"] = os.path.getmtime(manifest_path)
+
+
+def _write_pickle(data, file_path):
+    """xz로 압축한 피클을 임시 파일에 쓴 뒤 이름을 바꿔서, 쓰는 도중에 실패해도 기존 파일이 깨지지 않도록 함"""
+
+    tmp_path = "{}.{}.tmp".format(file_path, os.getpid())
+    try:
+        data.to_pickle(tmp_path, compression = "xz")
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _set_manifest_entry(stock_code, entry):
+    """종목의 매니페스트 파일 하나만 임시 파일에 쓴 뒤 이름을 바꿔서 갱신 (다른 종목의 항목은 건드리지 않음)"""
+
+    os.makedirs(_entry_folder_path(), exist_ok=True)
+    entry_path = _entry_file_path(stock_code)
+    tmp_path = "{}.{}.tmp".format(entry_path, os.getpid())
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f, sort_keys=True, separators=(",", ":"))
+    os.replace(tmp_path, entry_path)
+
+
+def _update_manifest(stock_code, data, file_path):
+    """파일을 저장한 직후에 호출하여 해당 종목의 매니페스트 항목을 갱신"""
+
+    _set_manifest_entry(stock_code, _make_entry(data, file_path))
+
+
+def _manifest_entry(stock_code, file_path):
+
+    """
+    종목의 매니페스트 항목을 반환
+
+    파일이 없거나, 항목이 없거나, 파일 크기/수정 시각이 항목과 다르면 None을 반환
+
+    Parameters:
+    ==========================
+    stock_code: str
+        종목 코드
+    file_path: str
+        종목의 가격 피클 파일 경로
+
+    :return : entry, type: dict or None
+        first_date, last_date, last_close, rows, segments, size, mtime, checksum을 키로 하는 딕셔너리
+        (first_date, last_date, rows는 델타 세그먼트까지 포함하고 size, mtime, checksum은 기본 파일 기준)
+    """
+
+    entry = _stored_entry(stock_code)
+    if entry is None:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    if (stat.st_size != entry["size"]) or (stat.st_mtime != entry["mtime"]):
+        return None
+    return entry
+
+
+def _rebuild_entry(stock_code, file_path):
+    """기본 파일과 델타 세그먼트를 읽어서 종목의 매니페스트 항목을 다시 만들어 저장하고 반환 (파일이 없으면 None)"""
+
+    # _delta가 이 모듈을 import하므로 필요할 때 import함
+    from ._delta import _apply_delta
+    from ._delta import _read_delta
+
+    if not os.path.exists(file_path):
+        return None
+    data = pd.read_pickle(file_path, compression="xz")
+    delta_list = _read_delta(stock_code)
+    entry = _make_entry(_apply_delta(data, delta_list), file_path)
+    entry["segments"] = len(delta_list)
+    _set_manifest_entry(stock_code, entry)
+    return entry
+
+
+def build_manifest(folder_path=None):
+
+    """
+    종목별 가격 피클 파일을 한 번씩 읽어서 매니페스트를 새로 생성
+
+    이후 load_stock_data가 파일을 저장할 때마다 종목별 매니페스트 파일만 갱신되므로 최초 한 번만 실행하면 됨
+    (다시 실행하면 종목별 매니페스트 파일을 manifest.json 하나로 합침)
+
+    Parameters:
+    ==========================
+    folder_path: str, default: None
+        종목별 가격 피클 파일이 있는 폴더 (None으로 입력시 pickle_data/stock_price)
+
+    :return : entries, type: dict
+        종목 코드를 키로 하는 매니페스트 항목 딕셔너리
+    """
+
+    if folder_path is None:
+        folder_path = _package_path("datasets/pickle_data/stock_price")
+    entries = {}
+    for file_name in sorted(os.listdir(folder_path)):
+        if not file_name.endswith(".pkl"):
+            continue
+        file_path = folder_path + "/" + file_name
+        data = pd.read_pickle(file_path, compression="xz")
+        entries[file_name[:-4]] = _make_entry(data, file_path)
+    _write_manifest(entries)
+    entry_folder_path = _entry_folder_path()
+    if os.path.exists(entry_folder_path):
+        for file_name in os.listdir(entry_folder_path):
+            os.remove(entry_folder_path + "/" + file_name)
+    _manifest["files"] = {}
+    return entries
+
+
+def verify_manifest(stock_code_list=None):
+
+    """
+    매니페스트의 체크섬과 실제 파일을 비교하여 손상되었거나 변경된 종목 목록을 반환
+
+    Parameters:
+    ==========================
+    stock_code_list: array-like, default: None
+        확인할 종목 코드 목록 (None으로 입력시 매니페스트의 모든 종목)
+
+    :return : code_list, type: list
+        파일이 없거나 체크섬이 일치하지 않는 종목 코드 목록
+    """
+
+    entries = _load_manifest()
+    if stock_code_list is None:
+        stock_code_list = sorted(entries.keys())
+    folder_path = os.path.dirname(_manifest_path())
+    code_list = []
+    for stock_code in stock_code_list:
+        file_path = folder_path + "/{}.pkl".format(stock_code)
+        entry = entries.get(stock_code)
+        if (entry is None) or (not os.path.exists(file_path)) or (_checksum(file_path) != entry["checksum"]):
+            code_list.append(stock_code)
+    return code_list
+
+
+def stock_codes_to_refresh(end_date=None, stock_code_list=None):
+
+    """
+    매니페스트를 보고 end_date까지의 데이터가 없는 종목 목록을 반환
+
+    종목마다 파일 크기/수정 시각만 항목과 비교하며, 파일이 load_stock_data 밖에서 다시 저장되어 항목과 다르면
+    그 종목만 파일을 읽어서 항목을 다시 만듦
+
+    Parameters:
+    ==========================
+    end_date: str, default: None
+        기준 날짜: YYYY-MM-DD (None으로 입력시 오늘)
+    stock_code_list: array-like, default: None
+        확인할 종목 코드 목록 (None으로 입력시 매니페스트의 모든 종목)
+
+    :return : code_list, type: list
+        새로 수집해야 하는 종목 코드 목록 (매니페스트와 파일이 모두 없는 종목 포함)
+    """
+
+    if stock_code_list is None:
+        stock_code_list = sorted(_load_manifest().keys())
+    end_date = pd.Timestamp.today() if end_date is None else pd.to_datetime(end_date)
+    end_date = end_date.strftime("%Y-%m-%d")
+    folder_path = os.path.dirname(_manifest_path())
+    code_list = []
+    for stock_code in stock_code_list:
+        file_path = folder_path + "/{}.pkl".format(stock_code)
+        entry = _manifest_entry(stock_code, file_path)
+        if entry is None:
+            entry = _rebuild_entry(stock_code, file_path)
+        if (entry is None) or (entry["last_date"] is None) or (entry["last_date"] < end_date):
+            code_list.append(stock_code)
+    return code_list
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from ..utils._base import _stock_code_list
+from ._base import load_stock_data
+from ._base import _slice_date
+from ._price_store import PRICE_FIELDS
+from ._price_store import _gather_price_store
+
+
+def load_stock_panel(
+    stock_code_or_name_list,
+    start_date=None,
+    end_date=None,
+    fields=None,
+    download=False,
+    as_array=False,
+):
+    """
+    여러 종목의 가격 데이터를 공통 거래일 기준으로 정렬한 패널로 반환
+
+    Parameters:
+    ==========================
+    stock_code_or_name_list: array-like,
+        수집할 종목 코드 및 이름으로 구성된 배열
+    start_date: str, default: None
+        시작 날짜: YYYY-MM-DD (None으로 입력시 상장일로 설정)
+    end_date: str, default: None
+        종료 날짜: YYYY-MM-DD (None으로 입력시 최근 개장일로 설정)
+    fields: array-like, default: None
+        패널에 포함할 필드 목록 (None으로 입력시 ["Open", "High", "Low", "Close", "Volume", "Change"])
+    download: bool, default: False
+        가격 저장소에 없는 종목을 load_stock_data로 불러올 때 사용할 download 값
+    as_array: bool, default: False
+        출력 타입 결정
+        - True: (values, dates, codes) 튜플을 반환 (values의 크기는 날짜 수 x 종목 수 x 필드 수)
+        - False: 행이 날짜이고 열이 (필드, 종목 코드)인 데이터프레임을 반환
+
+    :return : panel, type: DataFrame or tuple
+        거래하지 않은 날이나 상장 전후의 값은 NaN
+    """
+
+    if fields is None:
+        fields = PRICE_FIELDS[1:]
+    fields = list(fields)
+    for field in fields:
+        if field not in PRICE_FIELDS[1:]:
+            raise ValueError("fields는 {} 중에서 선택해야 합니다: {}".format(PRICE_FIELDS[1:], field))
+
+    # stock_code_or_name_list를 stock_code_list로 변환
+    stock_code_list = _stock_code_list(stock_code_or_name_list)
+
+    # 저장소에 있는 종목은 한 번에 모으고, 나머지 종목만 하나씩 불러옴
+    columns, code_idx, missing_idx = _gather_price_store(stock_code_list, fields, start_date, end_date)
+    pieces = [] if columns is None else [(columns, code_idx)]
+    for i in missing_idx:
+        try:
+            data = load_stock_data(stock_code_list[i], start_date, end_date, download)
+        except ValueError:
+            continue
+        data = _slice_date(data, start_date, end_date)
+        piece = {field: data[field].values for field in fields}
+        piece["Date"] = pd.to_datetime(data["Date"]).values.astype("datetime64[ns]")
+        pieces.append((piece, np.full(len(data), i, dtype=np.int64)))
+
+    if len(pieces) > 0:
+        dates = np.concatenate([piece["Date"] for piece, _ in pieces])
+        code_idx = np.concatenate([idx for _, idx in pieces])
+    else:
+        dates = np.array([], dtype="datetime64[ns]")
+        code_idx = np.array([], dtype=np.int64)
+
+    # 모든 종목의 거래일 합집합을 공통 거래일로 사용
+    calendar, date_idx = np.unique(dates, return_inverse=True)
+    values = np.full((len(calendar), len(stock_code_list), len(fields)), np.nan)
+    for k, field in enumerate(fields):
+        if len(pieces) > 0:
+            values[date_idx, code_idx, k] = np.concatenate([piece[field] for piece, _ in pieces])
+
+    if as_array:
+        return values, calendar, np.array(stock_code_list)
+
+    panel = pd.DataFrame(
+        values.transpose(0, 2, 1).reshape(len(calendar), -1),
+        index=pd.DatetimeIndex(calendar, name="Date"),
+        columns=pd.MultiIndex.from_product([fields, stock_code_list]),
+    )
+    return panel
@@ -0,0 +1,134 @@
+import os
+import json
+import shutil
+import pandas as pd
+from ..utils._base import _package_path
+from ._manifest import _write_pickle
+from ._price_store import PRICE_FIELDS
+
+
+def _partition_folder_path(stock_code=None):
+    folder_path = _package_path("datasets/pickle_data/stock_price/partitions")
+    return folder_path if stock_code is None else folder_path + "/" + stock_code
+
+
+def _write_partitions(stock_code, data, file_path):
+
+    """
+    종목의 가격 데이터를 연도별 파일({연도}.pkl)로 나누어 저장
+
+    index.json에 원본 피클 파일의 크기/수정 시각과 연도별 행 수를 마지막에 기록하므로,
+    원본 파일이 바뀌었거나 저장 도중에 실패한 파티션은 사용되지 않음
+
+    Parameters:
+    ==========================
+    stock_code: str
+        종목 코드
+    data: DataFrame
+        원본 피클 파일에 저장된 가격 데이터 (델타 세그먼트 제외)
+    file_path: str
+        원본 피클 파일 경로
+    """
+
+    folder_path = _partition_folder_path(stock_code)
+    if os.path.exists(folder_path):
+        shutil.rmtree(folder_path)
+    os.makedirs(folder_path)
+
+    data = data.copy()
+    data["Date"] = pd.to_datetime(data["Date"])
+    data = data.loc[data["Date"].notnull().values].sort_values(by="Date", kind="stable")
+    years = {}
+    for year, group in data.groupby(data["Date"].dt.year.values, sort=True):
+        _write_pickle(group.reset_index(drop=True), folder_path + "/{}.pkl".format(year))
+        years[str(year)] = int(len(group))
+
+    stat = os.stat(file_path)
+    index_path = folder_path + "/index.json"
+    tmp_path = "{}.{}.tmp".format(index_path, os.getpid())
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"size": int(stat.st_size), "mtime": stat.st_mtime, "years": years}, f)
+    os.replace(tmp_path, index_path)
+
+
+def _refresh_partitions(stock_code, data, file_path):
+    """종목의 파티션이 이미 있으면 다시 저장된 원본 데이터로 다시 만듦 (파티션을 만들지 않은 종목은 그대로 둠)"""
+
+    if os.path.exists(_partition_folder_path(stock_code)):
+        _write_partitions(stock_code, data, file_path)
+
+
+def _read_partitions(stock_code, start_date, end_date, file_path):
+
+    """
+    연도 파티션 중에서 [start_date, end_date] 기간과 겹치는 연도만 읽어서 반환
+
+    Parameters:
+    ==========================
+    stock_code: str
+        종목 코드
+    start_date: str
+        시작 날짜: YYYY-MM-DD (None으로 입력시 제한 없음)
+    end_date: str
+        종료 날짜: YYYY-MM-DD (None으로 입력시 제한 없음)
+    file_path: str
+        원본 피클 파일 경로
+
+    :return : data, type: DataFrame or None
+        파티션이 없거나 원본 파일이 파티션을 만든 뒤에 바뀌었으면 None
+    """
+
+    index_path = _partition_folder_path(stock_code) + "/index.json"
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    if (stat.st_size != index["size"]) or (stat.st_mtime != index["mtime"]):
+        return None
+
+    start_year = None if start_date is None else pd.to_datetime(start_date).year
+    end_year = None if end_date is None else pd.to_datetime(end_date).year
+    year_list = [
+        year for year in sorted(int(year) for year in index["years"])
+        if ((start_year is None) or (year >= start_year)) and ((end_year is None) or (year <= end_year))
+    ]
+    data_list = [
+        pd.read_pickle(_partition_folder_path(stock_code) + "/{}.pkl".format(year), compression = "xz")
+        for year in year_list
+    ]
+    if len(data_list) == 0:
+        return pd.DataFrame(columns=PRICE_FIELDS)
+    return pd.concat(data_list, axis=0, ignore_index=True)
+
+
+def build_price_partitions(stock_code_list=None):
+
+    """
+    종목별 가격 피클 파일을 연도별 파티션으로 나누어 저장
+
+    파티션을 만든 종목은 기간을 지정한 load_stock_data 계열 함수 호출에서 기간과 겹치는 연도 파일만 읽으며,
+    이후 기본 파일을 다시 저장할 때(병합, compact_stock_data) 파티션도 함께 다시 만들어짐
+
+    Parameters:
+    ==========================
+    stock_code_list: array-like, default: None
+        파티션을 만들 종목 코드 목록 (None으로 입력시 pickle_data/stock_price의 모든 종목)
+
+    :return : code_list, type: list
+        파티션을 만든 종목 코드 목록
+    """
+
+    folder_path = _package_path("datasets/pickle_data/stock_price")
+    if stock_code_list is None:
+        stock_code_list = sorted(file_name[:-4] for file_name in os.listdir(folder_path) if file_name.endswith(".pkl"))
+
+    code_list = []
+    for stock_code in stock_code_list:
+        file_path = folder_path + "/{}.pkl".format(stock_code)
+        if not os.path.exists(file_path):
+            continue
+        _write_partitions(stock_code, pd.read_pickle(file_path, compression = "xz"), file_path)
+        code_list.append(stock_code)
+    return code_list
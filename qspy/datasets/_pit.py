@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from ._panel import load_stock_panel
+from ._fs_panel import _fs_cube
+
+
+def load_pit_panel(
+    stock_code_or_name_list,
+    account_list,
+    start_date=None,
+    end_date=None,
+    fields=None,
+    consolidated=True,
+    period="1Y",
+    download=False,
+    as_array=False,
+):
+    """
+    거래일마다 그날 알 수 있었던 가장 최근 재무 지표를 가격 데이터에 붙여서 반환 (point-in-time)
+
+    재무 지표는 계산에 필요한 보고서가 모두 제출된 날의 다음 거래일부터 사용할 수 있는 것으로 보므로,
+    보고서 제출일 당일의 가격에 미래 정보가 섞이지 않음
+
+    Parameters:
+    ==========================
+    stock_code_or_name_list: array-like,
+        수집할 종목 코드 및 이름으로 구성된 배열
+    account_list: array-like,
+        붙일 계정명으로 구성된 배열: ["유동자산", "비유동자산", "자산총계", "유동부채", "비유동부채", "부채총계",
+                         "자본금", "이익잉여금", "자본총계", "매출액", "영업이익", "법인세차감전 순이익", "당기순이익"]
+    start_date: str, default: None
+        시작 날짜: YYYY-MM-DD (None으로 입력시 상장일로 설정)
+    end_date: str, default: None
+        종료 날짜: YYYY-MM-DD (None으로 입력시 최근 개장일로 설정)
+    fields: array-like, default: None
+        함께 반환할 가격 필드 목록 (None으로 입력시 ["Close"])
+    consolidated: bool, default: True
+        연결 재무 제표를 사용할 것인지 여부 (단, True여도 연결 재무 제표를 발표하지 않는 기업은 개별 재무 제표를 사용)
+    period: str, default: "1Y"
+        누적 기간 ("1Y", "6M", "3M")
+    download: bool, default: False
+        가격 저장소에 없는 종목을 load_stock_data로 불러올 때 사용할 download 값
+    as_array: bool, default: False
+        출력 타입 결정
+        - True: (values, dates, codes, columns) 튜플을 반환 (values의 크기는 날짜 수 x 종목 수 x (필드 수 + 계정 수))
+        - False: 행이 날짜이고 열이 (필드 혹은 계정명, 종목 코드)인 데이터프레임을 반환
+
+    :return : panel, type: DataFrame or tuple
+        제출된 보고서가 아직 없는 날의 재무 지표는 NaN
+    """
+
+    fields = ["Close"] if fields is None else list(fields)
+    account_list = list(account_list)
+    price, calendar, stock_code_list = load_stock_panel(
+        stock_code_or_name_list, start_date, end_date, fields, download, as_array=True
+    )
+    n_dates, n_codes = len(calendar), len(stock_code_list)
+    values = np.full((n_dates, n_codes, len(fields) + len(account_list)), np.nan)
+    values[:, :, :len(fields)] = price
+    if n_dates > 0:
+        # 기간 시작 전에 제출된 보고서도 필요하므로 2년 앞선 보고서부터 모음
+        first_year = pd.Timestamp(calendar[0]).year - 2
+        last_year = pd.Timestamp(calendar[-1]).year
+        periods = [(_year, _quarter) for _year in range(first_year, last_year + 1) for _quarter in [1, 2, 3, 4]]
+        cube, _, avail_dates = _fs_cube(list(stock_code_list), account_list, periods, consolidated, [period])
+
+        # 보고서를 (종목, 사용 가능일) 순으로 정렬하여 번호를 매기면, 종목 안에서 번호가 클수록 최근 보고서
+        code_idx, report_idx = np.nonzero(~np.isnat(avail_dates))
+        event_dates = avail_dates[code_idx, report_idx]
+        order = np.lexsort((report_idx, event_dates, code_idx))
+        code_idx, report_idx, event_dates = code_idx[order], report_idx[order], event_dates[order]
+
+        # 사용 가능일 다음 거래일의 위치에 보고서 번호를 기록하고, 시간축으로 누적 최댓값을 취해 앞 값으로 채움
+        # (기간 시작 전에 사용 가능해진 보고서는 첫 거래일에 기록됨)
+        date_idx = np.searchsorted(calendar, event_dates, side="right")
+        in_range = date_idx < n_dates
+        last_event = np.full((n_dates, n_codes), -1, dtype=np.int64)
+        event_id = np.arange(len(order))
+        np.maximum.at(last_event, (date_idx[in_range], code_idx[in_range]), event_id[in_range])
+        last_event = np.maximum.accumulate(last_event, axis=0)
+
+        has_event = last_event >= 0
+        event_values = cube[code_idx, report_idx]
+        values[:, :, len(fields):][has_event] = event_values[last_event[has_event]]
+
+    columns = fields + account_list
+    if as_array:
+        return values, calendar, stock_code_list, columns
+
+    panel = pd.DataFrame(
+        values.transpose(0, 2, 1).reshape(n_dates, -1),
+        index=pd.DatetimeIndex(calendar, name="Date"),
+        columns=pd.MultiIndex.from_product([columns, list(stock_code_list)]),
+    )
+    return panel
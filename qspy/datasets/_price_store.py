@@ -0,0 +1,197 @@
+import os
+import numpy as np
+import pandas as pd
+from ..utils._base import _package_path
+from ._manifest import _load_manifest
+
+
+PRICE_FIELDS = ["Date", "Open", "High", "Low", "Close", "Volume", "Change"]
+INDEX_DTYPE = [("code", "U6"), ("start", "i8"), ("stop", "i8"), ("mtime", "f8")]
+
+# 프로세스마다 한 번만 여는 가격 저장소 (memmap)
+_store = {}
+
+
+def _price_folder_path():
+    return _package_path("datasets/pickle_data/stock_price")
+
+
+def _price_store_path():
+    return _package_path("datasets/pickle_data/price_store")
+
+
+def build_price_store(folder_path=None, store_path=None):
+
+    """
+    종목별 가격 피클 파일을 하나의 컬럼형 저장소로 변환 (최초 한 번만 실행)
+
+    필드마다 모든 종목의 값을 이어 붙인 배열 하나({필드}.npy)를 저장하고,
+    종목별 시작/끝 위치를 index.npy에 저장함. 저장된 배열은 memmap으로 열리므로
+    load_stock_data는 압축 해제 없이 필요한 구간만 읽음
+
+    Parameters:
+    ==========================
+    folder_path: str, default: None
+        종목별 가격 피클 파일이 있는 폴더 (None으로 입력시 pickle_data/stock_price)
+    store_path: str, default: None
+        저장소를 만들 폴더 (None으로 입력시 pickle_data/price_store)
+
+    :return : index, type: ndarray
+        종목 코드, 시작 위치, 끝 위치, 원본 파일 수정 시각으로 구성된 구조체 배열
+    """
+
+    folder_path = _price_folder_path() if folder_path is None else folder_path
+    store_path = _price_store_path() if store_path is None else store_path
+    os.makedirs(store_path, exist_ok=True)
+
+    columns = {field: [] for field in PRICE_FIELDS}
+    index = []
+    start = 0
+    for file_name in sorted(os.listdir(folder_path)):
+        if not file_name.endswith(".pkl"):
+            continue
+        file_path = folder_path + "/" + file_name
+        data = pd.read_pickle(file_path, compression="xz")
+        data = data.loc[pd.to_datetime(data["Date"]).notnull().values]
+        data = data.sort_values(by="Date", kind="stable")
+        if len(data) == 0:
+            continue
+        columns["Date"].append(pd.to_datetime(data["Date"]).values.astype("datetime64[ns]"))
+        for field in PRICE_FIELDS[1:]:
+            columns[field].append(pd.to_numeric(data[field]).values)
+        index.append((file_name[:-4], start, start + len(data), os.path.getmtime(file_path)))
+        start += len(data)
+
+    # 종목 구간 안에서 날짜가 정렬되어 있으므로 기간 조회는 이진 탐색으로 처리
+    # index.npy를 마지막에 저장하여, 중간에 실패한 저장소는 사용되지 않도록 함
+    for field in PRICE_FIELDS:
+        np.save(store_path + "/{}.npy".format(field), np.concatenate(columns.pop(field)))
+    index = np.array(index, dtype=INDEX_DTYPE)
+    np.save(store_path + "/index.npy", index)
+    _store.clear()
+    return index
+
+
+def _open_price_store(store_path=None):
+    """가격 저장소를 memmap으로 열어서 반환 (저장소가 없으면 None)"""
+
+    store_path = _price_store_path() if store_path is None else store_path
+    if store_path in _store:
+        return _store[store_path]
+    if not os.path.exists(store_path + "/index.npy"):
+        return None
+    index = np.load(store_path + "/index.npy")
+    store = {
+        "index": {
+            code: (start, stop, mtime) for code, start, stop, mtime in index.tolist()
+        },
+        "columns": {
+            field: np.load(store_path + "/{}.npy".format(field), mmap_mode="r")
+            for field in PRICE_FIELDS
+        },
+    }
+    _store[store_path] = store
+    return store
+
+
+def _read_price_store(stock_code, file_path=None, store_path=None):
+
+    """
+    가격 저장소에서 한 종목의 데이터를 잘라서 반환
+
+    memmap에서 종목의 구간만 메모리로 복사해서 반환 (압축 해제 없음)
+    memmap은 읽기 전용이므로 복사해서 반환된 데이터를 pandas 버전과 상관없이 수정할 수 있도록 함
+
+    Parameters:
+    ==========================
+    stock_code: str
+        종목 코드
+    file_path: str, default: None
+        종목의 가격 피클 파일 경로로, 저장소를 만든 뒤에 파일이 갱신되었으면 None을 반환
+    store_path: str, default: None
+        저장소 폴더 (None으로 입력시 pickle_data/price_store)
+
+    :return : data, type: DataFrame or None
+        저장소에 종목이 없으면 None
+    """
+
+    store = _open_price_store(store_path)
+    if (store is None) or (stock_code not in store["index"]):
+        return None
+    start, stop, mtime = store["index"][stock_code]
+    if (file_path is not None) and os.path.exists(file_path):
+        if os.path.getmtime(file_path) > mtime:
+            return None
+    columns = store["columns"]
+    return pd.DataFrame(
+        {field: np.array(columns[field][start:stop]) for field in PRICE_FIELDS}, copy=False
+    )
+
+
+def _is_stale(stock_code, mtime, folder_path):
+    """저장소를 만든 뒤에 종목의 피클 파일이 갱신되었는지 여부"""
+
+    file_path = folder_path + "/{}.pkl".format(stock_code)
+    return os.path.exists(file_path) and (os.path.getmtime(file_path) > mtime)
+
+
+def _gather_price_store(stock_code_list, fields, start_date=None, end_date=None, store_path=None):
+
+    """
+    가격 저장소에서 여러 종목의 [start_date, end_date] 구간을 한 번에 모아서 반환
+
+    Parameters:
+    ==========================
+    stock_code_list: array-like
+        종목 코드 배열
+    fields: array-like
+        모을 필드 목록 ("Open", "High", "Low", "Close", "Volume", "Change")
+    start_date: str, default: None
+        시작 날짜: YYYY-MM-DD (None으로 입력시 제한 없음)
+    end_date: str, default: None
+        종료 날짜: YYYY-MM-DD (None으로 입력시 제한 없음)
+    store_path: str, default: None
+        저장소 폴더 (None으로 입력시 pickle_data/price_store)
+
+    :return : (columns, code_idx, missing_idx)
+        columns: "Date"와 fields를 키로 하는 배열 딕셔너리
+        code_idx: 각 행이 stock_code_list의 몇 번째 종목인지 나타내는 배열
+        missing_idx: 저장소에 없거나, 저장소보다 피클 파일이 최신이거나, 델타 세그먼트가 있는 종목의 위치 목록
+    """
+
+    store = _open_price_store(store_path)
+    if store is None:
+        return None, None, list(range(len(stock_code_list)))
+
+    folder_path = _price_folder_path()
+    manifest = _load_manifest()
+    dates = store["columns"]["Date"]
+    start_date = None if start_date is None else np.datetime64(pd.to_datetime(start_date), "ns")
+    end_date = None if end_date is None else np.datetime64(pd.to_datetime(end_date), "ns")
+
+    found_idx, starts, stops, missing_idx = [], [], [], []
+    for i, stock_code in enumerate(stock_code_list):
+        entry = store["index"].get(stock_code)
+        if (
+            (entry is None)
+            or _is_stale(stock_code, entry[2], folder_path)
+            or (manifest.get(stock_code, {}).get("segments", 0) > 0)
+        ):
+            missing_idx.append(i)
+            continue
+        start, stop = entry[0], entry[1]
+        if start_date is not None:
+            start += np.searchsorted(dates[start:stop], start_date, side="left")
+        if end_date is not None:
+            stop = entry[0] + np.searchsorted(dates[entry[0]:stop], end_date, side="right")
+        found_idx.append(i)
+        starts.append(start)
+        stops.append(max(start, stop))
+
+    starts = np.array(starts, dtype=np.int64)
+    lengths = np.array(stops, dtype=np.int64) - starts
+    offsets = np.cumsum(lengths) - lengths
+    pos = np.arange(lengths.sum(), dtype=np.int64) + np.repeat(starts - offsets, lengths)
+    columns = {field: store["columns"][field][pos] for field in ["Date"] + list(fields)}
+    code_idx = np.repeat(np.array(found_idx, dtype=np.int64), lengths)
+    return columns, code_idx, missing_idx
@@ -0,0 +1,227 @@
+import time
+import random
+import asyncio
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from ..utils._base import _stock_code_list
+from ._manifest import _manifest_entry
+from ._manifest import stock_codes_to_refresh
+from ._source import get_data_source
+from ._base import _price_file_path
+from ._base import _local_date_range
+from ._base import _store_fetched
+
+
+REPORT_COLUMNS = ["status", "attempts", "rows", "seconds", "error"]
+
+
+class _TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷 (요청마다 토큰 하나를 사용)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _fetch_in_thread(loop, source, stock_code, start_date, end_date):
+
+    """
+    요청 하나를 새 데몬 스레드에서 실행하고 결과를 받을 future를 반환
+
+    FinanceDataReader 요청은 제한 시간 없이 멈출 수 있고 실행 중인 스레드는 멈출 수 없으므로,
+    스레드 풀 대신 요청마다 스레드를 만들어서 제한 시간이 지나 버려진 스레드가 다른 요청의 자리를 차지하거나
+    refresh_universe의 종료를 막지 않도록 함
+    """
+
+    future = loop.create_future()
+
+    def deliver(callback, value):
+        if not future.done():
+            callback(value)
+
+    def run():
+        try:
+            result = source.fetch_prices([stock_code], start_date, end_date)
+        except Exception as e:
+            callback, value = future.set_exception, e
+        else:
+            callback, value = future.set_result, result
+        try:
+            loop.call_soon_threadsafe(deliver, callback, value)
+        except RuntimeError:
+            # 제한 시간이 지난 뒤 이벤트 루프가 이미 닫혔으면 결과를 버림
+            pass
+
+    threading.Thread(target=run, name="qspy-refresh-{}".format(stock_code), daemon=True).start()
+    return future
+
+
+def _persist(stock_code, data):
+    """가져온 데이터를 로컬 데이터에 반영하고 새로 추가된 행의 수를 반환"""
+
+    file_path = _price_file_path(stock_code)
+    first_date, _, local_data = _local_date_range(stock_code, file_path)
+    entry = _manifest_entry(stock_code, file_path)
+    rows_before = 0 if entry is None else entry["rows"]
+    _store_fetched(stock_code, data, file_path, first_date, local_data)
+    entry = _manifest_entry(stock_code, file_path)
+    return max(0, (0 if entry is None else entry["rows"]) - rows_before)
+
+
+async def _refresh_code(stock_code, start_date, end_date, source, bucket, slots, write_pool, options):
+    """한 종목을 재시도 예산 안에서 가져와서 저장하고, 보고서의 한 행을 반환 (예외를 밖으로 던지지 않음)"""
+
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    if start_date is None:
+        # 로컬 데이터가 있으면 마지막 날짜부터만 가져와서 델타 세그먼트로 추가
+        entry = _manifest_entry(stock_code, _price_file_path(stock_code))
+        start_date = None if entry is None else entry["last_date"]
+
+    attempts = 0
+    while True:
+        attempts += 1
+        await bucket.acquire()
+        try:
+            # 제한 시간이 지나면 스레드를 기다리지 않고 자리를 돌려줌 (버려진 스레드는 동시 요청 수에 포함하지 않음)
+            async with slots:
+                fetched = await asyncio.wait_for(
+                    _fetch_in_thread(loop, source, stock_code, start_date, end_date), options["timeout"],
+                )
+            data = fetched.get(stock_code, ValueError("관련 데이터가 없습니다"))
+            if isinstance(data, Exception):
+                raise data
+            if len(data) == 0:
+                raise ValueError("관련 데이터가 없습니다")
+            break
+        except ValueError as e:
+            # 데이터가 없는 종목은 다시 요청해도 같으므로 재시도하지 않음
+            return [stock_code, "failed", attempts, 0, time.monotonic() - started, "{}: {}".format(type(e).__name__, e)]
+        except Exception as e:
+            if attempts > options["max_retries"]:
+                return [stock_code, "failed", attempts, 0, time.monotonic() - started, "{}: {}".format(type(e).__name__, e)]
+            delay = min(options["max_backoff"], options["backoff"] * 2 ** (attempts - 1))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    # 매니페스트를 고치는 저장 작업은 스레드 하나에서 순서대로 처리
+    try:
+        rows = await loop.run_in_executor(write_pool, _persist, stock_code, data)
+    except Exception as e:
+        return [stock_code, "failed", attempts, 0, time.monotonic() - started, "{}: {}".format(type(e).__name__, e)]
+    status = "updated" if rows > 0 else "unchanged"
+    return [stock_code, status, attempts, rows, time.monotonic() - started, None]
+
+
+async def _refresh_all(stock_code_list, start_date, end_date, source, options):
+    bucket = _TokenBucket(options["rate"], options["burst"])
+    slots = asyncio.Semaphore(options["max_concurrency"])
+    with ThreadPoolExecutor(max_workers=1) as write_pool:
+        return await asyncio.gather(*[
+            _refresh_code(stock_code, start_date, end_date, source, bucket, slots, write_pool, options)
+            for stock_code in stock_code_list
+        ])
+
+
+def refresh_universe(
+    stock_code_or_name_list=None,
+    start_date=None,
+    end_date=None,
+    max_concurrency=8,
+    rate=5.0,
+    burst=None,
+    max_retries=3,
+    backoff=1.0,
+    max_backoff=60.0,
+    timeout=60.0,
+):
+
+    """
+    여러 종목의 주가 데이터를 asyncio로 동시에 갱신하고 결과 보고서를 반환
+
+    요청은 토큰 버킷으로 초당 rate개까지만 보내고, 연결 오류가 나면 종목마다 지수적으로 늘어나는 시간만큼 기다렸다가
+    max_retries번까지 다시 요청함 (다른 종목은 기다리지 않음)
+    파일은 임시 파일에 쓴 뒤 이름을 바꾸므로 중간에 실패해도 기존 파일이 깨지지 않음
+
+    Parameters:
+    ==========================
+    stock_code_or_name_list: array-like, default: None
+        갱신할 종목 코드 및 이름으로 구성된 배열 (None으로 입력시 stock_codes_to_refresh(end_date)의 종목)
+    start_date: str, default: None
+        수집 시작 날짜: YYYY-MM-DD (None으로 입력시 종목마다 로컬 데이터의 마지막 날짜, 로컬 데이터가 없으면 상장일)
+    end_date: str, default: None
+        수집 종료 날짜: YYYY-MM-DD (None으로 입력시 최근 개장일로 설정)
+    max_concurrency: int, default: 8
+        동시에 보내는 최대 요청 수
+    rate: float, default: 5.0
+        초당 최대 요청 수
+    burst: int, default: None
+        한 번에 몰아서 보낼 수 있는 최대 요청 수 (None으로 입력시 max_concurrency)
+    max_retries: int, default: 3
+        종목마다 연결 오류가 났을 때 다시 요청하는 최대 횟수 (데이터가 없다는 ValueError는 재시도하지 않음)
+    backoff: float, default: 1.0
+        첫 재시도 전에 기다리는 시간(초), 재시도할 때마다 두 배로 늘어남
+    max_backoff: float, default: 60.0
+        재시도 전에 기다리는 최대 시간(초)
+    timeout: float, default: 60.0
+        요청 하나를 기다리는 최대 시간(초) (None으로 입력시 제한 없음)
+        제한 시간이 지난 요청은 재시도하며, 멈춘 요청의 스레드는 기다리지 않고 버림 (데몬 스레드이므로 종료를 막지 않음)
+
+    :return : (summary, report)
+        summary: total, updated, unchanged, failed, retries, rows, seconds를 키로 하는 딕셔너리
+        report: 행이 종목 코드이고 열이 status("updated", "unchanged", "failed"), attempts, rows, seconds, error인 데이터프레임
+    """
+
+    if (max_concurrency < 1) or (rate <= 0) or (max_retries < 0):
+        raise ValueError("max_concurrency는 1 이상, rate는 0보다 크고, max_retries는 0 이상이어야 합니다.")
+    if stock_code_or_name_list is None:
+        stock_code_list = stock_codes_to_refresh(end_date)
+    else:
+        stock_code_list = list(dict.fromkeys(_stock_code_list(stock_code_or_name_list)))
+    options = {
+        "max_concurrency": max_concurrency,
+        "rate": rate,
+        "burst": max_concurrency if burst is None else max(1, burst),
+        "max_retries": max_retries,
+        "backoff": backoff,
+        "max_backoff": max_backoff,
+        "timeout": timeout,
+    }
+
+    started = time.monotonic()
+    coroutine = _refresh_all(stock_code_list, start_date, end_date, get_data_source(), options)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        rows = asyncio.run(coroutine)
+    else:
+        # 이미 이벤트 루프가 돌고 있으면 (예: 주피터) 별도 스레드에서 실행
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            rows = executor.submit(asyncio.run, coroutine).result()
+
+    report = pd.DataFrame([row[1:] for row in rows], index=[row[0] for row in rows], columns=REPORT_COLUMNS)
+    status = report["status"].values
+    summary = {
+        "total": len(report),
+        "updated": int((status == "updated").sum()),
+        "unchanged": int((status == "unchanged").sum()),
+        "failed": int((status == "failed").sum()),
+        "retries": int((report["attempts"] - 1).sum()),
+        "rows": int(report["rows"].sum()),
+        "seconds": time.monotonic() - started,
+    }
+    return summary, report
@@ -0,0 +1,197 @@
+import os
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from ..utils._base import _package_path
+
+
+# load_stock_list, load_stock_data 계열 함수가 원격 데이터를 가져올 데이터 소스 (set_data_source로 교체)
+_source = {}
+
+
+def _fdr():
+    """FinanceDataReader는 import가 느리므로 원격에서 수집할 때 처음 import함"""
+
+    import FinanceDataReader as fdr
+    return fdr
+
+
+class FdrSource:
+
+    """
+    FinanceDataReader로 종목 목록과 주가 데이터를 가져오는 기본 데이터 소스
+
+    여러 종목을 요청하면 프로세스 내에서 재사용하는 스레드 풀로 batch_size개씩 나누어 동시에 가져옴
+    (FinanceDataReader 요청은 대부분 네트워크를 기다리는 시간이므로 스레드로 충분함)
+
+    데이터 소스는 fetch_listing(market), fetch_prices(stock_code_list, start_date, end_date) 두 메소드만 있으면 되므로
+    같은 메소드를 가진 객체라면 무엇이든 set_data_source로 사용할 수 있음
+
+    Parameters:
+    ==========================
+    max_workers: int, default: 4
+        동시에 요청하는 최대 스레드 수
+    batch_size: int, default: 32
+        한 번에 스레드 풀에 넘기는 종목 수
+    """
+
+    def __init__(self, max_workers=4, batch_size=32):
+        if (max_workers < 1) or (batch_size < 1):
+            raise ValueError("max_workers와 batch_size는 1 이상이어야 합니다.")
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self):
+        """스레드 풀을 정리 (다시 요청하면 새로 만듦)"""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def fetch_listing(self, market):
+
+        """
+        시장의 종목 목록을 반환
+
+        Parameters:
+        ==========================
+        market: str
+            시장 ("KOSPI", "KOSDAQ")
+
+        :return : stock_list, type: DataFrame
+        """
+
+        return _fdr().StockListing(market)
+
+    def _fetch_one(self, stock_code, start_date, end_date):
+        try:
+            return _fdr().DataReader(stock_code, start=start_date, end=end_date).reset_index()
+        except Exception as e:
+            return e
+
+    def fetch_prices(self, stock_code_list, start_date=None, end_date=None):
+
+        """
+        여러 종목의 주가 데이터를 가져옴
+
+        Parameters:
+        ==========================
+        stock_code_list: array-like
+            종목 코드 목록
+        start_date: str, default: None
+            수집 시작 날짜: YYYY-MM-DD (None으로 입력시 상장일로 설정)
+        end_date: str, default: None
+            수집 종료 날짜: YYYY-MM-DD (None으로 입력시 최근 개장일로 설정)
+
+        :return : result, type: dict
+            종목 코드를 키로 하고, Date 컬럼이 있는 데이터프레임 혹은 가져오다 발생한 예외를 값으로 하는 딕셔너리
+        """
+
+        stock_code_list = list(stock_code_list)
+        if len(stock_code_list) == 1:
+            return {stock_code_list[0]: self._fetch_one(stock_code_list[0], start_date, end_date)}
+        result = {}
+        for start in range(0, len(stock_code_list), self.batch_size):
+            batch = stock_code_list[start: start + self.batch_size]
+            futures = [self._pool().submit(self._fetch_one, code, start_date, end_date) for code in batch]
+            result.update(zip(batch, [future.result() for future in futures]))
+        return result
+
+
+class LocalSource:
+
+    """
+    폴더에 기록해 둔 응답을 돌려주는 데이터 소스 (네트워크 없이 수집 -> 병합 -> 저장 과정을 재현하거나 부하 테스트할 때 사용)
+
+    - 주가 데이터: {folder_path}/{종목 코드}.pkl (xz로 압축한 데이터프레임, load_stock_data가 저장하는 파일과 같은 형식)
+    - 종목 목록: {folder_path}/listing_{market}.pkl (없으면 폴더에 있는 종목 코드와 종목 마스터의 이름으로 만듦)
+
+    Parameters:
+    ==========================
+    folder_path: str, default: None
+        응답이 기록된 폴더 경로 (None으로 입력시 패키지의 주가 데이터 폴더)
+    latency: float, default: 0
+        요청마다 기다리는 시간(초)으로, 원격 응답 시간을 흉내낼 때 사용
+    """
+
+    def __init__(self, folder_path=None, latency=0):
+        if folder_path is None:
+            folder_path = _package_path("datasets/pickle_data/stock_price")
+        if not os.path.isdir(folder_path):
+            raise ValueError("폴더가 없습니다: {}".format(folder_path))
+        self.folder_path = folder_path.replace("\\", "/")
+        self.latency = latency
+
+    def fetch_listing(self, market):
+        time.sleep(self.latency)
+        file_path = self.folder_path + "/listing_{}.pkl".format(market)
+        if os.path.exists(file_path):
+            return pd.read_pickle(file_path, compression = "xz")
+
+        from ..utils import code_to_name
+        from ..utils import code_list
+        known_codes = set(code_list())
+        codes = sorted(
+            file_name[:-4] for file_name in os.listdir(self.folder_path)
+            if file_name.endswith(".pkl") and file_name[:-4] in known_codes
+        )
+        return pd.DataFrame({"Code": codes, "Name": [code_to_name(code) for code in codes]})
+
+    def fetch_prices(self, stock_code_list, start_date=None, end_date=None):
+        result = {}
+        for stock_code in stock_code_list:
+            time.sleep(self.latency)
+            file_path = self.folder_path + "/{}.pkl".format(stock_code)
+            if not os.path.exists(file_path):
+                result[stock_code] = ValueError("기록된 응답이 없습니다: {}".format(stock_code))
+                continue
+            data = pd.read_pickle(file_path, compression = "xz")
+            data["Date"] = pd.to_datetime(data["Date"])
+            cond = pd.Series(True, index=data.index)
+            if start_date is not None:
+                cond &= data["Date"] >= pd.to_datetime(start_date)
+            if end_date is not None:
+                cond &= data["Date"] <= pd.to_datetime(end_date)
+            result[stock_code] = data.loc[cond].reset_index(drop=True)
+        return result
+
+
+def set_data_source(source=None):
+
+    """
+    load_stock_list, load_stock_data, load_stock_data_list가 원격 데이터를 가져올 데이터 소스를 설정
+
+    Parameters:
+    ==========================
+    source: object, default: None
+        fetch_listing(market), fetch_prices(stock_code_list, start_date, end_date) 메소드를 가진 객체
+        (None으로 입력시 기본값인 FdrSource()로 되돌림)
+
+    예시:
+    ==========================
+    >>> set_data_source(LocalSource("./recorded", latency=0.05))
+    """
+
+    if source is not None:
+        for method in ["fetch_listing", "fetch_prices"]:
+            if not callable(getattr(source, method, None)):
+                raise ValueError("데이터 소스에 {} 메소드가 없습니다.".format(method))
+    previous = _source.pop("source", None)
+    if (previous is not None) and (previous is not source) and hasattr(previous, "close"):
+        previous.close()
+    if source is not None:
+        _source["source"] = source
+
+
+def get_data_source():
+    """현재 사용하는 데이터 소스를 반환 (설정하지 않았으면 FdrSource()를 만들어서 사용)"""
+
+    if "source" not in _source:
+        _source["source"] = FdrSource()
+    return _source["source"]
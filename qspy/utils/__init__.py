@@ -2,10 +2,14 @@ from ._base import code_to_name
 from ._base import name_to_code
 from ._base import name_list
 from ._base import code_list
+from ._base import resolve
+from ._base import search
 
 __all__ = [
     "code_to_name",
     "name_to_code",
     "name_list",
-    "code_list"
+    "code_list",
+    "resolve",
+    "search"
 ]
\ No newline at end of file
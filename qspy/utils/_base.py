@@ -1,26 +1,133 @@
+import os
 import pickle
-from pkg_resources import resource_filename
+import numpy as np
+import pandas as pd
 
 
 ## 관리하는 종목 목록 관련 함수
-# load Name_to_Code.pckl to name_to_code_dict
-filepath = resource_filename(__name__, "Name_to_Code.pckl")
-with open(filepath, "rb") as f:
-    name_to_code_dict = pickle.load(f)
+# Name_to_Code.pckl, Code_to_Name.pckl은 처음 사용할 때 한 번만 읽음
+_symbols = {}
+
+
+def _symbol_master():
+
+    """
+    종목 마스터를 읽어서 반환 (프로세스마다 한 번만 읽음)
+
+    :return : symbols, type: dict
+        name_to_code, code_to_name 딕셔너리와, 해시 조회용 names(pd.Index), 접두어 검색용 정렬 배열을 담은 딕셔너리
+    """
+
+    if len(_symbols) > 0:
+        return _symbols
+
+    # load Name_to_Code.pckl to name_to_code_dict
+    filepath = _package_path("utils/Name_to_Code.pckl")
+    with open(filepath, "rb") as f:
+        name_to_code_dict = pickle.load(f)
+
+    # load Code_to_Name.pckl to code_to_name_dict
+    filepath = _package_path("utils/Code_to_Name.pckl")
+    with open(filepath, "rb") as f:
+        code_to_name_dict = pickle.load(f)
+
+    names = pd.Index([name for name in code_to_name_dict.values() if name in name_to_code_dict])
+    sorted_names = np.array(sorted(code_to_name_dict.values()), dtype=object)
+    sorted_codes = np.array(sorted(code_to_name_dict.keys()), dtype=object)
+    _symbols.update({
+        "name_to_code": name_to_code_dict,
+        "code_to_name": code_to_name_dict,
+        "names": names,
+        "name_codes": np.array([name_to_code_dict[name] for name in names], dtype=object),
+        "sorted_names": sorted_names,
+        "sorted_codes": sorted_codes,
+    })
+    return _symbols
 
-# load Code_to_Name.pckl to code_to_name_dict
-filepath = resource_filename(__name__, "Code_to_Name.pckl")
-with open(filepath, "rb") as f:
-    code_to_name_dict = pickle.load(f)
 
 def name_list():
-    return list(code_to_name_dict.values())
+    return list(_symbol_master()["code_to_name"].values())
 
 def code_list():
-    return list(code_to_name_dict.keys())
+    return list(_symbol_master()["code_to_name"].keys())
 
 def code_to_name(code):
-    return code_to_name_dict[code]
+    return _symbol_master()["code_to_name"][code]
 
 def name_to_code(name):
-    return name_to_code_dict[name]
\ No newline at end of file
+    return _symbol_master()["name_to_code"][name]
+
+
+def resolve(stock_code_or_name_list):
+
+    """
+    종목 코드 혹은 이름으로 구성된 배열을 한 번에 종목 코드로 변환
+
+    종목 이름은 해시 조회로 코드로 바꾸고, 이름이 아니면 6자리 숫자인지만 확인하여 그대로 사용함
+
+    Parameters:
+    ==========================
+    stock_code_or_name_list: array-like
+        종목 코드 및 이름으로 구성된 배열
+
+    :return : (code_arr, unresolved)
+        code_arr: 종목 코드 배열 (변환하지 못한 위치는 None)
+        unresolved: 종목 이름도 아니고 6자리 숫자 코드도 아닌 위치가 True인 부울 배열
+    """
+
+    symbols = _symbol_master()
+    values = pd.Series(list(stock_code_or_name_list), dtype=object)
+    name_idx = symbols["names"].get_indexer(values)
+    is_name = name_idx >= 0
+
+    text = values.where(values.map(type) == str)
+    is_code = (text.str.len() == 6).fillna(False).values & text.str.isdigit().fillna(False).values.astype(bool)
+    is_code &= ~is_name
+
+    code_arr = np.full(len(values), None, dtype=object)
+    code_arr[is_name] = symbols["name_codes"][name_idx[is_name]]
+    code_arr[is_code] = values.values[is_code]
+    return code_arr, ~(is_name | is_code)
+
+
+def search(prefix, by="name"):
+
+    """
+    접두어로 시작하는 종목 이름 혹은 코드 목록을 반환
+
+    Parameters:
+    ==========================
+    prefix: str
+        찾을 접두어
+    by: str, default: "name"
+        검색 대상 ("name": 종목 이름, "code": 종목 코드)
+
+    :return : result, type: list
+        접두어로 시작하는 종목 이름 혹은 코드 목록 (오름차순)
+    """
+
+    if by not in ["name", "code"]:
+        raise ValueError('by는 "name", "code" 중 하나이어야 합니다')
+    sorted_arr = _symbol_master()["sorted_names" if by == "name" else "sorted_codes"]
+    # 정렬된 배열에서 접두어로 시작하는 값은 [prefix, prefix + 가장 큰 문자) 구간에 모여 있음
+    start = np.searchsorted(sorted_arr, prefix, side="left")
+    stop = np.searchsorted(sorted_arr, prefix + chr(0x10FFFF), side="left")
+    return sorted_arr[start:stop].tolist()
+
+
+def _stock_code_list(stock_code_or_name_list):
+    """종목 코드 혹은 이름 배열을 종목 코드 리스트로 변환 (변환하지 못한 입력이 있으면 첫 번째 입력으로 ValueError)"""
+
+    stock_code_or_name_list = list(stock_code_or_name_list)
+    code_arr, unresolved = resolve(stock_code_or_name_list)
+    if unresolved.any():
+        stock_code = stock_code_or_name_list[int(np.flatnonzero(unresolved)[0])]
+        raise ValueError("적절한 종목 코드가 아닙니다. 종목 코드는 6자리 숫자입니다: {}".format(stock_code))
+    return code_arr.tolist()
+
+
+def _package_path(relative_path):
+    """qspy 패키지 폴더 기준 상대 경로를 절대 경로로 변환 (pkg_resources를 import하지 않음)"""
+
+    package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(package_path, relative_path).replace("\\", "/")
@@ -1,7 +1,15 @@
 from ._base import ror_buy_and_hold
 from ._base import ror_buy_and_sell
+from ._runner import run_strategy
+from ._sweep import sweep_candle_pattern
+from ._significance import permutation_test
+from ._significance import bootstrap_test
 
 __all__ = [
     "ror_buy_and_hold",
-    "ror_buy_and_sell"
+    "ror_buy_and_sell",
+    "run_strategy",
+    "sweep_candle_pattern",
+    "permutation_test",
+    "bootstrap_test"
 ]
\ No newline at end of file
@@ -1,5 +1,18 @@
 import numpy as np
 
+
+def _is_bool_arr(arr):
+    """arr이 True/False(혹은 1/0)로만 구성되어 있는지 여부"""
+
+    arr = np.asarray(arr)
+    if arr.dtype == bool:
+        return True
+    try:
+        return bool(np.isin(arr, [True, False]).all())
+    except TypeError:
+        return False
+
+
 def ror_buy_and_hold(data,
                     period,
                     buy_arr,
@@ -15,8 +28,8 @@ def ror_buy_and_hold(data,
     ==========================
     data: DataFrame
         주가 데이터 (FinanceDataReader나 이 패키지를 통해 수집한 데이터 구조와 일치해야 함)
-    period: int
-        보유 기간 (영업일)
+    period: int or array-like
+        보유 기간 (영업일), 여러 개를 입력하면 모든 보유 기간의 수익률을 한 번에 계산
     buy_arr: array-like
         매수 시점을 나타내는 부울 배열 (True: 매수, False: 매수 X)
     buy_col: str, default: "Close"
@@ -27,33 +40,53 @@ def ror_buy_and_hold(data,
         매매 수수료 (%)
     tax_rate: float, default: 0.3
         세금 (%)
+
+    :return : ror_list, type: list or ndarray
+        - period가 int: 보유 기간이 끝나기 전에 데이터가 끝나는 매수 시점을 제외한 수익률 리스트
+        - period가 배열: 크기가 (매수 시점 수, 보유 기간 수)인 수익률 배열 (데이터가 끝나서 매도할 수 없으면 NaN)
     '''
 
     if len(buy_arr) != len(data):
         raise ValueError("buy_arr과 data의 길이가 일치하지 않습니다: {}, {}".format(len(buy_arr), len(data)))
-    if set(buy_arr).union(set([True, False])) != set([True, False]):
+    if not _is_bool_arr(buy_arr):
         raise ValueError("buy_arr이 부울 배열이 아닙니다.")
     if fee_rate > 100 or fee_rate < 0:
         raise ValueError("fee_rate는 0과 100사이어야 합니다.")
 
-    data = data.reset_index(drop = True)
-    buy_arr = np.array(buy_arr)
-    buy_idx_list = data.loc[buy_arr].index
-    max_idx = max(data.index)
+    buy_idx_list = np.flatnonzero(np.asarray(buy_arr, dtype=bool))
+    max_idx = len(data) - 1
+    buy_price_arr = data[buy_col].values.astype(float)
+    sell_price_arr = data[sell_col].values.astype(float)
 
-    buy_idx_list = buy_idx_list[buy_idx_list + period < max_idx]
-    sell_idx_list = buy_idx_list + period
+    if np.ndim(period) == 0:
+        buy_idx_list = buy_idx_list[buy_idx_list + period < max_idx]
+        sell_idx_list = buy_idx_list + period
 
-    # 수익률 계산
-    buy_price_list = data.loc[buy_idx_list, buy_col].values
-    sell_price_list = data.loc[sell_idx_list, sell_col].values
+        # 수익률 계산
+        buy_price_list = buy_price_arr[buy_idx_list]
+        sell_price_list = sell_price_arr[sell_idx_list]
+
+        buy_fee = buy_price_list * fee_rate / 100
+        sell_fee = sell_price_list * fee_rate / 100
+        sell_tax = sell_price_list * tax_rate / 100
+
+        ror_list = (sell_price_list - buy_price_list - buy_fee - sell_fee - sell_tax) / buy_price_list
+        ror_list = ror_list.tolist()
+        return ror_list
+
+    # (매수 시점 x 보유 기간) 매도 위치를 한 번에 만들고, 매도할 수 없는 위치는 NaN으로 채움
+    period_arr = np.asarray(period, dtype=np.int64)
+    sell_idx_list = buy_idx_list[:, None] + period_arr[None, :]
+    valid = sell_idx_list < max_idx
+
+    buy_price_list = buy_price_arr[buy_idx_list][:, None]
+    sell_price_list = np.where(valid, sell_price_arr[np.where(valid, sell_idx_list, 0)], np.nan)
 
     buy_fee = buy_price_list * fee_rate / 100
     sell_fee = sell_price_list * fee_rate / 100
     sell_tax = sell_price_list * tax_rate / 100
 
     ror_list = (sell_price_list - buy_price_list - buy_fee - sell_fee - sell_tax) / buy_price_list
-    ror_list = ror_list.tolist()
     return ror_list
 
 
@@ -84,41 +117,45 @@ def ror_buy_and_sell(data,
         매매 수수료 (%)
     tax_rate: float, default: 0.3
         세금 (%)
+
+    :return : ror_list, type: ndarray
+        매수 시점 순서대로 계산한 수익률 배열
     '''
 
     if len(buy_arr) != len(data):
         raise ValueError("buy_arr과 data의 길이가 일치하지 않습니다: {}, {}".format(len(buy_arr), len(data)))
     if len(sell_arr) != len(data):
         raise ValueError("sell_arr과 data의 길이가 일치하지 않습니다: {}, {}".format(len(sell_arr), len(data)))
-    if set(buy_arr).union(set([True, False])) != set([True, False]):
+    if not _is_bool_arr(buy_arr):
         raise ValueError("buy_arr이 부울 배열이 아닙니다.")
-    if set(sell_arr).union(set([True, False])) != set([True, False]):
+    if not _is_bool_arr(sell_arr):
         raise ValueError("sell_arr이 부울 배열이 아닙니다.")
     if fee_rate > 100 or fee_rate < 0:
         raise ValueError("fee_rate는 0과 100사이어야 합니다.")
 
-    buy_arr = np.array(buy_arr)
-    sell_arr = np.array(sell_arr)
+    buy_arr = np.asarray(buy_arr, dtype=bool)
+    sell_arr = np.asarray(sell_arr, dtype=bool)
+
+    buy_idx_list = np.sort(data.index.values[buy_arr])
+    sell_idx_list = np.sort(data.index.values[sell_arr])
+
+    # 이후에 매도 시점이 있는 매수 시점만 사용 (정렬되어 있으므로 마지막 매도 시점보다 앞선 매수 시점)
+    if len(sell_idx_list) == 0:
+        buy_idx_list = buy_idx_list[:0]
+    else:
+        buy_idx_list = buy_idx_list[:np.searchsorted(buy_idx_list, sell_idx_list[-1], side="left")]
 
-    buy_idx_list = data.loc[buy_arr].index.sort_values()
-    sell_idx_list = data.loc[sell_arr].index.sort_values()
+    # 각 매수 시점에서 가장 가까운 매도 시점 (시가 매수, 종가 매도면 같은 날 매도 가능)
+    side = "left" if (buy_col == "Open" and sell_col == "Close") else "right"
+    sell_idx_list = sell_idx_list[np.searchsorted(sell_idx_list, buy_idx_list, side=side)]
 
     # 수익률 계산
-    ror_list = []
-    for buy_idx in buy_idx_list:
-        if sum(sell_idx_list > buy_idx) == 0:
-            break
-        else:
-            if buy_col == "Open" and sell_col == "Close":
-                sell_idx = sell_idx_list[sell_idx_list >= buy_idx][0]
-            else:
-                sell_idx = sell_idx_list[sell_idx_list > buy_idx][0]
-            buy_price = data.loc[buy_idx, buy_col]
-            sell_price = data.loc[sell_idx, sell_col]
-            buy_fee = buy_price * fee_rate / 100
-            sell_fee = sell_price * fee_rate / 100
-            sell_tax = sell_price * tax_rate / 100
-            ror = (sell_price - buy_price - buy_fee - sell_fee - sell_tax) / buy_price
-            ror_list.append(ror)
-
-    return ror_list
\ No newline at end of file
+    buy_price_list = data[buy_col].values[data.index.get_indexer(buy_idx_list)].astype(float)
+    sell_price_list = data[sell_col].values[data.index.get_indexer(sell_idx_list)].astype(float)
+
+    buy_fee = buy_price_list * fee_rate / 100
+    sell_fee = sell_price_list * fee_rate / 100
+    sell_tax = sell_price_list * tax_rate / 100
+
+    ror_list = (sell_price_list - buy_price_list - buy_fee - sell_fee - sell_tax) / buy_price_list
+    return ror_list
@@ -0,0 +1,201 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from ..utils import code_list
+from ..utils import resolve
+from ..datasets._base import _read_local_range
+from ._base import ror_buy_and_hold
+from ._base import ror_buy_and_sell
+
+
+STAT_COLUMNS = ["count", "mean", "median", "std", "win_rate"]
+
+
+def _ror_stats(ror_list):
+    """수익률 배열의 통계 (count, mean, median, std, win_rate)"""
+
+    ror_list = np.asarray(ror_list, dtype=float)
+    if len(ror_list) == 0:
+        return [0, np.nan, np.nan, np.nan, np.nan]
+    return [
+        len(ror_list),
+        ror_list.mean(),
+        np.median(ror_list),
+        ror_list.std(ddof=1) if len(ror_list) > 1 else np.nan,
+        (ror_list > 0).mean(),
+    ]
+
+
+def _run_shard(stock_code_list, signal, signal_kwargs, period, sell_signal, sell_signal_kwargs, start_date, end_date,
+               buy_col, sell_col, fee_rate, tax_rate):
+
+    """
+    종목 묶음 하나에 대해 데이터 로드 -> 신호 계산 -> 수익률 계산을 수행 (프로세스 풀에서 실행됨)
+
+    :return : result_list, type: list
+        (종목 코드, 수익률 배열, 오류 메시지)로 구성된 리스트 (오류가 없으면 오류 메시지는 None)
+    """
+
+    result_list = []
+    for stock_code in stock_code_list:
+        # 로컬 데이터가 기간 전체를 포함하지 않아도 (예: 기간 중에 상장한 종목) 겹치는 구간을 사용
+        try:
+            data = _read_local_range(stock_code, start_date, end_date)
+        except Exception as e:
+            result_list.append((stock_code, None, "{}: {}".format(type(e).__name__, e)))
+            continue
+        if (data is None) or (len(data) == 0):
+            result_list.append((stock_code, None, "ValueError: 로컬 데이터가 없습니다"))
+            continue
+        try:
+            # calendar_effect의 week_effect, month_effect처럼 (매수, 매도) 배열을 함께 반환하는 신호도 사용
+            buy_arr = signal(data, **signal_kwargs)
+            signal_sell_arr = None
+            if isinstance(buy_arr, tuple):
+                buy_arr, signal_sell_arr = buy_arr
+            if period is not None:
+                ror_list = ror_buy_and_hold(data, period, buy_arr, buy_col, sell_col, fee_rate, tax_rate)
+            else:
+                if sell_signal is not None:
+                    sell_arr = sell_signal(data, **sell_signal_kwargs)
+                    if isinstance(sell_arr, tuple):
+                        sell_arr = sell_arr[1]
+                elif signal_sell_arr is not None:
+                    sell_arr = signal_sell_arr
+                else:
+                    raise ValueError("signal이 매도 배열을 반환하지 않으면 period나 sell_signal을 입력해야 합니다.")
+                ror_list = ror_buy_and_sell(data, buy_arr, sell_arr, buy_col, sell_col, fee_rate, tax_rate)
+            result_list.append((stock_code, np.asarray(ror_list, dtype=float), None))
+        except Exception as e:
+            result_list.append((stock_code, None, "{}: {}".format(type(e).__name__, e)))
+    return result_list
+
+
+def run_strategy(
+    signal,
+    stock_code_or_name_list=None,
+    period=None,
+    sell_signal=None,
+    start_date=None,
+    end_date=None,
+    buy_col="Close",
+    sell_col="Close",
+    fee_rate=0.015,
+    tax_rate=0.3,
+    signal_kwargs=None,
+    sell_signal_kwargs=None,
+    n_jobs=1,
+    return_errors=False,
+):
+
+    """
+    여러 종목에 매수 신호를 적용하여 수익률을 계산하고, 전체 및 종목별 수익률 통계를 반환
+
+    종목을 묶음으로 나누어 프로세스마다 데이터 로드, 신호 계산, 수익률 계산을 모두 처리하며,
+    끝난 묶음부터 결과를 받아서 통계를 누적함 (로컬 데이터만 사용하므로 필요하면 미리 load_stock_data_list로 수집)
+
+    Parameters:
+    ==========================
+    signal: callable
+        주가 데이터를 입력받아 매수 시점을 나타내는 부울 배열을 반환하는 함수 (예: qspy.analysis.bullish_engulfing)
+        (매수, 매도) 부울 배열 튜플을 반환하는 함수(예: qspy.analysis.week_effect)이면 period와 sell_signal이 없을 때
+        반환된 매도 배열로 ror_buy_and_sell을 계산
+        n_jobs가 1이 아니면 피클로 전달할 수 있어야 하므로 모듈 수준에서 정의된 함수여야 함 (lambda 불가)
+    stock_code_or_name_list: array-like, default: None
+        적용할 종목 코드 및 이름으로 구성된 배열 (None으로 입력시 관리하는 모든 종목)
+        종목 코드로 변환할 수 없는 입력은 계산하지 않고 오류 목록에 기록
+    period: int, default: None
+        보유 기간 (영업일), 입력하면 ror_buy_and_hold로 수익률을 계산
+    sell_signal: callable, default: None
+        매도 시점을 나타내는 부울 배열을 반환하는 함수, 입력하면 ror_buy_and_sell로 수익률을 계산
+    start_date: str, default: None
+        시작 날짜: YYYY-MM-DD (None으로 입력시 상장일로 설정)
+    end_date: str, default: None
+        종료 날짜: YYYY-MM-DD (None으로 입력시 로컬 데이터의 마지막 날짜로 설정)
+        로컬 데이터가 기간 전체를 포함하지 않는 종목(기간 중에 상장한 종목 등)은 겹치는 구간만 사용
+    buy_col: str, default: "Close"
+        매수 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    sell_col: str, default: "Close"
+        매도 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    fee_rate: float, default: 0.015
+        매매 수수료 (%)
+    tax_rate: float, default: 0.3
+        세금 (%)
+    signal_kwargs: dict, default: None
+        signal에 함께 전달할 인자
+    sell_signal_kwargs: dict, default: None
+        sell_signal에 함께 전달할 인자
+    n_jobs: int, default: 1
+        사용할 프로세스 수 (1이면 순차 처리, None이면 CPU 수)
+    return_errors: bool, default: False
+        True이면 처리에 실패한 종목과 오류 메시지를 담은 딕셔너리를 함께 반환
+
+    :return : (stats, stock_stats)
+        stats: 모든 종목의 수익률을 합쳐서 계산한 통계 (count, mean, median, std, win_rate) 시리즈
+        stock_stats: 행이 종목 코드이고 열이 통계인 데이터프레임 (입력 순서 유지, 실패한 종목은 제외)
+        return_errors가 True이면 (stats, stock_stats, error_dict)
+    """
+
+    if (period is not None) and (sell_signal is not None):
+        raise ValueError("period와 sell_signal 중 하나만 입력해야 합니다.")
+    if (period is not None) and (np.ndim(period) != 0):
+        raise ValueError("period는 정수이어야 합니다: {}".format(period))
+
+    # stock_code_or_name_list를 stock_code_list로 변환
+    # 변환할 수 없는 입력(예: 관리 종목 중 영문이 포함된 코드)은 건너뛰고 오류 목록에 기록
+    if stock_code_or_name_list is None:
+        stock_code_or_name_list = code_list()
+    stock_code_or_name_list = list(stock_code_or_name_list)
+    code_arr, unresolved = resolve(stock_code_or_name_list)
+    stock_code_list = code_arr[~unresolved].tolist()
+    rejected_dict = {
+        stock_code_or_name_list[i]: "ValueError: 적절한 종목 코드가 아닙니다. 종목 코드는 6자리 숫자입니다."
+        for i in np.flatnonzero(unresolved)
+    }
+
+    args = (signal, signal_kwargs or {}, period, sell_signal, sell_signal_kwargs or {}, start_date, end_date,
+            buy_col, sell_col, fee_rate, tax_rate)
+
+    # 종목별 결과는 끝나는 대로 통계로 바꾸고, 수익률은 전체 통계를 위해서만 보관
+    stock_stats = {}
+    error_dict = dict(rejected_dict)
+    ror_dict = {}
+
+    def collect(result_list):
+        for stock_code, stock_ror_list, error in result_list:
+            if error is not None:
+                error_dict[stock_code] = error
+                continue
+            stock_stats[stock_code] = _ror_stats(stock_ror_list)
+            ror_dict[stock_code] = stock_ror_list
+
+    if n_jobs == 1:
+        collect(_run_shard(stock_code_list, *args))
+    else:
+        n_workers = n_jobs or os.cpu_count() or 1
+        n_shards = min(len(stock_code_list), 4 * n_workers)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            future_list = [
+                executor.submit(_run_shard, list(shard), *args)
+                for shard in np.array_split(np.array(stock_code_list, dtype=object), max(n_shards, 1))
+                if len(shard) > 0
+            ]
+            for future in as_completed(future_list):
+                collect(future.result())
+
+    # 프로세스 수와 상관없이 같은 결과가 나오도록 입력 순서대로 합침
+    done_list = [stock_code for stock_code in dict.fromkeys(stock_code_list) if stock_code in stock_stats]
+    ror_list = np.concatenate([ror_dict[stock_code] for stock_code in done_list]) if len(done_list) > 0 else np.array([])
+    stats = pd.Series(_ror_stats(ror_list), index=STAT_COLUMNS)
+    stock_stats = pd.DataFrame(
+        [stock_stats[stock_code] for stock_code in done_list],
+        index=pd.Index(done_list, name="Code"),
+        columns=STAT_COLUMNS,
+    )
+    stock_stats["count"] = stock_stats["count"].astype(int)
+
+    if return_errors:
+        return stats, stock_stats, error_dict
+    return stats, stock_stats
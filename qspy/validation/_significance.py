@@ -0,0 +1,299 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from ._base import ror_buy_and_hold
+
+
+RESULT_INDEX = ["count", "observed", "resample_mean", "p_value", "ci_low", "ci_high"]
+
+
+def _stock_returns(data_list, buy_arr_list, period, buy_col, sell_col, fee_rate, tax_rate):
+    """
+    종목마다 (진입 가능한 모든 시점의 수익률, 신호 시점 위치)를 반환
+
+    보유 기간이 끝나기 전에 데이터가 끝나는 시점과 수익률이 NaN/inf인 시점(가격 결측, 거래 정지 등)은 제외함
+    """
+
+    if len(data_list) != len(buy_arr_list):
+        raise ValueError("data와 buy_arr의 종목 수가 같아야 합니다.")
+    result_list = []
+    for data, buy_arr in zip(data_list, buy_arr_list):
+        buy_arr = np.asarray(buy_arr, dtype=bool)
+        if len(buy_arr) != len(data):
+            raise ValueError("buy_arr의 길이가 데이터의 길이와 같아야 합니다.")
+        ror_all = np.asarray(
+            ror_buy_and_hold(data, period, np.ones(len(data), dtype=bool), buy_col, sell_col, fee_rate, tax_rate),
+            dtype=float,
+        )
+        valid = np.isfinite(ror_all)
+        buy_idx = np.flatnonzero(buy_arr[:len(ror_all)] & valid)
+        # 제외한 시점을 뺀 배열에서의 위치로 바꿈 (시간 순서는 유지됨)
+        result_list.append((ror_all[valid], np.searchsorted(np.flatnonzero(valid), buy_idx)))
+    return result_list
+
+
+def _statistic_values(ror, statistic):
+    return ror if statistic == "mean" else (ror > 0).astype(float)
+
+
+def _resample_stock(ror_all, buy_idx, method, n_resamples, block_size, statistic, chunk_size, seed):
+
+    """
+    한 종목의 재표본마다 통계 값의 합을 계산 (프로세스 풀에서 실행됨)
+
+    재표본은 chunk_size개씩 (재표본 수 x 매매 수) 위치 행렬 하나로 만들어서 한 번에 계산함
+    - permutation: 진입 가능한 시점 중에서 신호 수만큼 중복 없이 뽑은 무작위 진입
+    - bootstrap: 신호 시점의 수익률을 시간 순서대로 block_size개씩 묶어서 중복을 허용하여 뽑은 순환 블록 부트스트랩
+      (마지막 매매 뒤에는 첫 매매가 이어지는 것으로 보며, 재표본마다 블록이 두 개 이상이 되도록 블록 길이를 매매 수의 절반 이하로 줄임)
+
+    :return : (sums, observed_sum, count)
+        sums: 재표본마다 통계 값의 합 (크기: n_resamples)
+        observed_sum: 신호 시점의 통계 값의 합
+        count: 신호 시점의 매매 수
+    """
+
+    rng = np.random.default_rng(seed)
+    values_all = _statistic_values(ror_all, statistic)
+    values = values_all[buy_idx]
+    n, k = len(values_all), len(values)
+    sums = np.zeros(n_resamples)
+    if k == 0:
+        return sums, 0.0, 0
+
+    for start in range(0, n_resamples, chunk_size):
+        c = min(chunk_size, n_resamples - start)
+        if method == "permutation":
+            if k == n:
+                sums[start: start + c] = values_all.sum()
+                continue
+            # 난수 행렬에서 가장 작은 k개의 위치는 중복 없이 균일하게 뽑은 k개의 시점과 같음
+            idx = np.argpartition(rng.random((c, n)), k - 1, axis=1)[:, :k]
+            sums[start: start + c] = values_all[idx].sum(axis=1)
+        else:
+            b = min(block_size, max(1, k // 2))
+            n_blocks = -(-k // b)
+            starts = rng.integers(0, k, size=(c, n_blocks))
+            idx = ((starts[:, :, None] + np.arange(b)[None, None, :]) % k).reshape(c, -1)[:, :k]
+            sums[start: start + c] = values[idx].sum(axis=1)
+    return sums, float(values.sum()), k
+
+
+def _p_value(observed, null_arr, alternative):
+    """재표본 분포 null_arr에서 observed 이상으로 치우친 값의 비율 (+1 보정)"""
+
+    if alternative == "greater":
+        extreme = (null_arr >= observed).sum()
+    elif alternative == "less":
+        extreme = (null_arr <= observed).sum()
+    else:
+        center = null_arr.mean()
+        extreme = (np.abs(null_arr - center) >= abs(observed - center)).sum()
+    return (1 + extreme) / (1 + len(null_arr))
+
+
+def _resample_test(
+    data, buy_arr, period, method, n_resamples, block_size, statistic, alternative, confidence,
+    buy_col, sell_col, fee_rate, tax_rate, chunk_size, random_state, n_jobs,
+):
+    if np.ndim(period) != 0:
+        raise ValueError("period는 정수이어야 합니다: {}".format(period))
+    if statistic not in ["mean", "win_rate"]:
+        raise ValueError('statistic은 "mean", "win_rate" 중 하나이어야 합니다: {}'.format(statistic))
+    if alternative not in ["greater", "less", "two-sided"]:
+        raise ValueError('alternative는 "greater", "less", "two-sided" 중 하나이어야 합니다: {}'.format(alternative))
+    if not (0 < confidence < 1):
+        raise ValueError("confidence는 0과 1사이어야 합니다.")
+    if (n_resamples < 1) or (chunk_size < 1) or (block_size < 1):
+        raise ValueError("n_resamples, chunk_size, block_size는 1 이상이어야 합니다.")
+
+    if isinstance(data, pd.DataFrame):
+        data_list, buy_arr_list = [data], [buy_arr]
+    else:
+        data_list, buy_arr_list = list(data), list(buy_arr)
+    stock_list = _stock_returns(data_list, buy_arr_list, period, buy_col, sell_col, fee_rate, tax_rate)
+
+    # 종목마다 독립된 난수 생성기를 사용하므로 프로세스 수와 상관없이 같은 결과가 나옴
+    seed_list = np.random.SeedSequence(random_state).spawn(len(stock_list))
+    n = len(stock_list)
+    args = (
+        [ror_all for ror_all, _ in stock_list],
+        [buy_idx for _, buy_idx in stock_list],
+        [method] * n, [n_resamples] * n, [block_size] * n, [statistic] * n, [chunk_size] * n, seed_list,
+    )
+    if n_jobs == 1:
+        result_list = list(map(_resample_stock, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunksize = max(1, n // (4 * (n_jobs or os.cpu_count() or 1)))
+            result_list = list(executor.map(_resample_stock, *args, chunksize=chunksize))
+
+    count = sum(k for _, _, k in result_list)
+    if count == 0:
+        raise ValueError("보유 기간 안에 매도할 수 있는 매수 신호가 없습니다.")
+    distribution = sum(sums for sums, _, _ in result_list) / count
+    observed = sum(observed_sum for _, observed_sum, _ in result_list) / count
+
+    if method == "permutation":
+        null_arr = distribution
+    else:
+        # 부트스트랩 분포를 귀무가설 값(평균 수익률 0, 승률 0.5)으로 옮겨서 검정
+        null_value = 0.0 if statistic == "mean" else 0.5
+        null_arr = distribution - observed + null_value
+    ci_low, ci_high = np.quantile(distribution, [(1 - confidence) / 2, (1 + confidence) / 2])
+    result = pd.Series(
+        [count, observed, distribution.mean(), _p_value(observed, null_arr, alternative), ci_low, ci_high],
+        index=RESULT_INDEX,
+    )
+    return result, distribution
+
+
+def permutation_test(
+    data,
+    buy_arr,
+    period,
+    n_resamples=10000,
+    statistic="mean",
+    alternative="greater",
+    confidence=0.95,
+    buy_col="Close",
+    sell_col="Close",
+    fee_rate=0.015,
+    tax_rate=0.3,
+    chunk_size=1000,
+    random_state=None,
+    n_jobs=1,
+    return_distribution=False,
+):
+
+    """
+    매수 신호의 보유 수익률이 같은 수의 무작위 진입보다 좋은지 검정
+
+    종목마다 진입 가능한 시점 중에서 신호 수만큼 중복 없이 무작위로 뽑아서 같은 기간 보유한 수익률을 재표본으로 사용하며,
+    재표본은 chunk_size개씩 (재표본 수 x 매매 수) 위치 행렬 하나로 만들어서 한 번에 계산함
+
+    Parameters:
+    ==========================
+    data: DataFrame or list
+        주가 데이터 혹은 주가 데이터 목록 (목록이면 모든 종목의 매매를 합쳐서 통계를 계산)
+    buy_arr: array-like or list
+        매수 시점을 나타내는 부울 배열 (data가 목록이면 같은 순서의 부울 배열 목록)
+    period: int
+        보유 기간 (영업일)
+    n_resamples: int, default: 10000
+        재표본 수
+    statistic: str, default: "mean"
+        검정할 통계 ("mean": 평균 수익률, "win_rate": 승률)
+    alternative: str, default: "greater"
+        대립가설 ("greater": 무작위 진입보다 큼, "less": 작음, "two-sided": 다름)
+    confidence: float, default: 0.95
+        구간의 신뢰 수준
+    buy_col: str, default: "Close"
+        매수 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    sell_col: str, default: "Close"
+        매도 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    fee_rate: float, default: 0.015
+        매매 수수료 (%)
+    tax_rate: float, default: 0.3
+        세금 (%)
+    chunk_size: int, default: 1000
+        한 번에 만드는 재표본 수 (메모리는 chunk_size x 종목의 데이터 길이에 비례)
+    random_state: int, default: None
+        난수 시드 (같은 시드면 n_jobs와 상관없이 같은 결과)
+    n_jobs: int, default: 1
+        종목을 나누어 처리할 프로세스 수 (1이면 순차 처리, None이면 CPU 수)
+    return_distribution: bool, default: False
+        True이면 무작위 진입 통계 배열(크기: n_resamples)을 함께 반환
+
+    returns:
+    ==========================
+    result: Series
+        count: 매매 수, observed: 신호의 통계, resample_mean: 무작위 진입 통계의 평균,
+        p_value: 무작위 진입이 신호만큼 치우칠 확률, (ci_low, ci_high): 무작위 진입 통계의 confidence 구간
+        return_distribution이 True이면 (result, distribution)
+    """
+
+    result, distribution = _resample_test(
+        data, buy_arr, period, "permutation", n_resamples, 1, statistic, alternative, confidence,
+        buy_col, sell_col, fee_rate, tax_rate, chunk_size, random_state, n_jobs,
+    )
+    if return_distribution:
+        return result, distribution
+    return result
+
+
+def bootstrap_test(
+    data,
+    buy_arr,
+    period,
+    n_resamples=10000,
+    block_size=5,
+    statistic="mean",
+    alternative="greater",
+    confidence=0.95,
+    buy_col="Close",
+    sell_col="Close",
+    fee_rate=0.015,
+    tax_rate=0.3,
+    chunk_size=1000,
+    random_state=None,
+    n_jobs=1,
+    return_distribution=False,
+):
+
+    """
+    매수 신호의 보유 수익률 통계를 블록 부트스트랩으로 검정하고 신뢰 구간을 계산
+
+    보유 기간이 겹치는 매매의 수익률은 서로 상관되어 있으므로, 종목마다 신호 시점의 수익률을 시간 순서대로
+    block_size개씩 묶어서 순환 블록으로 뽑음 (재표본은 chunk_size개씩 위치 행렬 하나로 만들어서 한 번에 계산함)
+
+    Parameters:
+    ==========================
+    data: DataFrame or list
+        주가 데이터 혹은 주가 데이터 목록 (목록이면 모든 종목의 매매를 합쳐서 통계를 계산)
+    buy_arr: array-like or list
+        매수 시점을 나타내는 부울 배열 (data가 목록이면 같은 순서의 부울 배열 목록)
+    period: int
+        보유 기간 (영업일)
+    n_resamples: int, default: 10000
+        재표본 수
+    block_size: int, default: 5
+        한 번에 뽑는 연속된 매매 수 (1이면 일반 부트스트랩, 종목의 매매 수의 절반보다 크면 절반으로 줄임)
+    statistic: str, default: "mean"
+        검정할 통계 ("mean": 평균 수익률, "win_rate": 승률)
+    alternative: str, default: "greater"
+        대립가설 ("greater": 평균 수익률이 0(승률이 0.5)보다 큼, "less": 작음, "two-sided": 다름)
+    confidence: float, default: 0.95
+        신뢰 수준
+    buy_col: str, default: "Close"
+        매수 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    sell_col: str, default: "Close"
+        매도 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    fee_rate: float, default: 0.015
+        매매 수수료 (%)
+    tax_rate: float, default: 0.3
+        세금 (%)
+    chunk_size: int, default: 1000
+        한 번에 만드는 재표본 수 (메모리는 chunk_size x 종목의 매매 수에 비례)
+    random_state: int, default: None
+        난수 시드 (같은 시드면 n_jobs와 상관없이 같은 결과)
+    n_jobs: int, default: 1
+        종목을 나누어 처리할 프로세스 수 (1이면 순차 처리, None이면 CPU 수)
+    return_distribution: bool, default: False
+        True이면 부트스트랩 통계 배열(크기: n_resamples)을 함께 반환
+
+    returns:
+    ==========================
+    result: Series
+        count: 매매 수, observed: 신호의 통계, resample_mean: 부트스트랩 통계의 평균,
+        p_value: 귀무가설(평균 수익률 0, 승률 0.5)에서 신호만큼 치우칠 확률, (ci_low, ci_high): 통계의 백분위수 신뢰 구간
+        return_distribution이 True이면 (result, distribution)
+    """
+
+    result, distribution = _resample_test(
+        data, buy_arr, period, "bootstrap", n_resamples, block_size, statistic, alternative, confidence,
+        buy_col, sell_col, fee_rate, tax_rate, chunk_size, random_state, n_jobs,
+    )
+    if return_distribution:
+        return result, distribution
+    return result
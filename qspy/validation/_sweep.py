@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+from ..analysis.pattern_compiler import _Primitives
+from ..analysis.pattern_compiler import compile_pattern
+from ._base import ror_buy_and_hold
+
+
+# 파라미터 탐색을 지원하는 패턴: 이름 -> (꼬리/몸통 조건을 뺀 패턴 정의, 꼬리 필드, 몸통 필드)
+SWEEP_PATTERNS = {
+    "hammer": ({"conditions": [("high", "==", "close"), "up"]}, "lower_tail", "body"),
+    "inverted_hammer": ({"conditions": [("low", "==", "open"), "up"]}, "upper_tail", "body"),
+    "dragon_fly_doji": ({"conditions": [("high", "==", "close"), ("high", "==", "open")]}, "lower_tail", None),
+}
+
+
+def _range_masks(values, min_arr, max_arr):
+    """(최솟값, 최댓값) 조합마다 min <= values <= max 여부를 (조합 수, 값 수) 부울 배열로 반환"""
+
+    min_arr, max_arr = np.meshgrid(np.atleast_1d(min_arr).astype(float), np.atleast_1d(max_arr).astype(float), indexing="ij")
+    min_arr, max_arr = min_arr.reshape(-1), max_arr.reshape(-1)
+    masks = (values[None, :] >= min_arr[:, None]) & (values[None, :] <= max_arr[:, None])
+    return min_arr, max_arr, masks
+
+
+def sweep_candle_pattern(
+    data,
+    pattern,
+    period,
+    min_len_tail=0,
+    max_len_tail=30,
+    min_len_body=0,
+    max_len_body=30,
+    buy_col="Close",
+    sell_col="Close",
+    fee_rate=0.015,
+    tax_rate=0.3,
+    max_elements=2 ** 26,
+):
+
+    """
+    hammer, inverted_hammer, dragon_fly_doji의 꼬리/몸통 길이 파라미터 조합마다 매매 횟수와 수익률 통계를 계산
+
+    꼬리/몸통 길이와 보유 수익률은 패턴 후보 시점에서 한 번만 계산하고, 모든 파라미터 조합은
+    브로드캐스팅으로 한 번에 평가함 (메모리를 넘지 않도록 조합을 나누어 계산)
+
+    Parameters:
+    ==========================
+    data: DataFrame or list
+        주가 데이터 혹은 주가 데이터 목록 (목록이면 모든 종목의 매매를 합쳐서 통계를 계산)
+    pattern: str
+        패턴 이름 ("hammer", "inverted_hammer", "dragon_fly_doji")
+    period: int
+        보유 기간 (영업일)
+    min_len_tail: float or array-like, default: 0
+        최소 꼬리 길이 후보
+    max_len_tail: float or array-like, default: 30
+        최대 꼬리 길이 후보
+    min_len_body: float or array-like, default: 0
+        최소 몸통 길이 후보 (dragon_fly_doji는 사용하지 않음)
+    max_len_body: float or array-like, default: 30
+        최대 몸통 길이 후보 (dragon_fly_doji는 사용하지 않음)
+    buy_col: str, default: "Close"
+        매수 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    sell_col: str, default: "Close"
+        매도 기준이 되는 컬럼 ("Close": 종가, "Open": 시가)
+    fee_rate: float, default: 0.015
+        매매 수수료 (%)
+    tax_rate: float, default: 0.3
+        세금 (%)
+    max_elements: int, default: 2 ** 26
+        한 번에 만드는 (조합 수 x 매매 후보 수) 배열의 최대 원소 수
+
+    returns:
+    ==========================
+    result: DataFrame
+        파라미터 조합마다 min_len_tail, max_len_tail, (min_len_body, max_len_body,) count, mean, median을 컬럼으로 하는 데이터프레임
+        (매매가 없는 조합의 mean, median은 NaN)
+    """
+
+    if pattern not in SWEEP_PATTERNS:
+        raise ValueError("pattern은 {} 중 하나이어야 합니다: {}".format(list(SWEEP_PATTERNS), pattern))
+    if np.ndim(period) != 0:
+        raise ValueError("period는 정수이어야 합니다: {}".format(period))
+    spec, tail_field, body_field = SWEEP_PATTERNS[pattern]
+    _, kernel = compile_pattern(spec)
+    data_list = [data] if isinstance(data, pd.DataFrame) else list(data)
+
+    # 패턴 후보 시점의 꼬리/몸통 길이와 수익률을 한 번만 계산 (보유 기간이 끝나기 전에 데이터가 끝나면 제외)
+    tail_list, body_list, ror_list = [], [], []
+    for stock_data in data_list:
+        p = _Primitives({
+            "open": stock_data["Open"].values.astype(float, copy=False),
+            "high": stock_data["High"].values.astype(float, copy=False),
+            "low": stock_data["Low"].values.astype(float, copy=False),
+            "close": stock_data["Close"].values.astype(float, copy=False),
+        })
+        with np.errstate(divide="ignore", invalid="ignore"):
+            buy_arr = kernel(p) if len(stock_data) > 0 else np.zeros(0, dtype=bool)
+            tail = p[tail_field][buy_arr]
+            body = p[body_field][buy_arr] if body_field is not None else np.zeros(buy_arr.sum())
+        ror = ror_buy_and_hold(stock_data, [period], buy_arr, buy_col, sell_col, fee_rate, tax_rate)[:, 0]
+        valid = ~np.isnan(ror)
+        tail_list.append(tail[valid])
+        body_list.append(body[valid])
+        ror_list.append(ror[valid])
+
+    # 수익률 순으로 정렬해 두면, 조합마다 선택된 매매의 누적 개수로 중앙값 위치를 찾을 수 있음
+    ror = np.concatenate(ror_list)
+    order = np.argsort(ror, kind="stable")
+    ror, tail, body = ror[order], np.concatenate(tail_list)[order], np.concatenate(body_list)[order]
+
+    tail_min, tail_max, tail_masks = _range_masks(tail, min_len_tail, max_len_tail)
+    if body_field is None:
+        body_min, body_max, body_masks = np.array([np.nan]), np.array([np.nan]), np.ones((1, len(ror)), dtype=bool)
+    else:
+        body_min, body_max, body_masks = _range_masks(body, min_len_body, max_len_body)
+
+    n_tail, n_body, n = len(tail_min), len(body_min), len(ror)
+    count = np.zeros((n_tail, n_body), dtype=np.int64)
+    mean = np.full((n_tail, n_body), np.nan)
+    median = np.full((n_tail, n_body), np.nan)
+    chunk = max(1, max_elements // max(1, n_body * n))
+    for start in range(0, n_tail, chunk):
+        stop = min(start + chunk, n_tail)
+        masks = tail_masks[start:stop, None, :] & body_masks[None, :, :]
+        chunk_count = masks.sum(axis=2)
+        chunk_sum = masks @ ror if n > 0 else np.zeros(chunk_count.shape)
+
+        # 선택된 매매의 누적 개수가 처음으로 (count + 1) // 2, count // 2 + 1이 되는 위치가 중앙값 후보
+        cum_count = np.cumsum(masks, axis=2, dtype=np.int32)
+        lower = (cum_count >= ((chunk_count + 1) // 2)[:, :, None]).argmax(axis=2)
+        upper = (cum_count >= (chunk_count // 2 + 1)[:, :, None]).argmax(axis=2)
+        has_trade = chunk_count > 0
+
+        count[start:stop] = chunk_count
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean[start:stop] = np.where(has_trade, chunk_sum / chunk_count, np.nan)
+        if n > 0:
+            median[start:stop] = np.where(has_trade, (ror[lower] + ror[upper]) / 2, np.nan)
+
+    result = pd.DataFrame({
+        "min_len_tail": np.repeat(tail_min, n_body),
+        "max_len_tail": np.repeat(tail_max, n_body),
+        "min_len_body": np.tile(body_min, n_tail),
+        "max_len_body": np.tile(body_max, n_tail),
+        "count": count.reshape(-1),
+        "mean": mean.reshape(-1),
+        "median": median.reshape(-1),
+    })
+    if body_field is None:
+        result = result.drop(columns=["min_len_body", "max_len_body"])
+    return result
@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import pandas as pd
+import pytest
+import qspy.datasets._manifest as manifest
+import qspy.utils._base as utils_base
+from qspy.datasets import set_data_source
+
+
+PACKAGE_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "qspy", "datasets", "pickle_data")
+
+
+def read_package_prices(stock_code):
+    """패키지에 포함된 종목의 가격 데이터를 읽어서 반환"""
+
+    data = pd.read_pickle(os.path.join(PACKAGE_DATA, "stock_price", "{}.pkl".format(stock_code)), compression="xz")
+    data["Date"] = pd.to_datetime(data["Date"])
+    return data
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    """pickle_data 폴더를 임시 폴더로 바꿔서, 데이터를 저장하는 테스트가 패키지의 데이터를 바꾸지 않도록 함"""
+
+    original = utils_base._package_path
+
+    def package_path(relative_path):
+        if relative_path.startswith("datasets/pickle_data"):
+            return (tmp_path / relative_path).as_posix()
+        return original(relative_path)
+
+    for name, module in list(sys.modules.items()):
+        if name.startswith("qspy") and getattr(module, "_package_path", None) is original:
+            monkeypatch.setattr(module, "_package_path", package_path)
+    monkeypatch.setattr(manifest, "_manifest", {"mtime": None, "entries": {}, "files": {}})
+    root = tmp_path / "datasets" / "pickle_data"
+    (root / "stock_price").mkdir(parents=True)
+    return root
+
+
+class StubSource:
+
+    """
+    미리 넣어 둔 데이터프레임을 돌려주는 데이터 소스
+
+    errors: 종목마다 앞선 요청에서 차례로 발생시킬 예외 목록
+    delays: 종목마다 요청 하나가 기다리는 시간(초)
+    """
+
+    def __init__(self, frames, errors=None, delays=None):
+        self.frames = frames
+        self.errors = {} if errors is None else {code: list(error_list) for code, error_list in errors.items()}
+        self.delays = {} if delays is None else delays
+        self.calls = {}
+
+    def fetch_listing(self, market):
+        return pd.DataFrame({"Code": sorted(self.frames)})
+
+    def fetch_prices(self, stock_code_list, start_date=None, end_date=None):
+        result = {}
+        for stock_code in stock_code_list:
+            self.calls[stock_code] = self.calls.get(stock_code, 0) + 1
+            time.sleep(self.delays.get(stock_code, 0))
+            if len(self.errors.get(stock_code, [])) > 0:
+                raise self.errors[stock_code].pop(0)
+            if stock_code not in self.frames:
+                result[stock_code] = ValueError("관련 데이터가 없습니다")
+                continue
+            data = self.frames[stock_code]
+            cond = pd.Series(True, index=data.index)
+            if start_date is not None:
+                cond &= data["Date"] >= pd.to_datetime(start_date)
+            if end_date is not None:
+                cond &= data["Date"] <= pd.to_datetime(end_date)
+            result[stock_code] = data.loc[cond].reset_index(drop=True)
+        return result
+
+
+@pytest.fixture
+def use_source():
+    """데이터 소스를 바꾸고 테스트가 끝나면 기본값으로 되돌림"""
+
+    def use(source):
+        set_data_source(source)
+        return source
+
+    yield use
+    set_data_source(None)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+import qspy.datasets._base as base
+from qspy.datasets import enable_cache
+from qspy.datasets import disable_cache
+from qspy.datasets import cache_info
+from qspy.datasets._cache import _cache_get
+from qspy.datasets._cache import _cache_put
+
+
+@pytest.fixture
+def cache():
+    enable_cache()
+    yield
+    disable_cache()
+
+
+def test_put_keeps_private_copy(cache):
+    data = pd.DataFrame({"Close": [1.0, 2.0, 3.0], "Volume": [10, 20, 30]})
+    returned = _cache_put(("000000", 0, 0), data)
+    returned.loc[0, "Close"] = -1.0
+    returned.iloc[1, 1] = -1
+    cached = _cache_get(("000000", 0, 0))
+    assert cached["Close"].tolist() == [1.0, 2.0, 3.0]
+    assert cached["Volume"].tolist() == [10, 20, 30]
+
+
+def test_hit_returns_independent_copy(cache):
+    _cache_put(("000000", 0, 0), pd.DataFrame({"Close": [1.0, 2.0, 3.0]}))
+    first = _cache_get(("000000", 0, 0))
+    first.loc[:, "Close"] = 0.0
+    first.iloc[0, 0] = np.nan
+    second = _cache_get(("000000", 0, 0))
+    assert second["Close"].tolist() == [1.0, 2.0, 3.0]
+    assert cache_info()["hits"] == 2
+
+
+def test_loaded_frames_are_not_shared(cache, monkeypatch):
+    # 가격 저장소를 건너뛰고 피클 파일을 읽는 경로(캐시 사용)를 검사
+    monkeypatch.setattr(base, "_read_price_store", lambda *args, **kwargs: None)
+    first = base._read_local_stock_data("000020")
+    expected = first["Close"].values.copy()
+    first.loc[first.index[:10], "Close"] = -1.0
+    second = base._read_local_stock_data("000020")
+    assert cache_info()["hits"] == 1
+    assert np.array_equal(second["Close"].values, expected)
@@ -0,0 +1,107 @@
+import os
+import numpy as np
+import pandas as pd
+from qspy.datasets import load_stock_data
+from qspy.datasets import load_stock_data_list
+from qspy.datasets import compact_stock_data
+from qspy.datasets._manifest import _write_pickle
+from qspy.datasets._manifest import _update_manifest
+from qspy.datasets._manifest import _manifest_entry
+from qspy.datasets._delta import _delta_file_paths
+from conftest import StubSource
+from conftest import read_package_prices
+
+
+def _with_change(data):
+    data = data.reset_index(drop=True).copy()
+    data["Change"] = data["Close"].pct_change()
+    return data
+
+
+def _setup(data_root, n_local=50, n_remote=60):
+    """로컬에는 앞쪽 n_local개 행을 저장하고, 원격에는 마지막 로컬 행의 종가를 고친 n_remote개 행을 둠"""
+
+    history = _with_change(read_package_prices("000020").iloc[-n_remote:])
+    local = history.iloc[:n_local].reset_index(drop=True)
+    file_path = (data_root / "stock_price" / "000020.pkl").as_posix()
+    _write_pickle(local, file_path)
+    _update_manifest("000020", local, file_path)
+
+    remote = history.copy()
+    remote.loc[n_local - 1, "Close"] += 100
+    remote = _with_change(remote)
+    return local, remote, file_path
+
+
+def test_append_read_compact_round_trip(data_root, use_source):
+    local, remote, file_path = _setup(data_root)
+    use_source(StubSource({"000020": remote}))
+    last_date = local["Date"].iloc[-1]
+
+    # 마지막 로컬 날짜부터 가져오면 수정된 마지막 행과 새 행이 델타 세그먼트 하나로 저장됨
+    fetched = load_stock_data("000020", start_date=last_date, download=True)
+    assert len(_delta_file_paths("000020")) == 1
+    entry = _manifest_entry("000020", file_path)
+    assert (entry["segments"], entry["rows"]) == (1, len(remote))
+    assert entry["last_date"] == remote["Date"].iloc[-1].strftime("%Y-%m-%d")
+    assert fetched["Date"].iloc[0] == last_date
+    assert np.array_equal(fetched["Close"].values, remote["Close"].values[len(local) - 1:])
+
+    # 기본 파일 + 델타를 읽으면 수정된 값이 반영되고 Change도 이어서 계산됨
+    merged = load_stock_data("000020", download=False)
+    assert np.array_equal(merged["Date"].values, remote["Date"].values)
+    assert np.array_equal(merged["Close"].values, remote["Close"].values)
+    assert np.allclose(merged["Change"].values[len(local):], remote["Change"].values[len(local):])
+
+    # 압축하면 델타가 사라지고 기본 파일 하나에 같은 이력이 남음
+    assert compact_stock_data() == ["000020"]
+    assert len(_delta_file_paths("000020")) == 0
+    stored = pd.read_pickle(file_path, compression="xz")
+    assert np.array_equal(stored["Close"].values, remote["Close"].values)
+    assert np.allclose(stored["Change"].values[1:], remote["Change"].values[1:])
+    entry = _manifest_entry("000020", file_path)
+    assert (entry["segments"], entry["rows"]) == (0, len(remote))
+
+
+def test_later_segment_wins(data_root, use_source):
+    local, remote, _ = _setup(data_root)
+    source = use_source(StubSource({"000020": remote}))
+    load_stock_data("000020", start_date=local["Date"].iloc[-1], download=True)
+
+    # 같은 날짜를 다시 수정해서 가져오면 뒤에 저장된 세그먼트가 우선함
+    revised = remote.copy()
+    revised.loc[len(revised) - 1, "Close"] += 50
+    source.frames["000020"] = revised
+    load_stock_data("000020", start_date=revised["Date"].iloc[-2], download=True)
+    assert len(_delta_file_paths("000020")) == 2
+    merged = load_stock_data("000020", download=False)
+    assert merged["Close"].iloc[-1] == revised["Close"].iloc[-1]
+    assert merged["Date"].is_unique
+
+
+def test_unchanged_last_row_writes_nothing(data_root, use_source):
+    local, _, _ = _setup(data_root)
+    use_source(StubSource({"000020": local}))
+    load_stock_data("000020", start_date=local["Date"].iloc[-1], download=True)
+    assert len(_delta_file_paths("000020")) == 0
+
+
+def test_download_returns_merged_history(data_root, use_source):
+    local, remote, _ = _setup(data_root)
+    use_source(StubSource({"000020": remote.iloc[40:].reset_index(drop=True)}))
+
+    # 원격에는 최근 구간만 있어도 반환되는 데이터는 로컬 데이터와 병합된 요청 기간 전체
+    start_date = local["Date"].iloc[10]
+    data = load_stock_data("000020", start_date=start_date, download=True)
+    assert data["Date"].iloc[0] == start_date
+    assert np.array_equal(data["Close"].values, remote["Close"].values[10:])
+
+    data_list = load_stock_data_list(["000020"], start_date=start_date, download=True)
+    assert np.array_equal(data_list[0]["Close"].values, remote["Close"].values[10:])
+
+
+def test_files_stay_inside_data_root(data_root, use_source):
+    local, remote, _ = _setup(data_root)
+    use_source(StubSource({"000020": remote}))
+    load_stock_data("000020", start_date=local["Date"].iloc[-1], download=True)
+    assert os.path.exists(data_root / "stock_price" / "delta")
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import qspy.datasets._base as base
+from qspy.datasets import load_fs_data
+from qspy.datasets._fs_store import _fs_terms
+
+
+# 삼성전자(005930) 2019~2020년 연결재무제표 매출액 (1~3분기 보고서는 3개월 값, 4분기 보고서는 1년 값)
+REVENUE = {
+    (2019, 1): 52385546000000.0,
+    (2019, 2): 56127104000000.0,
+    (2019, 3): 62003471000000.0,
+    (2019, 4): 230400881000000.0,
+    (2020, 1): 55325178000000.0,
+    (2020, 2): 52966142000000.0,
+    (2020, 3): 66964160000000.0,
+    (2020, 4): 236806988000000.0,
+}
+
+
+def _quarter_revenue(year, quarter):
+    if quarter == 4:
+        return REVENUE[(year, 4)] - sum(REVENUE[(year, q)] for q in [1, 2, 3])
+    return REVENUE[(year, quarter)]
+
+
+def _expected(year, quarter, n_quarters):
+    total = 0.0
+    for i in range(n_quarters):
+        _year, _quarter = divmod(year * 4 + quarter - 1 - i, 4)
+        total += _quarter_revenue(_year, _quarter + 1)
+    return total
+
+
+@pytest.fixture(params=["store", "files"])
+def fs_path(request, monkeypatch):
+    """재무제표 저장소를 사용하는 경로와 종목별 파일을 읽는 경로를 모두 검사"""
+
+    if request.param == "files":
+        monkeypatch.setattr(base, "_gather_fs_store", lambda *args, **kwargs: None)
+    return request.param
+
+
+@pytest.mark.parametrize("quarter", [1, 2, 3, 4])
+@pytest.mark.parametrize("period, n_quarters", [("3M", 1), ("6M", 2), ("1Y", 4)])
+def test_period_matches_reported_values(fs_path, quarter, period, n_quarters):
+    data = load_fs_data(["005930"], ["매출액"], 2020, quarter, period=period)
+    assert data.loc["005930", "매출액"] == pytest.approx(_expected(2020, quarter, n_quarters))
+
+
+def test_quarterly_revenue_is_positive(fs_path):
+    for quarter in [1, 2, 3, 4]:
+        data = load_fs_data(["005930", "000660"], ["매출액"], 2020, quarter, period="3M")
+        assert (data["매출액"].values > 0).all()
+
+
+def test_annual_report_is_used_as_is():
+    assert _fs_terms(2020, 4, "1Y") == [(1, 2020, 4)]
+    assert _fs_terms(2020, 2, "3M") == [(1, 2020, 2)]
+    assert sorted(_fs_terms(2020, 4, "3M")) == [(-1, 2020, 1), (-1, 2020, 2), (-1, 2020, 3), (1, 2020, 4)]
+
+
+def test_samsung_fourth_quarter_revenue():
+    # 2020년 4분기 매출액 61.55조원 (사업보고서 236.81조원 - 1~3분기 175.26조원)
+    data = load_fs_data(["005930"], ["매출액"], 2020, 4, period="3M")
+    assert np.isclose(data.loc["005930", "매출액"], 61551508000000.0)
+
+
+def test_invalid_period():
+    with pytest.raises(ValueError):
+        _fs_terms(2020, 1, "2Q")
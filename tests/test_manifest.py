@@ -0,0 +1,44 @@
+import os
+from qspy.datasets import stock_codes_to_refresh
+from qspy.datasets._manifest import _write_pickle
+from qspy.datasets._manifest import _update_manifest
+from qspy.datasets._manifest import _manifest_entry
+from conftest import read_package_prices
+
+
+def _store(data_root, data, mtime):
+    file_path = (data_root / "stock_price" / "000020.pkl").as_posix()
+    _write_pickle(data.reset_index(drop=True), file_path)
+    os.utime(file_path, (mtime, mtime))
+    return file_path
+
+
+def test_refresh_set_follows_manifest(data_root):
+    history = read_package_prices("000020")
+    file_path = _store(data_root, history.iloc[:-5], 1_600_000_000)
+    _update_manifest("000020", history.iloc[:-5], file_path)
+    end_date = history["Date"].iloc[-1]
+    assert stock_codes_to_refresh(end_date, ["000020"]) == ["000020"]
+    assert stock_codes_to_refresh(history["Date"].iloc[-6], ["000020"]) == []
+
+
+def test_rewritten_file_rebuilds_entry(data_root):
+    history = read_package_prices("000020")
+    file_path = _store(data_root, history.iloc[:-5], 1_600_000_000)
+    _update_manifest("000020", history.iloc[:-5], file_path)
+
+    # load_stock_data를 거치지 않고 파일을 다시 저장하면 항목이 파일과 달라짐
+    _store(data_root, history, 1_600_000_100)
+    assert _manifest_entry("000020", file_path) is None
+    assert stock_codes_to_refresh(history["Date"].iloc[-1], ["000020"]) == []
+    entry = _manifest_entry("000020", file_path)
+    assert entry["rows"] == len(history)
+    assert entry["last_date"] == history["Date"].iloc[-1].strftime("%Y-%m-%d")
+
+    # 더 짧은 데이터로 다시 저장하면 다시 수집 대상이 됨
+    _store(data_root, history.iloc[:-10], 1_600_000_200)
+    assert stock_codes_to_refresh(history["Date"].iloc[-1], ["000020"]) == ["000020"]
+
+
+def test_missing_file_needs_refresh(data_root):
+    assert stock_codes_to_refresh("2021-01-04", ["000020"]) == ["000020"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from qspy.analysis import scan_patterns
+from qspy.analysis.pattern_scanner import PATTERN_SPECS
+from qspy.analysis.pattern_stream import PatternStream
+from conftest import read_package_prices
+
+
+STOCK_CODES = ["000020", "000040", "005930"]
+PATTERN_LIST = list(PATTERN_SPECS)
+
+
+@pytest.fixture(scope="module")
+def price_data():
+    return {stock_code: read_package_prices(stock_code) for stock_code in STOCK_CODES}
+
+
+def _unique_dates(data, n_rows):
+    """마지막 n_rows개 봉 (PatternStream은 날짜가 같은 봉을 이전 봉의 수정으로 보므로 중복 날짜는 마지막 행만 사용)"""
+
+    return data.drop_duplicates(subset=["Date"], keep="last").iloc[-n_rows:].reset_index(drop=True)
+
+
+def test_stream_corrects_bar_with_same_date(price_data):
+    data = _unique_dates(price_data["000020"], 20)
+    stream = PatternStream(PATTERN_LIST)
+    stream.warm_up("000020", data.iloc[:-1])
+
+    # 같은 날짜의 봉이 다시 들어오면 마지막 봉을 고치므로 결과는 마지막 봉만 들어온 것과 같음
+    bar = data.iloc[-1]
+    stream.update("000020", dict(bar, Close=bar["Open"] * 0.5, Low=bar["Open"] * 0.5))
+    expected = scan_patterns(data, PATTERN_LIST)[-1]
+    assert stream.update("000020", bar) == [name for name, flag in zip(PATTERN_LIST, expected) if flag]
+
+
+def test_stream_update_matches_scan_patterns(price_data):
+    data = _unique_dates(price_data["000040"], 300)
+    expected = scan_patterns(data, PATTERN_LIST)
+    stream = PatternStream(PATTERN_LIST)
+    for i, (_, bar) in enumerate(data.iterrows()):
+        fired = stream.update("000040", bar)
+        assert fired == [name for name, flag in zip(PATTERN_LIST, expected[i]) if flag], i
+
+
+def test_stream_update_many_matches_scan_patterns(price_data):
+    data_dict = {stock_code: _unique_dates(data, 200) for stock_code, data in price_data.items()}
+    expected = {stock_code: scan_patterns(data, PATTERN_LIST) for stock_code, data in data_dict.items()}
+    stream = PatternStream(PATTERN_LIST)
+    for i in range(200):
+        bars = pd.DataFrame([data.iloc[i] for data in data_dict.values()], index=list(data_dict))
+        fired = stream.update_many(bars)
+        for stock_code in data_dict:
+            assert np.array_equal(fired.loc[stock_code].values.astype(bool), expected[stock_code][i]), (stock_code, i)
+
+
+def test_stream_warm_up(price_data):
+    data = _unique_dates(price_data["005930"], 100)
+    expected = scan_patterns(data, PATTERN_LIST)
+    stream = PatternStream(PATTERN_LIST)
+    stream.warm_up("005930", data.iloc[:-1])
+    fired = stream.update("005930", data.iloc[-1])
+    assert fired == [name for name, flag in zip(PATTERN_LIST, expected[-1]) if flag]
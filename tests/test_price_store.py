@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from qspy.datasets._base import _price_file_path
+from qspy.datasets._price_store import PRICE_FIELDS
+from qspy.datasets._price_store import _read_price_store
+
+
+def test_store_matches_pickle():
+    for stock_code in ["000020", "000040", "005930"]:
+        data = _read_price_store(stock_code)
+        expected = pd.read_pickle(_price_file_path(stock_code), compression="xz")
+        assert list(data.columns) == PRICE_FIELDS
+        assert np.array_equal(data["Date"].values, pd.to_datetime(expected["Date"]).values)
+        for field in ["Open", "High", "Low", "Close", "Volume"]:
+            assert np.array_equal(data[field].values, expected[field].values)
+
+
+def test_modified_frame_does_not_change_store():
+    data = _read_price_store("000020")
+    close = data["Close"].values.copy()
+    data.loc[data.index[:5], "Close"] = -1.0
+    assert np.array_equal(_read_price_store("000020")["Close"].values, close)
@@ -0,0 +1,75 @@
+import time
+import numpy as np
+from qspy.datasets import refresh_universe
+from qspy.datasets import load_stock_data
+from qspy.datasets._manifest import _manifest_entry
+from conftest import StubSource
+from conftest import read_package_prices
+
+
+OPTIONS = {"rate": 1000.0, "backoff": 0.01, "max_backoff": 0.05}
+
+
+def _frames(*stock_codes):
+    return {stock_code: read_package_prices(stock_code).iloc[-30:].reset_index(drop=True) for stock_code in stock_codes}
+
+
+def test_update_writes_data(data_root, use_source):
+    frames = _frames("000020", "000040")
+    use_source(StubSource(frames))
+    summary, report = refresh_universe(["000020", "000040"], **OPTIONS)
+    assert (summary["total"], summary["updated"], summary["failed"], summary["retries"]) == (2, 2, 0, 0)
+    assert summary["rows"] == 60
+    for stock_code, data in frames.items():
+        assert (data_root / "stock_price" / "{}.pkl".format(stock_code)).exists()
+        stored = load_stock_data(stock_code, download=False)
+        assert np.array_equal(stored["Close"].values, data["Close"].values)
+
+    # 로컬 데이터가 최신이면 마지막 날짜부터만 가져오고 새로 추가된 행이 없음
+    summary, report = refresh_universe(["000020"], **OPTIONS)
+    assert report.loc["000020", "status"] == "unchanged"
+    assert report.loc["000020", "rows"] == 0
+
+
+def test_retries_after_connection_error(data_root, use_source):
+    source = use_source(StubSource(_frames("000020"), errors={"000020": [ConnectionError("끊김"), ConnectionError("끊김")]}))
+    summary, report = refresh_universe(["000020"], max_retries=3, **OPTIONS)
+    assert report.loc["000020", "status"] == "updated"
+    assert report.loc["000020", "attempts"] == 3
+    assert summary["retries"] == 2
+    assert source.calls["000020"] == 3
+
+
+def test_gives_up_after_max_retries(data_root, use_source):
+    errors = {"000020": [ConnectionError("끊김")] * 3}
+    source = use_source(StubSource(_frames("000020", "000040"), errors=errors))
+    summary, report = refresh_universe(["000020", "000040"], max_retries=1, **OPTIONS)
+    assert report.loc["000020", "status"] == "failed"
+    assert report.loc["000020", "attempts"] == 2
+    assert report.loc["000020", "error"].startswith("ConnectionError")
+    assert source.calls["000020"] == 2
+    assert report.loc["000040", "status"] == "updated"
+    assert _manifest_entry("000020", (data_root / "stock_price" / "000020.pkl").as_posix()) is None
+
+
+def test_value_error_is_not_retried(data_root, use_source):
+    source = use_source(StubSource(_frames("000020")))
+    summary, report = refresh_universe(["000020", "000040"], max_retries=3, **OPTIONS)
+    assert report.loc["000040", "status"] == "failed"
+    assert report.loc["000040", "attempts"] == 1
+    assert report.loc["000040", "error"].startswith("ValueError")
+    assert source.calls["000040"] == 1
+    assert report.loc["000020", "status"] == "updated"
+
+
+def test_timeout_does_not_hold_slot(data_root, use_source):
+    # 멈춘 요청이 제한 시간을 넘기면 실패로 기록하고, 동시 요청 수가 1이어도 다른 종목은 기다리지 않음
+    source = use_source(StubSource(_frames("000020", "000040"), delays={"000020": 2.0}))
+    started = time.monotonic()
+    summary, report = refresh_universe(["000020", "000040"], max_concurrency=1, max_retries=1, timeout=0.2, **OPTIONS)
+    assert time.monotonic() - started < 1.5
+    assert report.loc["000020", "status"] == "failed"
+    assert report.loc["000020", "attempts"] == 2
+    assert report.loc["000020", "error"].startswith("TimeoutError")
+    assert source.calls["000020"] == 2
+    assert report.loc["000040", "status"] == "updated"
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from qspy.analysis import scan_patterns
+from qspy.analysis import week_effect
+from qspy.analysis import month_effect
+from qspy.validation import ror_buy_and_hold
+from qspy.validation import ror_buy_and_sell
+from conftest import read_package_prices
+
+
+def baseline_ror_buy_and_hold(data, period, buy_arr, buy_col="Close", sell_col="Close", fee_rate=0.015, tax_rate=0.3):
+    """벡터화하기 전의 ror_buy_and_hold"""
+
+    data = data.reset_index(drop=True)
+    buy_idx_list = data.loc[np.array(buy_arr)].index
+    max_idx = max(data.index)
+    buy_idx_list = buy_idx_list[buy_idx_list + period < max_idx]
+    sell_idx_list = buy_idx_list + period
+    buy_price_list = data.loc[buy_idx_list, buy_col].values
+    sell_price_list = data.loc[sell_idx_list, sell_col].values
+    buy_fee = buy_price_list * fee_rate / 100
+    sell_fee = sell_price_list * fee_rate / 100
+    sell_tax = sell_price_list * tax_rate / 100
+    return ((sell_price_list - buy_price_list - buy_fee - sell_fee - sell_tax) / buy_price_list).tolist()
+
+
+def baseline_ror_buy_and_sell(data, buy_arr, sell_arr, buy_col="Close", sell_col="Close", fee_rate=0.015, tax_rate=0.3):
+    """벡터화하기 전의 ror_buy_and_sell"""
+
+    buy_idx_list = data.loc[np.array(buy_arr)].index.sort_values()
+    sell_idx_list = data.loc[np.array(sell_arr)].index.sort_values()
+    ror_list = []
+    for buy_idx in buy_idx_list:
+        if sum(sell_idx_list > buy_idx) == 0:
+            break
+        if buy_col == "Open" and sell_col == "Close":
+            sell_idx = sell_idx_list[sell_idx_list >= buy_idx][0]
+        else:
+            sell_idx = sell_idx_list[sell_idx_list > buy_idx][0]
+        buy_price = data.loc[buy_idx, buy_col]
+        sell_price = data.loc[sell_idx, sell_col]
+        buy_fee = buy_price * fee_rate / 100
+        sell_fee = sell_price * fee_rate / 100
+        sell_tax = sell_price * tax_rate / 100
+        ror_list.append((sell_price - buy_price - buy_fee - sell_fee - sell_tax) / buy_price)
+    return ror_list
+
+
+@pytest.fixture(scope="module")
+def data():
+    return read_package_prices("005930").iloc[-1500:].reset_index(drop=True)
+
+
+def _buy_signals(data):
+    return {
+        "pattern": scan_patterns(data).any(axis=1),
+        "monday": week_effect(data)[0],
+        "month_end": month_effect(data)[0],
+        "last_rows": np.arange(len(data)) >= len(data) - 3,
+    }
+
+
+@pytest.mark.parametrize("period", [0, 1, 5, 20])
+@pytest.mark.parametrize("buy_col, sell_col", [("Close", "Close"), ("Open", "Close"), ("Open", "Open")])
+def test_buy_and_hold_matches_baseline(data, period, buy_col, sell_col):
+    for name, buy_arr in _buy_signals(data).items():
+        expected = baseline_ror_buy_and_hold(data, period, buy_arr, buy_col, sell_col)
+        assert np.allclose(ror_buy_and_hold(data, period, buy_arr, buy_col, sell_col), expected), name
+
+
+def test_buy_and_hold_periods_match_scalar_calls(data):
+    buy_arr = _buy_signals(data)["pattern"]
+    periods = [1, 5, 20]
+    ror_arr = ror_buy_and_hold(data, periods, buy_arr)
+    for j, period in enumerate(periods):
+        expected = baseline_ror_buy_and_hold(data, period, buy_arr)
+        assert np.allclose(ror_arr[:len(expected), j], expected)
+        assert np.isnan(ror_arr[len(expected):, j]).all()
+
+
+@pytest.mark.parametrize("buy_col, sell_col", [("Close", "Close"), ("Open", "Close"), ("Open", "Open")])
+def test_buy_and_sell_matches_baseline(data, buy_col, sell_col):
+    signals = _buy_signals(data)
+    pairs = [
+        week_effect(data),
+        week_effect(data, 2, 3),
+        month_effect(data),
+        month_effect(data, "mid", "end"),
+        (signals["pattern"], week_effect(data)[1]),
+        (signals["pattern"], signals["pattern"]),
+    ]
+    for buy_arr, sell_arr in pairs:
+        expected = baseline_ror_buy_and_sell(data, buy_arr, sell_arr, buy_col, sell_col)
+        assert np.allclose(ror_buy_and_sell(data, buy_arr, sell_arr, buy_col, sell_col), expected)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from qspy.analysis import candle_pattern
+from qspy.analysis import scan_patterns
+from qspy.analysis.pattern_scanner import PATTERN_SPECS
+from conftest import read_package_prices
+
+
+STOCK_CODES = ["000020", "000040", "005930"]
+PATTERN_LIST = list(PATTERN_SPECS)
+
+
+@pytest.fixture(scope="module")
+def price_data():
+    return {stock_code: read_package_prices(stock_code) for stock_code in STOCK_CODES}
+
+
+@pytest.mark.parametrize("stock_code", STOCK_CODES)
+def test_scan_patterns_matches_candle_pattern(price_data, stock_code):
+    data = price_data[stock_code]
+    cond = scan_patterns(data, PATTERN_LIST)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, name in enumerate(PATTERN_LIST):
+            assert np.array_equal(cond[:, j], getattr(candle_pattern, name)(data)), name
+
+
+def test_scan_patterns_passes_kwargs(price_data):
+    data = price_data["005930"]
+    kwargs = {"min_len_tail": 0.5, "max_len_body": 2}
+    cond = scan_patterns(data, ["hammer"], pattern_kwargs={"hammer": kwargs})
+    with np.errstate(divide="ignore", invalid="ignore"):
+        assert np.array_equal(cond[:, 0], candle_pattern.hammer(data, **kwargs))
+
+
+def test_bitmask_matches_bool_array(price_data):
+    data = price_data["000020"]
+    cond = scan_patterns(data, PATTERN_LIST)
+    bitmask = scan_patterns(data, PATTERN_LIST, as_bitmask=True)
+    for j in range(len(PATTERN_LIST)):
+        assert np.array_equal((bitmask >> np.uint64(j)) & np.uint64(1) == 1, cond[:, j])
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from qspy.analysis import week_effect
+from qspy.validation import ror_buy_and_hold
+from qspy.validation import permutation_test
+from qspy.validation import bootstrap_test
+from conftest import read_package_prices
+
+
+@pytest.fixture(scope="module")
+def data():
+    return read_package_prices("005930").iloc[-1000:].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("test", [permutation_test, bootstrap_test])
+def test_observed_matches_ror_buy_and_hold(data, test):
+    buy_arr = week_effect(data)[0]
+    expected = np.asarray(ror_buy_and_hold(data, 5, buy_arr))
+    result = test(data, buy_arr, 5, n_resamples=200, random_state=0)
+    assert result["count"] == len(expected)
+    assert result["observed"] == pytest.approx(expected.mean())
+    win_rate = test(data, buy_arr, 5, n_resamples=200, statistic="win_rate", random_state=0)
+    assert win_rate["observed"] == pytest.approx((expected > 0).mean())
+
+
+@pytest.mark.parametrize("test", [permutation_test, bootstrap_test])
+def test_same_seed_same_result(data, test):
+    buy_arr = week_effect(data)[0]
+    first, first_dist = test(data, buy_arr, 5, n_resamples=300, chunk_size=70, random_state=1, return_distribution=True)
+    second, second_dist = test(data, buy_arr, 5, n_resamples=300, chunk_size=70, random_state=1, return_distribution=True)
+    assert first.equals(second)
+    assert np.array_equal(first_dist, second_dist)
+    assert len(first_dist) == 300
+    assert 0 < first["p_value"] <= 1
+    assert first["ci_low"] <= first["ci_high"]
+
+
+def test_permutation_of_every_entry_is_constant(data):
+    # 모든 시점에서 진입하면 무작위 진입도 같은 시점들이므로 분포가 관측값 하나로 모임
+    buy_arr = np.ones(len(data), dtype=bool)
+    result, distribution = permutation_test(data, buy_arr, 5, n_resamples=50, random_state=0, return_distribution=True)
+    assert np.allclose(distribution, result["observed"])
+
+
+def test_bootstrap_varies_with_few_trades(data):
+    # 매매 수가 block_size보다 적어도 블록이 두 개 이상이 되어 부트스트랩 분포가 한 값으로 모이지 않음
+    buy_arr = np.zeros(len(data), dtype=bool)
+    buy_arr[[100, 300, 500, 700]] = True
+    distribution = bootstrap_test(data, buy_arr, 5, n_resamples=500, block_size=10, random_state=0, return_distribution=True)[1]
+    assert distribution.std() > 0
+
+
+def test_missing_prices_are_dropped(data):
+    data = data.copy()
+    data.loc[[105, 305], "Close"] = np.nan
+    buy_arr = np.zeros(len(data), dtype=bool)
+    buy_arr[[100, 300, 500, 700]] = True
+    for test in [permutation_test, bootstrap_test]:
+        result = test(data, buy_arr, 5, n_resamples=100, random_state=0)
+        assert result["count"] == 2
+        assert np.isfinite(result[["observed", "resample_mean", "ci_low", "ci_high"]].values).all()
+
+
+def test_multiple_stocks_pool_trades(data):
+    buy_arr = week_effect(data)[0]
+    single = permutation_test(data, buy_arr, 5, n_resamples=100, random_state=0)
+    pooled = permutation_test([data, data], [buy_arr, buy_arr], 5, n_resamples=100, random_state=0)
+    assert pooled["count"] == 2 * single["count"]
+    assert pooled["observed"] == pytest.approx(single["observed"])
+
+
+def test_invalid_arguments(data):
+    buy_arr = week_effect(data)[0]
+    with pytest.raises(ValueError):
+        permutation_test(data, buy_arr, [5, 10])
+    with pytest.raises(ValueError):
+        bootstrap_test(data, buy_arr, 5, statistic="median")
+    with pytest.raises(ValueError):
+        permutation_test(data, buy_arr[:-1], 5)
+    with pytest.raises(ValueError):
+        permutation_test(data, np.zeros(len(data), dtype=bool), 5)